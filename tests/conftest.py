@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from wr_radio import player, weather
+
+FAKE_MPV = os.path.join(os.path.dirname(__file__), "fake_mpv.py")
+
+_SETTINGS = ("WEATHER_GRID_DEG", "WEATHER_CACHE_MAX", "WEATHER_MODE", "BULK_ENABLED", "BULK_CHUNK",
+             "_provider", "_bulk_provider")
+
+
+def _clear_weather_caches():
+    for d in (weather._validators, weather._max_age, weather._forecasts, weather._failed_until,
+              weather._inflight, weather._breakers):
+        d.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_weather_module():
+    """weather 모듈의 전역 캐시 / 설정 / 제공자를 테스트마다 초기화"""
+    saved = {name: getattr(weather, name) for name in _SETTINGS}
+    saved_breaker = dict(weather._breaker_opts)
+    _clear_weather_caches()
+    yield
+    for name, value in saved.items():
+        setattr(weather, name, value)
+    weather._breaker_opts.clear()
+    weather._breaker_opts.update(saved_breaker)
+    _clear_weather_caches()
+
+
+@pytest.fixture
+def fake_mpv_env(tmp_path):
+    """가짜 mpv 환경 변수 (spawn 전에 바꾸면 그 뒤 띄우는 mpv 에 적용)"""
+    return dict(os.environ, FAKE_MPV_LOG=str(tmp_path / "mpv.log"))
+
+
+@pytest.fixture
+def fake_mpv(tmp_path, monkeypatch, fake_mpv_env):
+    """player.spawn_mpv 를 가짜 mpv (tests/fake_mpv.py) 로 교체. 받은 명령 기록 파일 경로를 돌려줌"""
+    procs = []
+
+    def spawn(cmd):
+        proc = subprocess.Popen([sys.executable, FAKE_MPV, *cmd[1:]], env=dict(fake_mpv_env))
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(player, "spawn_mpv", spawn)
+    yield tmp_path / "mpv.log"
+    for proc in procs:
+        player.stop_process(proc)
@@ -0,0 +1,84 @@
+"""
+테스트용 가짜 mpv: --input-ipc-server= 소켓에서 JSON IPC 를 받아 프로퍼티만 흉내 냄.
+받은 명령은 FAKE_MPV_LOG 파일에 한 줄씩 기록 (테스트에서 복원 여부 확인용).
+FAKE_MPV_NO_AF=1 이면 af add 를 거부 (오디오 필터를 쓸 수 없는 mpv 흉내).
+"""
+import json
+import os
+import socket
+import sys
+import threading
+
+props = {"volume": 50, "pause": False, "core-idle": True, "paused-for-cache": False, "path": None, "audio-pts": None,
+         "af": []}
+no_af = os.environ.get("FAKE_MPV_NO_AF") == "1"
+log_path = os.environ.get("FAKE_MPV_LOG", "")
+log_lock = threading.Lock()
+
+
+def _log(cmd) -> None:
+    if not log_path:
+        return
+    with log_lock, open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(cmd) + "\n")
+
+
+def _handle(conn) -> None:
+    buf = b""
+    with conn:
+        while True:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if not line:
+                    continue
+                msg = json.loads(line)
+                cmd = msg.get("command") or []
+                _log(cmd)
+                reply = {"error": "success"}
+                if cmd[:1] == ["get_property"]:
+                    if cmd[1].startswith("af-metadata/"):
+                        label = cmd[1].split("/", 1)[1]
+                        if any(f["label"] == label for f in props["af"]):
+                            reply["data"] = {"lavfi.astats.Overall.RMS_level": "-30.0"}
+                        else:
+                            reply = {"error": "property unavailable"}
+                    else:
+                        reply["data"] = props.get(cmd[1])
+                elif cmd[:2] == ["af", "add"]:
+                    if no_af:
+                        reply = {"error": "error running command"}
+                    else:
+                        label = cmd[2][1:].split(":", 1)[0] if cmd[2].startswith("@") else ""
+                        props["af"] = [f for f in props["af"] if f["label"] != label] + [{"name": "lavfi", "label": label}]
+                elif cmd[:2] == ["af", "remove"]:
+                    props["af"] = [f for f in props["af"] if "@" + f["label"] != cmd[2]]
+                elif cmd[:1] == ["set_property"]:
+                    props[cmd[1]] = cmd[2]
+                elif cmd[:1] == ["loadfile"]:
+                    props["path"], props["core-idle"], props["audio-pts"] = cmd[1], False, 0.0
+                elif cmd[:1] == ["stop"]:
+                    props["path"], props["core-idle"], props["audio-pts"] = None, True, None
+                if "request_id" in msg:
+                    reply["request_id"] = msg["request_id"]
+                try:
+                    conn.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+                except OSError:
+                    return
+
+
+def main() -> None:
+    path = next(a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--input-ipc-server="))
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(path)
+    srv.listen(8)
+    while True:
+        conn, _ = srv.accept()
+        threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    main()
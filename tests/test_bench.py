@@ -0,0 +1,34 @@
+from wr_radio import bench
+from wr_radio.standin import StandinServer
+
+
+def test_measure_station_reports_connect_and_first_audio(fake_mpv):
+    srv = StandinServer().start()
+    try:
+        result = bench.measure_station({"name": "standin", "url": srv.url()}, "low", 0, timeout=5.0, audible=False)
+    finally:
+        srv.stop()
+    assert result["error"] is None
+    assert result["profile"] == "low" and result["station"] == "standin"
+    assert result["connect"] is not None and result["connect"] < 1.0
+    assert 0 < result["first_audio"] < 5.0 and 0 < result["core_idle_false"] < 5.0
+
+
+def test_measure_station_reports_unreachable_station(fake_mpv, monkeypatch):
+    monkeypatch.setattr(bench.player, "get_properties", lambda state, names: {"core-idle": True})
+    result = bench.measure_station({"name": "dead", "url": "http://127.0.0.1:9/"}, "low", 1, timeout=0.2,
+                                   audible=False)
+    assert result["connect"] is None
+    assert result["first_audio"] is None and result["error"] == "시간 초과"
+
+
+def test_station_table_prints_median_per_profile(capsys):
+    rows = [{"station": f"S{i}", "profile": p, "connect": 0.01, "first_audio": t, "core_idle_false": t,
+             "error": None} for i, (p, t) in enumerate([("low", 0.1), ("low", 0.3), ("prod", 0.5)])]
+    rows.append({"station": "X", "profile": "prod", "connect": None, "first_audio": None, "core_idle_false": None,
+                 "error": "시간 초과"})
+    bench.print_station_table(rows)
+    out = capsys.readouterr().out
+    assert "low: 재생까지 중앙값 200ms (2개)" in out
+    assert "prod: 재생까지 중앙값 500ms (1개)" in out
+    assert "⚠️ 시간 초과" in out
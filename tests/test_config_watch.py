@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+
+from wr_radio import navigation
+from wr_radio.config_watch import ConfigWatcher, apply_station_reload, prepare_station_reload
+from wr_radio.state import AppState
+from wr_radio.stations import load_stations
+
+
+def _stations(n, tag=""):
+    return [
+        {"name": f"Station {i}{tag}", "url": f"http://radio.example/{i}", "lat": float(i % 80), "lon": float(i),
+         "location": f"City {i}, Country {i % 7}", "timezone": "UTC"}
+        for i in range(n)
+    ]
+
+
+def _state(stations, index=0):
+    state = AppState()
+    state.radio_stations = load_stations({"stations": stations})
+    state.current_index = state.play_index = index
+    return state
+
+
+def test_reload_builds_nav_off_main_loop(monkeypatch):
+    state = _state(_stations(50))
+    nav = navigation.get_nav(state)
+    edited = _stations(50)
+    edited[3]["name"] = "Renamed"
+    prepared = prepare_station_reload(state, {"stations": edited})
+    assert prepared["nav"] is not None and prepared["nav"] is not nav
+
+    apply_station_reload(state, prepared)
+    built = []
+    monkeypatch.setattr(navigation, "StationNav", lambda stations: built.append(stations))
+    assert navigation.get_nav(state) is prepared["nav"]
+    assert built == []   # 메인 루프에서 다시 만들지 않음
+    assert prepared["nav"].label("nav_name", 3) == "R"
+
+
+def test_reload_skips_nav_when_never_built():
+    state = _state(_stations(5))
+    prepared = prepare_station_reload(state, {"stations": _stations(6)})
+    assert prepared["nav"] is None
+    apply_station_reload(state, prepared)
+    assert state.station_nav is None
+
+
+def test_removed_playing_station_invalidates_play_index():
+    state = _state(_stations(10), index=2)
+    state.play_index = 7
+    edited = _stations(10)
+    del edited[7]
+    result = apply_station_reload(state, prepare_station_reload(state, {"stations": edited}))
+    assert not result["replay"]          # 보고 있는 카드는 그대로
+    assert state.play_index == -1        # 듣던 스테이션은 더 이상 목록에 없음
+    assert state.current_index == 2
+
+
+def _take(watcher, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        item = watcher.take()
+        if item is not None:
+            return item
+        time.sleep(0.02)
+    return None
+
+
+def test_stale_prepare_is_redone_on_watcher_thread(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"stations": _stations(5)}), encoding="utf-8")
+    state = _state(_stations(5))
+    threads = []
+
+    def prepare(cfg):
+        threads.append(threading.current_thread())
+        return prepare_station_reload(state, cfg)
+
+    watcher = ConfigWatcher(str(path), poll_sec=0.05, settle_sec=0.05, prepare=prepare)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        path.write_text(json.dumps({"stations": _stations(6)}), encoding="utf-8")
+        prepared = _take(watcher)
+        assert prepared is not None
+
+        # 적용 전에 목록이 바뀜 → 낡은 결과. 메인 루프는 다시 준비를 맡기기만 함
+        state.radio_stations = load_stations({"stations": _stations(4)})
+        assert prepared["old"] is not state.radio_stations
+        watcher.retry()
+        redone = _take(watcher)
+    finally:
+        watcher.stop()
+
+    assert redone is not None and redone["old"] is state.radio_stations
+    assert watcher.retries == 1
+    assert threading.main_thread() not in threads
+    apply_station_reload(state, redone)
+    assert len(state.radio_stations) == 6
+
+
+def test_diff_remaps_current_play_and_pending_request():
+    state = _state(_stations(10), index=5)
+    state.play_index = 6
+    state.play_request = 8               # 재생 스레드가 아직 안 가져간 요청
+    edited = _stations(10)
+    del edited[1]                        # 앞쪽이 빠져 뒤 스테이션 index 가 하나씩 당겨짐
+    edited[3]["name"] = "Renamed"        # (옛 index 4) 이름만 바뀜
+    edited.append({**_stations(11)[10], "name": "New"})
+
+    prepared = prepare_station_reload(state, {"stations": edited})
+    diff = prepared["diff"]
+    assert diff["removed"] == [1]
+    assert diff["changed"] == [3]
+    assert diff["added"] == [9]
+    assert prepared["old_to_new"][8] == 7 and 1 not in prepared["old_to_new"]
+
+    result = apply_station_reload(state, prepared)
+    assert not result["replay"] and result["current_changed"]
+    assert (state.current_index, state.play_index, state.play_request) == (4, 5, 7)
+    assert state.radio_stations[state.play_request]["name"] == "Station 8"
+
+
+def test_pending_request_for_removed_station_is_dropped():
+    state = _state(_stations(10), index=2)
+    state.play_request = 7
+    edited = _stations(10)
+    del edited[7]
+    apply_station_reload(state, prepare_station_reload(state, {"stations": edited}))
+    assert state.play_request is None    # 빠진 스테이션 → 다른 스테이션을 재생하지 않음
+
+
+def test_watcher_reloads_when_only_stations_file_changes(tmp_path):
+    stations = tmp_path / "lists" / "stations.json"
+    stations.parent.mkdir()
+    stations.write_text(json.dumps(_stations(5)), encoding="utf-8")
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"stations_file": str(stations)}), encoding="utf-8")
+    state = AppState()
+    state.radio_stations = load_stations({"stations_file": str(stations)})
+
+    watcher = ConfigWatcher(str(path), poll_sec=0.05, settle_sec=0.05, stations_file=str(stations),
+                            prepare=lambda cfg: prepare_station_reload(state, cfg))
+    watcher.start()
+    try:
+        time.sleep(0.2)
+        stations.write_text(json.dumps(_stations(7)), encoding="utf-8")   # config.json 은 그대로
+        prepared = _take(watcher)
+    finally:
+        watcher.stop()
+
+    assert prepared is not None and prepared["diff"]["added"] == [5, 6]
+    apply_station_reload(state, prepared)
+    assert len(state.radio_stations) == 7
@@ -0,0 +1,142 @@
+import json
+import shutil
+import time
+
+import pytest
+
+from wr_radio import player
+from wr_radio.health import HealthConfig, StreamHealth
+from wr_radio.standin import StandinServer
+from wr_radio.state import AppState
+
+PRIMARY = "http://radio.example/live"
+FALLBACK = "http://backup.example/live"
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    sent = []
+    monkeypatch.setattr(player, "load_url", lambda state, url: sent.append(url) or True)
+    return sent
+
+
+@pytest.fixture
+def health(tmp_path):
+    state = AppState()
+    state.radio_stations = [{"name": "A", "url": PRIMARY, "fallback_url": FALLBACK}]
+    state.update(is_playing=True, play_index=0, play_url=PRIMARY, play_name="A", play_generation=1)
+    cfg = HealthConfig(stall_timeout_sec=2.0, first_audio_timeout_sec=5.0, backoff_base_sec=1.0,
+                       backoff_max_sec=30.0, fallback_after=2)
+    return StreamHealth(state, cfg, metrics_file=str(tmp_path / "health.json"))
+
+
+def _audio(h, playing: bool) -> None:
+    h._handle_event({"event": "property-change", "name": "core-idle", "data": not playing})
+
+
+def _run_until(h, now: float, end: float, step: float = 0.1) -> float:
+    while now < end:
+        h._tick(now)
+        now += step
+    return now
+
+
+def test_stall_reconnects_with_backoff_then_falls_back(health, loads, tmp_path):
+    h = health
+    _audio(h, True)
+    now = _run_until(h, 100.0, 101.0)
+    _audio(h, False)                                 # 소리가 끊김
+    now = _run_until(h, now, now + 1.9)
+    assert h.metrics.stalls == 0 and loads == []     # stall_timeout 전
+
+    retries = []
+    while len(loads) < 4:
+        h._tick(now)
+        if len(loads) > len(retries):
+            retries.append(now)
+        now += 0.05
+    assert h.metrics.stalls == 1
+    assert loads == [PRIMARY, PRIMARY, FALLBACK, FALLBACK]   # fallback_after=2 회 실패 뒤 대체 URL
+    assert h.metrics.fallbacks == 1 and h.metrics.reconnects == 4
+    gaps = [b - a for a, b in zip(retries, retries[1:])]
+    for attempt, gap in enumerate(gaps, 1):
+        # 지터 섞인 지수 백오프: base * 2^attempt * [0.5, 1]
+        assert 0.5 * 2 ** attempt - 0.06 <= gap <= 2 ** attempt + 0.06
+
+    _audio(h, True)
+    h._tick(now)
+    assert h.metrics.recoveries == 1 and h.metrics.last_recovery_sec > 0
+    exported = json.loads((tmp_path / "health.json").read_text(encoding="utf-8"))
+    assert exported["recoveries"] == 1 and exported["fallbacks"] == 1
+
+
+def test_eof_and_decoder_error_trigger_reconnect(health, loads):
+    h = health
+    now = time.time()                               # end-file 처리는 실제 시각으로 기록
+    _audio(h, True)
+    h._tick(now)
+    _audio(h, False)
+    h._handle_event({"event": "end-file", "reason": "eof"})
+    assert h.metrics.eofs == 1 and h.metrics.stalls == 1
+    _run_until(h, now, now + 1.1)
+    assert loads == [PRIMARY]
+    h._handle_event({"event": "end-file", "reason": "error", "file_error": "x"})
+    assert h.metrics.errors == 1 and h.metrics.stalls == 1   # 재시도 중 실패는 다음 백오프로
+
+
+def test_channel_change_resets_and_skips_stale_retry(health, loads):
+    h = health
+    _audio(h, True)
+    h._tick(10.0)
+    _audio(h, False)
+    _run_until(h, 10.0, 12.5)
+    assert h.metrics.stalls == 1
+
+    h.state.play_request = 0                        # 새 재생 요청 대기 중 → 재연결하지 않음
+    _run_until(h, 12.5, 14.0)
+    assert loads == []
+    h.state.play_request = None
+    h.state.play_generation += 1                    # 채널이 바뀜 → 초기화
+    h._tick(14.0)
+    assert h._failed_at == 0.0 and h._attempt == 0
+
+
+@pytest.mark.skipif(shutil.which("mpv") is None, reason="mpv 가 설치되어 있지 않음")
+def test_real_mpv_drop_reconnects_then_falls_back(tmp_path, monkeypatch):
+    primary = StandinServer(drop_after_bytes=64 * 1024, speed=4.0).start()
+    backup = StandinServer().start()
+    state = AppState(mpv_sock=str(tmp_path / "mpv.sock"))
+    name = "drop.mp3"
+    state.radio_stations = [{"name": "A", "url": primary.url(name), "fallback_url": backup.url(name)}]
+    sent = []
+    real_load = player.load_if_current
+    monkeypatch.setattr(player, "load_if_current",
+                        lambda st, url, gen: sent.append(url) or real_load(st, url, gen))
+    cfg = HealthConfig(stall_timeout_sec=1.0, first_audio_timeout_sec=5.0, backoff_base_sec=0.5,
+                       backoff_max_sec=2.0, fallback_after=1)
+    h = StreamHealth(state, cfg, metrics_file=str(tmp_path / "health.json"))
+    try:
+        assert player.ensure_mpv_running(state, extra=("--ao=null",))
+        state.update(is_playing=True, play_index=0, play_url=primary.url(name), play_name="A", play_generation=1)
+        assert player.load_url(state, primary.url(name))
+        h.start()
+
+        deadline = time.time() + 20
+        while h.metrics.stalls == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        assert h.metrics.stalls == 1                # drop_after_bytes 만큼 보낸 뒤 끊김 → EOF/stall
+        primary.stop()                              # 원래 주소가 살아나지 않음 → 재연결 실패 → 대체 URL
+
+        while h.metrics.recoveries == 0 and time.time() < deadline:
+            time.sleep(0.05)
+        assert sent[0] == primary.url(name)         # 끊긴 뒤 먼저 같은 주소로 재연결
+        assert sent[-1] == backup.url(name) and h.metrics.fallbacks == 1
+        assert backup.connections.get(name, 0) >= 1
+        assert h.metrics.recoveries == 1 and h.metrics.last_recovery_sec > 0
+        exported = json.loads((tmp_path / "health.json").read_text(encoding="utf-8"))
+        assert exported["recoveries"] == 1 and exported["reconnects"] == len(sent)
+    finally:
+        state.shutting_down = True
+        player.shutdown_player(state)
+        primary.stop()
+        backup.stop()
@@ -0,0 +1,23 @@
+import statistics
+
+from wr_radio.input import InputConfig, SwitchPolicy, replay_trace, synthetic_traces
+
+
+def _median_latency(runs, cfg):
+    return statistics.median(replay_trace(trace, SwitchPolicy(cfg))["latency"] for trace in runs)
+
+
+def test_adaptive_switch_never_slower_than_fixed():
+    fixed, adaptive = InputConfig(adaptive_switch=False), InputConfig(adaptive_switch=True)
+    for name, runs in synthetic_traces(30).items():
+        assert _median_latency(runs, adaptive) <= _median_latency(runs, fixed), name
+
+
+def test_single_detent_uses_min_delay_and_spin_stays_short():
+    cfg = InputConfig()
+    policy = SwitchPolicy(cfg)
+    policy.on_detent(10.0)
+    assert policy.delay == cfg.switch_min_delay_sec
+    for i in range(1, 15):
+        policy.on_detent(10.0 + i * 0.03)
+    assert policy.delay < cfg.play_switch_delay_sec
@@ -0,0 +1,101 @@
+import math
+
+import pytest
+
+from wr_radio.navigation import StationNav, next_mode
+from wr_radio.stations import load_stations
+
+# (이름, 위치, 위도, 경도)
+_ROWS = [
+    ("Alpha FM", "Seoul, Korea", 37.5, 127.0),
+    ("apple radio", "Busan, Korea", 35.1, 129.0),
+    ("Bravo", "Tokyo, Japan", 35.7, 139.7),
+    ("Charlie", "Osaka, Japan", 34.7, 135.5),
+    ("beta", "Paris, France", 48.9, 2.3),
+    ("Delta", "Fiji", -18.1, 178.4),
+    ("delta two", "Samoa", -13.8, -171.8),
+    ("Zulu", "Oslo, Norway", 59.9, 10.8),
+]
+
+
+def _nav(rows=_ROWS):
+    return StationNav(load_stations({"stations": [
+        {"name": n, "url": f"http://s/{i}", "location": loc, "lat": lat, "lon": lon}
+        for i, (n, loc, lat, lon) in enumerate(rows)]}))
+
+
+def test_letter_jumps_wrap_and_ignore_case():
+    nav = _nav()
+    assert nav.label("nav_name", 1) == "A"
+    assert nav.step("nav_name", 0, 1) == (4, "B")        # Alpha → 'B' 의 첫 스테이션 (대소문자 무시: beta < Bravo)
+    assert nav.step("nav_name", 2, 1) == (3, "C")
+    assert nav.step("nav_name", 3, 1) == (5, "D")
+    assert nav.step("nav_name", 6, 1) == (7, "Z")
+    assert nav.step("nav_name", 7, 1) == (0, "A")        # 끝 → 처음
+    assert nav.step("nav_name", 0, -1) == (7, "Z")
+    assert nav.step("nav_name", 3, -1) == (4, "B")       # 이전 글자의 첫 스테이션 (마지막 Bravo 가 아니라)
+
+
+def test_country_jumps_go_to_first_station_by_name():
+    nav = _nav()
+    assert nav.label("nav_country", 0) == "Korea"
+    # 나라 이름순: Fiji, France, Japan, Korea, Norway, Samoa
+    assert nav.step("nav_country", 0, 1) == (7, "Norway")
+    assert nav.step("nav_country", 0, -1) == (2, "Japan")    # Bravo < Charlie
+    assert nav.step("nav_country", 6, 1) == (5, "Fiji")      # 끝 → 처음
+    assert nav.step("nav_country", 5, -1) == (6, "Samoa")
+
+
+def test_nearby_walks_outward_from_origin_across_antimeridian():
+    nav = _nav()
+    nav.start_nearby(5)                                   # Fiji
+    assert nav.step("nav_nearby", 5, 1)[0] == 6           # 날짜변경선 건너 Samoa 가 가장 가까움
+    idx, label = nav.step("nav_nearby", 6, 1)
+    assert label.endswith(" km") and idx not in (5, 6)
+    assert nav.step("nav_nearby", idx, -1)[0] == 6
+    assert nav.step("nav_nearby", 6, -1) == (5, "0 km")   # 처음 스테이션으로 돌아감
+    assert nav.step("nav_nearby", 5, -1) == (5, "0 km")
+
+    ranked = nav.nearby(0, len(_ROWS))
+    assert [i for _, i in ranked][:3] == [1, 3, 2]        # Seoul → Busan, Osaka, Tokyo
+    assert all(a[0] <= b[0] for a, b in zip(ranked, ranked[1:]))
+    assert 0 not in [i for _, i in ranked]
+
+
+def test_nearby_stops_at_last_station():
+    nav = _nav(_ROWS[:3])
+    nav.start_nearby(0)
+    seen = [nav.step("nav_nearby", 0, 1)[0] for _ in range(5)]
+    assert seen == [1, 2, 2, 2, 2]
+
+
+def test_appended_stations_are_indexed_without_rebuild():
+    store = load_stations({"stations": [
+        {"name": f"N{i}", "url": f"http://s/{i}", "location": "X", "lat": float(i % 80), "lon": float(i)}
+        for i in range(200)]})
+    nav = StationNav(store)
+    tree = nav._tree
+    store.append({"name": "Aardvark", "url": "http://new", "location": "Atlantis", "lat": 0.0, "lon": 0.5})
+    assert nav.step("nav_name", 0, -1)[1] == "A"          # 새 글자
+    assert nav.step("nav_country", 200, 1)[1] == "X"
+    assert nav._tree is tree                              # 트리는 그대로, 새 항목은 선형 검색
+    km, i = nav.nearby(0, 1)[0]
+    assert i == 200 and math.isclose(km, 55.6, abs_tol=0.5)
+
+
+def test_shrunken_list_requires_new_index():
+    rows = list(_ROWS)
+    nav = _nav(rows)
+    nav.stations = load_stations({"stations": [
+        {"name": n, "url": f"http://s/{i}", "location": loc, "lat": lat, "lon": lon}
+        for i, (n, loc, lat, lon) in enumerate(rows[:3])]})
+    with pytest.raises(ValueError):
+        nav.refresh()
+
+
+@pytest.mark.parametrize("mode, enabled, want", [
+    ("volume", True, "nav_name"), ("nav_name", True, "nav_country"), ("nav_country", True, "nav_nearby"),
+    ("nav_nearby", True, "normal"), ("volume", False, "normal"),
+])
+def test_mode_cycle(mode, enabled, want):
+    assert next_mode(mode, enabled) == want
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+
+from wr_radio import player
+from wr_radio.state import AppState
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """load_url / play_station 대신 호출 기록만"""
+    sent = []
+    monkeypatch.setattr(player, "load_url", lambda state, url: sent.append(url) or True)
+    return sent
+
+
+def test_load_if_current_skips_superseded(loads):
+    state = AppState()
+    state.play_generation = 3
+    assert player.load_if_current(state, "http://old", 2) is None      # 채널이 바뀜
+    state.play_request = 5
+    assert player.load_if_current(state, "http://old", 3) is None      # 재생 요청 대기 중
+    state.play_request = None
+    assert player.load_if_current(state, "http://cur", 3) is True
+    assert loads == ["http://cur"]
+
+
+def test_play_worker_waits_for_inflight_reload(monkeypatch):
+    state = AppState()
+    release = threading.Event()
+    order = []
+
+    def slow_load(st, url):
+        order.append(("reload", url))
+        release.wait(5.0)
+        return True
+
+    monkeypatch.setattr(player, "load_url", slow_load)
+    monkeypatch.setattr(player, "play_station", lambda st, index: order.append(("play", index)))
+    player.start_play_worker(state)
+    reload = threading.Thread(target=player.load_if_current, args=(state, "http://old", 0))
+    try:
+        reload.start()
+        while not order:
+            time.sleep(0.01)
+        player.request_play(state, 7)
+        time.sleep(0.2)
+        assert order == [("reload", "http://old")]   # 재연결이 끝날 때까지 새 재생을 보내지 않음
+        release.set()
+        reload.join(5.0)
+        deadline = time.time() + 5.0
+        while len(order) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert order == [("reload", "http://old"), ("play", 7)]
+    finally:
+        state.shutting_down = True
+        release.set()
@@ -0,0 +1,77 @@
+import time
+import urllib.request
+
+import pytest
+
+from wr_radio.relay import RingBuffer, StreamRelay
+from wr_radio.standin import FRAME_SIZE, SILENT_FRAME, StandinServer
+
+
+def _wait(cond, timeout=10.0):
+    deadline = time.time() + timeout
+    while not cond():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def _is_frames(data: bytes) -> bool:
+    """ICY 메타데이터가 섞이지 않은 무음 프레임 연속인지 (시작 위치는 아무 데나)"""
+    return data in SILENT_FRAME * (len(data) // FRAME_SIZE + 2)
+
+
+def test_ring_buffer_overflow_keeps_latest_bytes():
+    ring = RingBuffer(10)
+    stream = bytes(range(37))
+    for i in range(0, len(stream), 4):
+        ring.write(stream[i:i + 4])
+    assert ring.written == 37
+    assert ring.oldest() == 27
+    assert ring.read_from(0) == stream[-10:]          # 밀려난 구간은 건너뜀
+    assert ring.read_from(33) == stream[33:]
+    assert ring.read_from(37) == b""
+
+    ring.write(bytes(range(100, 125)))               # 한 번에 용량보다 많이
+    assert ring.written == 62
+    assert ring.read_from(0) == bytes(range(115, 125))
+
+
+@pytest.fixture
+def standin():
+    srv = StandinServer(icy_metaint=1000, drop_after_bytes=FRAME_SIZE * 30, speed=200.0).start()
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def relay():
+    r = StreamRelay(buffer_sec=1.0, max_streams=2, network_timeout=2.0).start()
+    yield r
+    r.stop()
+
+
+def test_relay_reconnects_after_drop_and_strips_icy(standin, relay):
+    url = standin.url("drop.mp3")
+    ch = relay.warm(url)
+    # 업스트림이 30프레임마다 끊김 → 다시 연결해 계속 채우고, 링버퍼 용량을 넘겨 덮어씀
+    assert _wait(lambda: standin.connections.get("drop.mp3", 0) >= 3 and ch.ring is not None
+                 and ch.ring.written > 2 * ch.ring.capacity)
+    assert ch.title == "drop.mp3"
+    assert ch.headers.get("icy-name") == "drop.mp3"
+    with ch.cond:
+        data = ch.ring.read_from(0)
+        assert len(data) == ch.ring.capacity
+    assert _is_frames(data)
+
+
+def test_relay_serves_buffered_audio_immediately(standin, relay):
+    url = standin.url("warm.mp3")
+    ch = relay.warm(url)
+    assert _wait(lambda: ch.ring is not None and ch.ring.written >= ch.ring.capacity)
+    t = time.perf_counter()
+    with urllib.request.urlopen(relay.local_url(url), timeout=5) as resp:
+        data = resp.read(8192)
+    assert time.perf_counter() - t < 1.0
+    assert len(data) == 8192 and _is_frames(data)
+    assert standin.connections["warm.mp3"] >= 1
@@ -0,0 +1,105 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from wr_radio import runtime_state
+from wr_radio.runtime_state import RuntimeStateFile
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(runtime_state, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    real = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd) or real(fd))
+    return calls
+
+
+def _saved(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_writes_coalesce_within_min_interval(tmp_path, clock):
+    path = tmp_path / "runtime_state.json"
+    rs = RuntimeStateFile(str(path), min_interval=10.0)
+    rs.load()
+    clock[0] += 10.0
+    for volume in range(40, 60):           # 로터리를 돌리는 동안 20번 바뀜
+        rs.update(volume=volume)
+        assert not rs.maybe_flush() or volume == 40
+        clock[0] += 0.2
+    assert rs.writes == 1 and _saved(path)["volume"] == 40
+
+    clock[0] += 10.0
+    assert rs.maybe_flush()
+    assert rs.writes == 2 and _saved(path)["volume"] == 59
+    assert not rs.maybe_flush()            # 바뀐 값 없음
+    rs.update(station=3)
+    assert not rs.maybe_flush()            # 간격 전
+    assert rs.flush(shutdown=True)         # 종료 시에는 바로
+    assert _saved(path)["station"] == 3
+
+
+def test_tmpfs_staging_flushes_to_disk_on_interval_and_survives_crash(tmp_path, clock):
+    path, shm = tmp_path / "sd" / "runtime_state.json", tmp_path / "shm"
+    rs = RuntimeStateFile(str(path), min_interval=10.0, staging_dir=str(shm), flush_interval=300.0)
+    rs.load()
+    rs.update(volume=30, station=1)
+    rs.update(volume=30, station=1)        # 같은 값 → 다시 안 씀
+    clock[0] += 60.0
+    rs.update(volume=35)
+    assert rs.staged_writes == 2 and _saved(shm / "runtime_state.json")["volume"] == 35
+    assert not rs.maybe_flush() and not path.exists()   # min_interval 이 지나도 SD 카드에는 아직
+
+    clock[0] += 300.0
+    assert rs.maybe_flush() and _saved(path)["volume"] == 35
+    clock[0] += 1.0
+    rs.update(volume=36)                   # SD 에 쓰기 전에 프로그램만 죽음
+    clock[0] += 1.0
+
+    again = RuntimeStateFile(str(path), staging_dir=str(shm))
+    assert again.load()["volume"] == 36    # tmpfs 쪽이 더 최근
+    (shm / "runtime_state.json").unlink()  # 재부팅 → tmpfs 비워짐
+    assert RuntimeStateFile(str(path), staging_dir=str(shm)).load()["volume"] == 35
+
+
+@pytest.mark.parametrize("policy, per_flush, at_shutdown", [("always", 1, 1), ("shutdown", 0, 1), ("never", 0, 0)])
+def test_fsync_policies(tmp_path, fsyncs, policy, per_flush, at_shutdown):
+    rs = RuntimeStateFile(str(tmp_path / "runtime_state.json"), fsync=policy)
+    rs.update(volume=10)
+    rs.flush()
+    assert rs.fsyncs == per_flush and bool(fsyncs) == bool(per_flush)
+    rs.update(volume=11)
+    rs.flush(shutdown=True)
+    assert rs.fsyncs == per_flush + at_shutdown
+    assert bool(fsyncs) == bool(per_flush + at_shutdown)
+
+
+def test_unknown_fsync_policy_falls_back_to_always(tmp_path):
+    assert RuntimeStateFile(str(tmp_path / "rs.json"), fsync="sometimes").fsync == "always"
+
+
+def test_missing_file_falls_back_to_config_last_values(tmp_path):
+    path = tmp_path / "runtime_state.json"
+    cfg = {"last_station": 4, "last_volume": 70}
+    rs = RuntimeStateFile(str(path))
+    assert rs.load(cfg) == {"station": 4, "volume": 70, "brightness": 100}
+    assert not rs.dirty()                  # 예전 값만으로는 새 파일을 쓰지 않음
+
+    rs.update(volume=20)
+    rs.flush()
+    assert RuntimeStateFile(str(path)).load(cfg) == {"station": 4, "volume": 20, "brightness": 100}
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "runtime_state.json"
+    path.write_text("{\"volume\": 3", encoding="utf-8")
+    assert RuntimeStateFile(str(path)).load({"last_volume": 55})["volume"] == 55
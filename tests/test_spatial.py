@@ -0,0 +1,85 @@
+import math
+import random
+
+import pytest
+
+from wr_radio import tzindex
+from wr_radio.spatial import EARTH_RADIUS_KM, SphereTree
+
+
+def _haversine(a, b):
+    la1, lo1, la2, lo2 = map(math.radians, (*a, *b))
+    h = math.sin((la2 - la1) / 2) ** 2 + math.cos(la1) * math.cos(la2) * math.sin((lo2 - lo1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _brute(points, q, k):
+    return sorted((_haversine(q, p), i) for i, p in enumerate(points))[:k]
+
+
+def _uniform(rnd, n):
+    return [(math.degrees(math.asin(rnd.uniform(-1, 1))), rnd.uniform(-180, 180)) for _ in range(n)]
+
+
+def _check(tree, points, q, k):
+    got = tree.nearest_k(*q, k)
+    want = _brute(points, q, k)
+    assert [km for km, _ in got] == pytest.approx([km for km, _ in want], abs=1e-6)
+    assert {i for _, i in got} == {i for _, i in want}
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_nearest_k_matches_brute_force(k):
+    rnd = random.Random(1)
+    points = _uniform(rnd, 1000)
+    tree = SphereTree(points)
+    for q in _uniform(rnd, 100):
+        _check(tree, points, q, k)
+
+
+def test_antimeridian_neighbours_are_found_across_180():
+    rnd = random.Random(2)
+    points = [(rnd.uniform(-40, 40), rnd.choice([-1, 1]) * rnd.uniform(170, 180)) for _ in range(300)]
+    points += _uniform(rnd, 300)
+    tree = SphereTree(points)
+    for lat in range(-40, 41, 5):
+        for lon in (179.9, -179.9, 180.0, -180.0):
+            _check(tree, points, (lat, lon), 8)
+    # 경도 ±179.5 두 점은 1° 떨어진 이웃 (경도 차 359° 가 아님)
+    pair = SphereTree([(0.0, 179.5), (0.0, 170.0)])
+    assert pair.nearest(0.0, -179.5)[0] == 0
+
+
+def test_poles_use_great_circle_distance():
+    rnd = random.Random(3)
+    # 극 근처는 경도가 아무리 달라도 가까움
+    points = [(rnd.uniform(80, 90), rnd.uniform(-180, 180)) for _ in range(200)]
+    points += [(rnd.uniform(-90, -80), rnd.uniform(-180, 180)) for _ in range(200)]
+    points += _uniform(rnd, 200)
+    tree = SphereTree(points)
+    for q in [(90.0, 0.0), (-90.0, 123.0), (89.9, -179.0), (-89.5, 45.0), (85.0, 170.0)]:
+        _check(tree, points, q, 10)
+    pole = SphereTree([(89.0, 0.0), (80.0, 180.0)])
+    assert pole.nearest(89.5, 179.0)[0] == 0      # 경도는 멀어도 대원 거리로 더 가까움
+
+
+def test_nearest_matches_linear_scan_and_edge_cases():
+    rnd = random.Random(4)
+    points = _uniform(rnd, 500)
+    tree = SphereTree(points)
+    for q in _uniform(rnd, 300):
+        assert tree.nearest(*q)[0] == tree.nearest_linear(*q)[0]
+    assert tree.nearest_k(0, 0, 0) == []
+    assert len(tree.nearest_k(0, 0, 10_000)) == len(points)
+    assert SphereTree([]).nearest(0, 0) == (-1, math.inf)
+
+
+def test_timezone_index_matches_linear_scan():
+    """벤치마크(tz) 의 '전체 비교와 불일치 0건' 확인"""
+    index = tzindex.get_index("")
+    if index is None:
+        pytest.skip("zone.tab 없음")
+    rnd = random.Random(5)
+    for lat, lon in _uniform(rnd, 1000):
+        assert index.nearest(lat, lon)[0] == index.nearest_linear(lat, lon)[0]
+    assert index.nearest(37.57, 126.98)[0] == "Asia/Seoul"
@@ -0,0 +1,64 @@
+import threading
+
+from wr_radio.state import AppState
+
+
+def test_write_marks_only_real_changes():
+    state = AppState()
+    seen = []
+    state.subscribe(("current_index", "is_playing"), lambda st, changed: seen.append(changed))
+    state.current_index = 0          # 기본값과 같음
+    state.play_index = 5             # 알림 없는 필드
+    assert state.dispatch() == frozenset()
+    state.current_index = 3
+    state.is_playing = True
+    assert state.dispatch() == {"current_index", "is_playing"}
+    assert seen == [{"current_index", "is_playing"}]
+    state.mark_changed("current_index")
+    assert state.dispatch() == {"current_index"}
+
+
+def test_concurrent_writes_never_lose_the_last_change():
+    state = AppState()
+    seen = []
+    state.subscribe(("current_index",), lambda st, changed: seen.append(st.current_index))
+    n = 20000
+    done = threading.Event()
+
+    def writer():
+        for i in range(1, n + 1):
+            state.current_index = i
+        done.set()
+
+    t = threading.Thread(target=writer)
+    t.start()
+    while not done.is_set():
+        state.dispatch()
+    t.join()
+    state.dispatch()
+    assert seen and seen[-1] == n
+    assert state.dispatch() == frozenset()
+
+
+def test_update_and_snapshot_are_consistent():
+    state = AppState()
+    stop = threading.Event()
+    torn = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            state.update(play_url=f"u{i}", play_name=f"n{i}")
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        for _ in range(20000):
+            url, name = state.snapshot("play_url", "play_name")
+            if url[1:] != name[1:]:
+                torn.append((url, name))
+    finally:
+        stop.set()
+        t.join()
+    assert torn == []
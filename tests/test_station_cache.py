@@ -0,0 +1,118 @@
+import json
+import os
+
+import pytest
+
+from wr_radio import stations as stations_mod
+from wr_radio.station_cache import StationCache
+from wr_radio.stations import diff_stations, load_stations
+
+
+def _stations(n):
+    return [{"name": f"S{i}", "url": f"http://radio.example/{i}", "lat": float(i), "lon": float(2 * i),
+             "location": f"City {i}", **({"timezone": "Asia/Seoul"} if i % 2 == 0 else {})}
+            for i in range(n)]
+
+
+@pytest.fixture
+def tz_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(stations_mod, "find_timezone", lambda lat, lon, dataset="": calls.append(lat) or "Etc/Calc")
+    return calls
+
+
+@pytest.fixture
+def files(tmp_path):
+    src = tmp_path / "stations.json"
+    src.write_text(json.dumps(_stations(10)), encoding="utf-8")
+    cfg = {"stations_file": str(src)}
+    return src, tmp_path / "stations_cache.bin", cfg
+
+
+def _boot(cache_path, cfg):
+    """부팅 한 번: 캐시 (또는 원본) 에서 읽고 필요하면 저장"""
+    cache = StationCache(str(cache_path), config_path=cfg.get("stations_file", ""))
+    store = cache.load(cfg)
+    if cache.needs_save:
+        assert cache.save(store)
+    return cache, store
+
+
+def test_unchanged_source_is_a_hit_without_recomputing_timezones(files, tz_calls):
+    src, path, cfg = files
+    cache, first = _boot(path, cfg)
+    assert cache.status == "miss" and len(tz_calls) == 5     # 저장 전에 계산
+    tz_calls.clear()
+
+    cache, store = _boot(path, cfg)
+    assert cache.status == "hit" and not cache.needs_save
+    assert [store.timezone(i) for i in range(10)] == ["Asia/Seoul", "Etc/Calc"] * 5
+    assert tz_calls == []                                      # 캐시의 계산 값 사용
+
+
+def test_explicit_and_computed_timezones_stay_separate(files, tz_calls):
+    src, path, cfg = files
+    _boot(path, cfg)
+    _cache, cached = _boot(path, cfg)
+    # 계산한 timezone 은 config 에 적힌 값으로 보지 않음 → 다시 읽기 diff 에서 '변경' 아님
+    assert [cached.has_timezone(i) for i in range(4)] == [True, False, True, False]
+    assert diff_stations(cached, load_stations(cfg))["changed"] == []
+
+
+def test_touched_source_with_same_content_is_rehashed(files, tz_calls):
+    src, path, cfg = files
+    _boot(path, cfg)
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    tz_calls.clear()
+
+    cache, store = _boot(path, cfg)
+    assert cache.status == "rehash" and tz_calls == []
+    cache, _ = _boot(path, cfg)
+    assert cache.status == "hit"                               # 새 mtime 으로 키가 저장됨
+
+
+def test_changed_content_with_same_size_is_stale(files, tz_calls):
+    src, path, cfg = files
+    _boot(path, cfg)
+    text = src.read_text(encoding="utf-8").replace("City 3", "Town 3")
+    st = os.stat(src)
+    src.write_text(text, encoding="utf-8")
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert os.stat(src).st_size == st.st_size
+
+    cache, store = _boot(path, cfg)
+    assert cache.status == "stale" and store[3]["location"] == "Town 3"
+    assert _boot(path, cfg)[0].status == "hit"
+
+
+def test_other_timezone_dataset_invalidates(files, tz_calls, tmp_path):
+    src, path, cfg = files
+    _boot(path, cfg)
+    assert _boot(path, dict(cfg, timezone_dataset=str(tmp_path / "cities.txt")))[0].status == "stale"
+
+
+@pytest.mark.parametrize("damage", ["truncate", "garbage", "empty"])
+def test_damaged_cache_file_is_rebuilt(files, tz_calls, damage):
+    src, path, cfg = files
+    _boot(path, cfg)
+    data = path.read_bytes()
+    if damage == "truncate":
+        path.write_bytes(data[:len(data) - 40])                # 헤더 / 메타는 멀쩡, 열이 잘림
+    elif damage == "garbage":
+        path.write_bytes(b"\x00" * len(data))
+    else:
+        path.write_bytes(b"")
+
+    cache, store = _boot(path, cfg)
+    assert cache.status == ("corrupt" if damage == "truncate" else "miss")
+    assert [st["url"] for st in store] == [st["url"] for st in _stations(10)]
+    assert _boot(path, cfg)[0].status == "hit"
+
+
+def test_binary_source_is_not_cached(files, tmp_path):
+    src, path, cfg = files
+    binary = tmp_path / "stations.bin"
+    load_stations(cfg).save_binary(str(binary))
+    cache, store = _boot(path, {"stations_file": str(binary)})
+    assert cache.status == "off" and len(store) == 10 and not path.exists()
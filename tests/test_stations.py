@@ -0,0 +1,92 @@
+import json
+import struct
+
+import pytest
+
+from wr_radio import stations as stations_mod
+from wr_radio.stations import StationStore, diff_stations, iter_json_stations, load_stations
+
+
+def _stations(n):
+    return [
+        {"name": f"방송 {i}", "url": f"http://radio.example/{i}", "lat": -60.0 + i * 1.5, "lon": -170.0 + i * 3.25,
+         "location": f"City {i}", "color": [i % 256, 255 - i % 256, 7],
+         **({"timezone": "Asia/Seoul"} if i % 3 == 0 else {}),
+         **({"fallback_url": f"http://backup.example/{i}"} if i % 4 == 0 else {})}
+        for i in range(n)
+    ]
+
+
+def _rows(store):
+    return [(st["name"], st["url"], st["location"], st["lat"], st["lon"], st["color"], store.has_timezone(i),
+             st.get("fallback_url")) for i, st in enumerate(store)]
+
+
+def test_binary_round_trip_keeps_every_column(tmp_path):
+    store = load_stations({"stations": _stations(50)})
+    again = StationStore.from_bytes(store.to_bytes(merge_timezones=False))
+    assert _rows(again) == _rows(store)
+    assert diff_stations(store, again)["changed"] == []
+
+    path = tmp_path / "stations.bin"
+    store.save_binary(str(path))
+    assert _rows(StationStore.load_binary(str(path))) == _rows(store)
+    assert _rows(load_stations({"stations_file": str(path)})) == _rows(store)
+
+
+def test_merged_timezones_are_stored_as_explicit(monkeypatch):
+    monkeypatch.setattr(stations_mod, "find_timezone", lambda lat, lon, dataset="": "Etc/Test")
+    store = load_stations({"stations": _stations(6)})
+    assert store.resolve_timezones() == 4
+    merged = StationStore.from_bytes(store.to_bytes())
+    assert [merged.timezone(i) for i in range(6)] == ["Asia/Seoul", "Etc/Test", "Etc/Test"] * 2
+    assert all(merged.has_timezone(i) for i in range(6))
+
+
+@pytest.mark.parametrize("data", [b"", b"XXXX" + bytes(10)])
+def test_from_bytes_rejects_other_formats(data):
+    with pytest.raises((ValueError, struct.error)):
+        StationStore.from_bytes(data)
+
+
+def test_from_bytes_rejects_truncated_data():
+    data = load_stations({"stations": _stations(20)}).to_bytes()
+    with pytest.raises(ValueError):
+        StationStore.from_bytes(data[:len(data) // 2])
+
+
+@pytest.mark.parametrize("layout", ["array", "lines"])
+def test_streamed_json_matches_config_list(tmp_path, layout):
+    items = _stations(300)
+    path = tmp_path / "stations.json"
+    if layout == "array":
+        text = json.dumps(items, ensure_ascii=False, indent=1)
+    else:
+        text = "\n".join(json.dumps(st, ensure_ascii=False) for st in items) + "\n"
+    path.write_text(text, encoding="utf-8")
+
+    # 덩어리 크기가 작아 항목 / 한글이 덩어리 경계에 걸쳐도 같은 결과
+    assert list(iter_json_stations(str(path), chunk_size=37)) == items
+    assert _rows(load_stations({"stations_file": str(path)})) == _rows(load_stations({"stations": items}))
+
+
+def test_streamed_json_skips_rows_without_coordinates_and_reads_radio_browser_fields(tmp_path):
+    path = tmp_path / "stations.jsonl"
+    rows = [
+        {"name": "RB", "url_resolved": "http://rb.example/a", "geo_lat": "37.5", "geo_long": "127.0",
+         "state": "Seoul", "country": "Korea"},
+        {"name": "좌표 없음", "url": "http://x.example"},
+        {"name": "URL 없음", "lat": 1, "lon": 2},
+    ]
+    path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows), encoding="utf-8")
+    store = load_stations({"stations_file": str(path)})
+    assert len(store) == 1 and store.skipped == 2
+    st = store[0]
+    assert (st["url"], st["lat"], st["lon"], st["location"]) == ("http://rb.example/a", 37.5, 127.0, "Seoul, Korea")
+
+
+def test_broken_json_file_falls_back_to_config_list(tmp_path):
+    path = tmp_path / "stations.json"
+    path.write_text('[{"name": "a", "url": "http://a", "lat": 1, "lon": 2}, {"name": ', encoding="utf-8")
+    store = load_stations({"stations_file": str(path), "stations": _stations(2)})
+    assert [st["url"] for st in store] == [st["url"] for st in _stations(2)]
@@ -0,0 +1,127 @@
+import time
+
+from wr_radio import player, stats
+from wr_radio.state import AppState
+from wr_radio.stats import (
+    DEFAULT_CACHE_SECS,
+    DEFAULT_NETWORK_TIMEOUT,
+    DEFAULT_READAHEAD_SECS,
+    StationStats,
+    StatsStore,
+    choose_buffering,
+)
+
+URL = "http://radio.example/a"
+
+
+def test_stats_persist_across_reopen(tmp_path):
+    path = str(tmp_path / "stats.db")
+    store = StatsStore(path)
+    store.record_play(URL, "A", 1.5)
+    store.record_play(URL, "A", 0.5)
+    store.record_failure(URL, "A")
+    store.record_underrun(URL)
+    store.record_sample(URL, 0.5, 128000, 2.0)
+    store.record_sample(URL, 0.5, 128000, 1.0)
+    store.close()
+
+    st = StatsStore(path).get(URL)
+    assert st is not None and st.name == "A"
+    assert (st.plays, st.failures, st.underruns) == (3, 1, 1)
+    assert abs(st.ttfa_avg - (1.5 + 0.3 * (0.5 - 1.5))) < 1e-9   # EWMA
+    assert st.ttfa_max == 1.5
+    assert st.listen_sec == 1.0
+    assert st.bitrate_kbps == 128.0
+    assert abs(st.jitter - 0.3) < 1e-9
+
+
+def test_maybe_flush_waits_for_interval(tmp_path, monkeypatch):
+    path = str(tmp_path / "stats.db")
+    store = StatsStore(path)
+    store.record_play(URL, "A", 1.0)
+    store.maybe_flush()                       # 아직 FLUSH_INTERVAL_SEC 전 → 쓰지 않음
+    assert StatsStore(path).get(URL) is None
+
+    monkeypatch.setattr(stats, "FLUSH_INTERVAL_SEC", 0.0)
+    store.maybe_flush()
+    assert StatsStore(path).get(URL).plays == 1
+    store.close()
+
+
+def test_buffering_grows_with_bad_history():
+    assert choose_buffering(None) == (DEFAULT_CACHE_SECS, DEFAULT_READAHEAD_SECS, DEFAULT_NETWORK_TIMEOUT)
+
+    good = StationStats(URL, plays=10, ttfa_avg=0.4, ttfa_max=0.8, listen_sec=3600)
+    assert choose_buffering(good) == (DEFAULT_CACHE_SECS, DEFAULT_READAHEAD_SECS, DEFAULT_NETWORK_TIMEOUT)
+
+    flaky = StationStats(URL, plays=10, underruns=4, jitter=0.5, ttfa_max=5.0, listen_sec=3600)
+    cache, readahead, timeout = choose_buffering(flaky)
+    assert cache == readahead == round(DEFAULT_CACHE_SECS + 0.5 * 4 + 2.0 * 0.5, 2)
+    assert timeout == 11.0
+
+    awful = StationStats(URL, plays=10, underruns=500, jitter=10.0, ttfa_max=60.0, listen_sec=3600)
+    assert choose_buffering(awful) == (5.0, 5.0, 15.0)   # 상한
+
+
+def test_apply_buffering_sends_per_station_values(tmp_path, monkeypatch):
+    state = AppState()
+    state.stream_stats = StatsStore(str(tmp_path / "stats.db"))
+    for _ in range(4):
+        state.stream_stats.record_underrun(URL)
+    state.stream_stats.record_play(URL, "A", 5.0)
+    sent = []
+    monkeypatch.setattr(player, "mpv_cmd", lambda target, payload: sent.append(payload["command"]) or True)
+
+    player.apply_buffering(state, state, URL)
+    cache, readahead, timeout = state.stream_stats.buffering_for(URL)
+    assert cache > DEFAULT_CACHE_SECS and timeout > DEFAULT_NETWORK_TIMEOUT
+    assert sent == [
+        ["set_property", "cache-secs", cache],
+        ["set_property", "demuxer-readahead-secs", readahead],
+        ["set_property", "network-timeout", timeout],
+    ]
+    state.stream_stats.close()
+
+
+def _playing_state(tmp_path):
+    state = AppState()
+    state.stream_stats = StatsStore(str(tmp_path / "stats.db"))
+    state.radio_stations = [{"name": "A", "url": URL}]
+    return state
+
+
+def test_mpv_down_is_not_a_station_failure(tmp_path, monkeypatch):
+    state = _playing_state(tmp_path)
+    monkeypatch.setattr(player, "load_url", lambda st, url: False)     # IPC 소켓 없음
+    monkeypatch.setattr(player, "mpv_cmd", lambda target, payload: False)
+    player.play_station(state, 0)
+    assert not state.is_playing
+    assert state.stream_stats.get(URL) is None
+    state.stream_stats.close()
+
+
+def test_stream_open_error_is_recorded_once(tmp_path):
+    from wr_radio.health import StreamHealth
+
+    state = _playing_state(tmp_path)
+    state.update(is_playing=True, play_index=0, play_url=URL, play_name="A", play_started_at=time.time() - 1)
+    health = StreamHealth(state, metrics_file="")
+    health._handle_event({"event": "end-file", "reason": "error", "file_error": "Failed to open"})
+    assert state.stream_stats.get(URL).failures == 1
+    assert state.play_started_at == 0.0
+
+    state.play_started_at = 0.0
+    player._record_stats(state, {}, 0.5)                     # 모니터가 다시 세지 않음
+    health._handle_event({"event": "end-file", "reason": "error"})   # 재연결 중 오류도 다시 세지 않음
+    st = state.stream_stats.get(URL)
+    assert (st.plays, st.failures) == (1, 1)
+    state.stream_stats.close()
+
+
+def test_no_audio_after_accepted_load_is_recorded_by_monitor(tmp_path):
+    state = _playing_state(tmp_path)
+    state.update(is_playing=True, play_url=URL, play_name="A",
+                 play_started_at=time.time() - player.STATS_NO_AUDIO_FAIL_SEC - 1)
+    player._record_stats(state, {}, 0.5)
+    assert state.stream_stats.get(URL).failures == 1 and state.play_started_at == 0.0
+    state.stream_stats.close()
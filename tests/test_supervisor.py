@@ -0,0 +1,58 @@
+import json
+import time
+
+from wr_radio import player
+from wr_radio.state import AppState
+from wr_radio.supervisor import MpvSupervisor
+
+def _commands(log, expect, timeout=5.0):
+    """expect 가 모두 기록될 때까지 (mpv_cmd 는 응답을 기다리지 않음) 기다린 뒤 기록된 명령 목록"""
+    deadline = time.time() + timeout
+    while True:
+        cmds = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()] if log.exists() else []
+        if all(c in cmds for c in expect) or time.time() > deadline:
+            return cmds
+        time.sleep(0.02)
+
+
+def test_supervisor_restarts_killed_mpv_and_restores_state(tmp_path, fake_mpv):
+    state = AppState(mpv_sock=str(tmp_path / "a.sock"), mpv_sock_standby=str(tmp_path / "b.sock"))
+    assert player.ensure_mpv_running(state)
+    first = state.player_process
+    state.update(is_playing=True, play_url="http://radio.example/stream", current_volume=37)
+    state.paused = True
+
+    sup = MpvSupervisor(state, check_interval=0.1)
+    sup.start()
+    try:
+        fake_mpv.write_text("", encoding="utf-8")   # 재시작 뒤 받은 명령만 확인
+        first.kill()
+        assert sup.recovered.wait(10.0), "mpv 재시작 안 됨"
+    finally:
+        state.shutting_down = True
+
+    assert sup.restarts == 1
+    assert state.player_process is not first and state.player_process.poll() is None
+    assert player._can_connect(state.mpv_sock)
+    expect = [
+        ["set_property", "volume", 37],
+        ["loadfile", "http://radio.example/stream", "replace"],
+        ["set_property", "pause", True],
+    ]
+    cmds = _commands(fake_mpv, expect)
+    for cmd in expect:
+        assert cmd in cmds
+
+
+def test_audio_monitor_tracks_pause(tmp_path, fake_mpv):
+    state = AppState(mpv_sock=str(tmp_path / "a.sock"), is_playing=True)
+    assert player.ensure_mpv_running(state)
+    player.mpv_cmd(state, {"command": ["set_property", "pause", True]})
+    player.start_audio_monitor(state)
+    try:
+        deadline = time.time() + 5.0
+        while not state.paused and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        state.shutting_down = True
+    assert state.paused
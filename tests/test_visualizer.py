@@ -0,0 +1,46 @@
+import time
+
+from wr_radio import player, visualizer
+from wr_radio.state import AppState
+from wr_radio.visualizer import LevelFeed
+
+
+def _wait(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while not cond() and time.time() < deadline:
+        time.sleep(0.02)
+    return cond()
+
+
+def test_install_waits_for_af_add_reply(tmp_path, fake_mpv):
+    state = AppState(mpv_sock=str(tmp_path / "a.sock"))
+    assert player.ensure_mpv_running(state)
+    feed = LevelFeed(state)
+    for _ in range(20):   # 매번 바로 확인해도 적용된 뒤 (응답을 기다리므로)
+        player.mpv_cmd(state, {"command": ["af", "remove", f"@{visualizer.FILTER_LABEL}"]})
+        assert feed._install_filter()
+
+
+def test_feed_survives_failed_install_and_retries_on_new_mpv(tmp_path, fake_mpv, fake_mpv_env, monkeypatch):
+    monkeypatch.setattr(visualizer, "RETRY_MIN_SEC", 0.1)
+    fake_mpv_env["FAKE_MPV_NO_AF"] = "1"
+    state = AppState(mpv_sock=str(tmp_path / "a.sock"), mpv_sock_standby=str(tmp_path / "b.sock"))
+    assert player.ensure_mpv_running(state)
+    state.update(is_playing=True, audio_playing=True)
+    feed = LevelFeed(state, max_hz=20.0)
+    thread = feed.start()
+    try:
+        assert _wait(lambda: feed.install_failures >= 3)      # 백오프하며 다시 시도
+        assert thread.is_alive() and not feed.active          # 그동안 사인파 (스레드는 유지)
+
+        # make-before-break 처럼 필터를 쓸 수 있는 다른 mpv 로 교체 → 바로 설치
+        del fake_mpv_env["FAKE_MPV_NO_AF"]
+        standby = AppState(mpv_sock=state.mpv_sock_standby)
+        assert player.ensure_mpv_running(standby)
+        state.mpv_sock = standby.mpv_sock
+        assert _wait(lambda: feed.active)
+        assert feed.install_failures == 0
+        assert abs(feed.snapshot()[-1] - visualizer.db_to_level(-30.0)) < 1e-9
+    finally:
+        state.shutting_down = True
+        thread.join(2.0)
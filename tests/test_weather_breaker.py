@@ -0,0 +1,200 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from wr_radio import weather, weather_providers
+from wr_radio.state import AppState
+from wr_radio.weather_providers import CircuitBreaker, ProviderError, WeatherProvider, WeatherResult
+from wr_radio.weather_scheduler import WeatherScheduler
+
+
+class StubProvider(WeatherProvider):
+    def __init__(self, name, bulk=False, fail=False):
+        self.name = name
+        self.bulk = bulk
+        self.fail = fail
+        self.calls = 0
+
+    def fetch(self, get, key, lat, lon, forecast):
+        self.calls += 1
+        if self.fail:
+            raise ProviderError("HTTP 503")
+        return WeatherResult({"icon": "01", "temp": int(lat)})
+
+    def fetch_many(self, get, points, forecast):
+        self.calls += 1
+        if self.fail:
+            raise ProviderError("HTTP 503")
+        return {key: WeatherResult({"icon": "01", "temp": int(lat)}) for key, lat, _lon in points}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(weather_providers, "time", type("T", (), {"monotonic": staticmethod(lambda: now[0])}))
+    return now
+
+
+def test_breaker_opens_probes_once_and_backs_off(clock):
+    br = CircuitBreaker("x", failure_threshold=3, reset_timeout=10.0)
+    for _ in range(3):
+        assert br.allow()
+        br.record_failure()
+    assert br.state == br.OPEN and br.trips == 1
+    assert not br.allow() and not br.ready()
+
+    clock[0] += 10.0
+    assert br.ready()
+    assert br.allow()                 # half_open: 시험 요청 1개만
+    assert not br.allow()
+    br.record_failure()               # 시험 실패 → 다시 open, 대기 2배
+    assert br.state == br.OPEN and br.reset_timeout == 20.0
+    clock[0] += 10.0
+    assert not br.allow()
+    clock[0] += 10.0
+    assert br.allow()
+    br.record_success()
+    assert br.state == br.CLOSED and br.reset_timeout == 10.0 and br.allow()
+
+
+def test_bulk_outage_falls_back_to_per_location_provider(clock):
+    single, bulk = StubProvider("single"), StubProvider("bulk", bulk=True, fail=True)
+    weather.set_provider(single, bulk)
+    weather.BULK_ENABLED = True
+    state = AppState(enable_weather=True)
+    points = [(10.0, 20.0), (30.0, 40.0)]
+
+    for _ in range(3):
+        assert weather.fetch_weather_bulk(state, points) == points
+    assert bulk.calls == 3
+    assert not weather.provider_ready(bulk=True)      # 일괄 제공자 circuit open
+    assert weather.fetch_weather_bulk(state, points) == points
+    assert bulk.calls == 3                            # 열려 있는 동안 요청 안 보냄
+
+    assert weather.provider_ready()                   # 위치별 제공자는 그대로 → 실패한 좌표는 위치별로
+    for lat, lon in points:
+        weather._fetch_weather_background(state, lat, lon, "L")
+    assert single.calls == 2
+    assert weather.get_cached_weather(state, 30.0, 40.0) == {"icon": "01", "temp": 30}
+    status = weather.provider_status()
+    assert status["bulk"]["state"] == "open" and status["single"]["state"] == "closed"
+
+
+def test_scheduler_sends_nothing_while_breaker_open_then_probes(clock, monkeypatch):
+    monkeypatch.setattr(weather, "WEATHER_NEGATIVE_TTL", 0)   # 위치별 재요청 금지 없이 breaker 만으로
+    single = StubProvider("single", fail=True)
+    weather.set_provider(single)
+    weather.BULK_ENABLED = False
+    weather._breaker_opts.update(failures=2, reset_sec=5.0)
+    state = AppState(enable_weather=True)
+    state.radio_stations = [{"name": f"S{i}", "url": "", "location": f"L{i}", "lat": float(i), "lon": 0.0}
+                            for i in range(6)]
+    sched = WeatherScheduler(state, workers=1, calls_per_minute=6000, burst=10)
+    submitted = []
+    submit = sched.pool.submit
+    monkeypatch.setattr(sched.pool, "submit", lambda fn, *a: submitted.append(a) or submit(fn, *a))
+    sched.start()
+    try:
+        deadline = time.time() + 5.0
+        while weather.breaker_for(single).state != CircuitBreaker.OPEN and time.time() < deadline:
+            time.sleep(0.02)
+        assert weather.breaker_for(single).state == CircuitBreaker.OPEN
+        time.sleep(0.2)
+        calls, jobs = single.calls, len(submitted)
+        time.sleep(1.2)
+        assert single.calls == calls and len(submitted) == jobs   # 열려 있는 동안 작업 / 요청 없음
+
+        single.fail = False
+        weather._failed_until.clear()
+        clock[0] += 5.0                               # reset_sec 지남 → 시험 요청 → 복구 후 전부 받음
+        sched._wake.set()
+        deadline = time.time() + 5.0
+        while len(state.weather_cache) < 6 and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        state.shutting_down = True
+        sched._wake.set()
+    assert weather.breaker_for(single).state == CircuitBreaker.CLOSED
+    assert len(state.weather_cache) == 6
+
+
+class BlockingProvider(StubProvider):
+    """release 가 설정될 때까지 응답하지 않음 (동시 호출 합치기 확인용)"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.release = threading.Event()
+
+    def fetch(self, get, key, lat, lon, forecast):
+        self.release.wait(5.0)
+        return super().fetch(get, key, lat, lon, forecast)
+
+
+def test_concurrent_callers_share_one_request():
+    provider = BlockingProvider("single")
+    weather.set_provider(provider)
+    state = AppState(enable_weather=True)
+    coalesced = weather.fetch_stats.coalesced
+    leader = threading.Thread(target=weather._fetch_weather_background, args=(state, 10.0, 20.0, "L"))
+    leader.start()
+    while weather.cache_key(10.0, 20.0) not in weather._inflight:
+        time.sleep(0.005)
+    waiters = [threading.Thread(target=weather._fetch_weather_background, args=(state, 10.0, 20.0, "L", True))
+               for _ in range(5)]
+    for t in waiters:
+        t.start()
+    while weather.fetch_stats.coalesced < coalesced + 5:
+        time.sleep(0.005)
+    assert not weather.should_update_weather(state, 10.0, 20.0)   # 진행 중
+    provider.release.set()
+    for t in [leader, *waiters]:
+        t.join(5.0)
+    assert provider.calls == 1
+    assert weather.get_cached_weather(state, 10.0, 20.0) == {"icon": "01", "temp": 10}
+
+
+def test_failure_blocks_repeats_for_negative_ttl(monkeypatch):
+    provider = StubProvider("single", fail=True)
+    weather.set_provider(provider)
+    state = AppState(enable_weather=True)
+    weather._fetch_weather_background(state, 10.0, 20.0, "L")
+    assert provider.calls == 1
+    assert not weather.should_update_weather(state, 10.0, 20.0)
+
+    real = time.time()
+    monkeypatch.setattr(weather, "time", SimpleNamespace(time=lambda: real + weather.WEATHER_NEGATIVE_TTL - 1,
+                                                         perf_counter=time.perf_counter))
+    assert not weather.should_update_weather(state, 10.0, 20.0)
+    monkeypatch.setattr(weather, "time", SimpleNamespace(time=lambda: real + weather.WEATHER_NEGATIVE_TTL + 1,
+                                                         perf_counter=time.perf_counter))
+    assert weather.should_update_weather(state, 10.0, 20.0)
+
+
+def test_breaker_rejection_is_not_negative_cached(clock):
+    provider = StubProvider("single", fail=True)
+    weather.set_provider(provider)
+    weather._breaker_opts.update(failures=1, reset_sec=5.0)
+    state = AppState(enable_weather=True)
+    weather._fetch_weather_background(state, 10.0, 20.0, "L")     # 실패 → breaker 열림
+    assert weather.breaker_for(provider).state == CircuitBreaker.OPEN
+
+    weather._fetch_weather_background(state, 30.0, 40.0, "L")     # 보내지 않음 (거절)
+    assert provider.calls == 1
+    assert weather.cache_key(10.0, 20.0) in weather._failed_until
+    assert weather.cache_key(30.0, 40.0) not in weather._failed_until
+
+    provider.fail = False
+    clock[0] += 5.0                                                 # breaker 시험 요청 가능 → 바로 받음
+    assert weather.should_update_weather(state, 30.0, 40.0)
+    weather._fetch_weather_background(state, 30.0, 40.0, "L")
+    assert weather.get_cached_weather(state, 30.0, 40.0) == {"icon": "01", "temp": 30}
+
+
+def test_provider_without_fetch_cannot_be_created():
+    class Incomplete(WeatherProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,105 @@
+import json
+import time
+
+import pytest
+
+from wr_radio import config, weather
+from wr_radio.state import AppState
+from wr_radio.weather import WeatherCacheFile
+
+
+def _state(entries=()):
+    state = AppState(enable_weather=True)
+    for (lat, lon), ts, temp in entries:
+        state.weather_cache[weather.cache_key(lat, lon)] = (ts, {"icon": "01", "temp": temp})
+    return state
+
+
+def test_save_load_round_trip_with_validators(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    now = time.time()
+    state = _state([((37.5, 127.0), now - 30, 21), ((35.1, 129.0), now - 60, 25)])
+    weather._validators[weather.cache_key(37.5, 127.0)] = ('"abc"', "Mon, 01 Jan 2024 00:00:00 GMT")
+    store = WeatherCacheFile(str(path), min_interval=300)
+    assert not store.maybe_save(state)           # 바뀐 것이 없으면 쓰지 않음
+    store.mark_dirty()
+    assert store.maybe_save(state) and store.writes == 1
+
+    weather._validators.clear()
+    fresh = _state()
+    assert WeatherCacheFile(str(path)).load(fresh) == 2
+    assert fresh.weather_cache == {k: (round(ts, 1), data) for k, (ts, data) in state.weather_cache.items()}
+    assert weather._validators[weather.cache_key(37.5, 127.0)][0] == '"abc"'
+
+
+def test_saves_are_rate_limited_unless_forced(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    state = _state([((1.0, 2.0), time.time(), 10)])
+    store = WeatherCacheFile(str(path), min_interval=300)
+    store.mark_dirty()
+    assert store.maybe_save(state)
+    store.mark_dirty()
+    assert not store.maybe_save(state)           # min_interval 전
+    assert store.maybe_save(state, force=True)   # 종료 시
+    assert store.writes == 2
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / "weather_cache.json"
+    state = _state([((1.0, 2.0), time.time(), 10)])
+    store = WeatherCacheFile(str(path), min_interval=0)
+    store.mark_dirty()
+    assert store.maybe_save(state)
+    before = path.read_bytes()
+
+    state.weather_cache[weather.cache_key(3.0, 4.0)] = (time.time(), {"icon": "02", "temp": 11})
+    store.mark_dirty()
+
+    def crash(src, dst):
+        raise OSError("전원 끊김")
+
+    monkeypatch.setattr(config.os, "replace", crash)
+    assert not store.maybe_save(state)
+    monkeypatch.undo()
+    assert path.read_bytes() == before           # 쓰다 만 내용이 보이지 않음
+    assert json.loads(before)["entries"].keys() == {weather.cache_key(1.0, 2.0)}
+    assert store.maybe_save(state)               # 아직 dirty → 다음에 다시 씀
+    assert len(json.loads(path.read_bytes())["entries"]) == 2
+
+
+def test_entries_older_than_six_hours_are_dropped_on_load(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    now = time.time()
+    state = _state([((1.0, 2.0), now - weather.WEATHER_STALE_MAX + 60, 10),
+                    ((3.0, 4.0), now - weather.WEATHER_STALE_MAX - 60, 20)])
+    store = WeatherCacheFile(str(path))
+    store.mark_dirty()
+    store.maybe_save(state, force=True)
+
+    fresh = _state()
+    assert WeatherCacheFile(str(path)).load(fresh) == 1
+    assert list(fresh.weather_cache) == [weather.cache_key(1.0, 2.0)]
+
+
+def test_entries_are_rekeyed_when_grid_changes(tmp_path, monkeypatch):
+    path = tmp_path / "weather_cache.json"
+    now = time.time()
+    monkeypatch.setattr(weather, "WEATHER_GRID_DEG", 0.05)
+    state = _state([((37.50, 127.00), now - 100, 20), ((37.65, 127.10), now - 10, 22), ((35.0, 129.0), now, 25)])
+    assert len(state.weather_cache) == 3
+    store = WeatherCacheFile(str(path))
+    store.mark_dirty()
+    store.maybe_save(state, force=True)
+
+    monkeypatch.setattr(weather, "WEATHER_GRID_DEG", 0.5)   # 격자가 커짐 → 앞의 두 곳이 한 칸으로
+    fresh = _state()
+    WeatherCacheFile(str(path)).load(fresh)
+    assert set(fresh.weather_cache) == {weather.cache_key(37.5, 127.0), weather.cache_key(35.0, 129.0)}
+    assert fresh.weather_cache[weather.cache_key(37.6, 127.1)][1]["temp"] == 22   # 더 최근 값
+
+
+@pytest.mark.parametrize("content", ["", "{not json", "[]"])
+def test_broken_file_loads_nothing(tmp_path, content):
+    path = tmp_path / "weather_cache.json"
+    path.write_text(content, encoding="utf-8")
+    assert WeatherCacheFile(str(path)).load(_state()) == 0
@@ -0,0 +1,65 @@
+import time
+
+from wr_radio import weather
+from wr_radio.state import AppState
+
+
+def _state():
+    state = AppState(enable_weather=True)
+    state.radio_stations = [{"name": f"S{i}", "url": f"http://s{i}", "location": f"L{i}", "lat": 10.0 * i,
+                             "lon": 20.0} for i in range(3)]
+    state.current_index = 1
+    state.discard_changes()
+    return state
+
+
+def _fetched(state, i, temp):
+    st = state.radio_stations[i]
+    key = weather.cache_key(st["lat"], st["lon"])
+    with weather._weather_lock:
+        weather._cache_put(state, key, (time.time(), {"icon": "01", "temp": temp}))
+    weather.publish_weather_event(state, key)
+
+
+def test_current_station_update_is_returned_once():
+    state = _state()
+    _fetched(state, 0, 5)
+    _fetched(state, 1, 21)
+    _fetched(state, 1, 22)                               # 같은 키 여러 번 → 한 번만
+    assert weather.take_strip_update(state) == {"icon": "01", "temp": 22}
+    assert state.weather_events.empty()
+    assert weather.take_strip_update(state) is None      # 새 이벤트 없음
+
+
+def test_stale_keys_for_other_stations_are_dropped():
+    state = _state()
+    _fetched(state, 0, 5)
+    _fetched(state, 2, 7)
+    assert weather.take_strip_update(state) is None
+    assert state.weather_events.empty()                  # 버려짐 (다음 카드 표시 때 캐시에서)
+    state.current_index = 2
+    state.discard_changes()
+    assert weather.take_strip_update(state) is None      # 지난 이벤트로 다시 그리지 않음
+
+
+def test_update_is_skipped_while_card_is_changing_or_in_another_mode():
+    state = _state()
+    _fetched(state, 1, 21)
+    state.current_index = 2                               # 채널을 넘기는 중 (카드 전체를 다시 그림)
+    state.current_index = 1
+    assert state.is_changed("current_index")
+    assert weather.take_strip_update(state) is None and state.weather_events.empty()
+
+    state.discard_changes()
+    state.current_mode = "volume"
+    _fetched(state, 1, 23)
+    assert weather.take_strip_update(state) is None
+
+
+def test_same_value_as_displayed_is_not_redrawn():
+    state = _state()
+    state.last_displayed_weather = {"icon": "01", "temp": 21}
+    _fetched(state, 1, 21)                                # 304 갱신 등 값이 같음
+    assert weather.take_strip_update(state) is None
+    _fetched(state, 1, 24)
+    assert weather.take_strip_update(state) == {"icon": "01", "temp": 24}
@@ -0,0 +1,59 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from wr_radio import weather
+from wr_radio.standin import WeatherStandin
+from wr_radio.state import AppState
+
+STATIONS = [(37.5, 127.0), (35.1, 129.0), (51.5, -0.1), (40.7, -74.0), (-33.9, 151.2)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """weather 모듈과 가짜 서버가 함께 쓰는 시계 (몇 시간을 바로 돌림)"""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(weather, "time", SimpleNamespace(
+        time=lambda: now[0], perf_counter=time.perf_counter, monotonic=time.monotonic, sleep=time.sleep))
+    return now
+
+
+def _simulate(mode, clock, hours=12.0, step=60.0):
+    """step 초마다 모든 스테이션을 확인하고 필요하면 조회. (서버 요청 수, 가짜 서버, state)"""
+    srv = WeatherStandin(clock=lambda: clock[0], max_age=0).start()
+    try:
+        weather.configure({"weather_mode": mode, "weather_provider": "standin",
+                           "weather_provider_url": f"http://127.0.0.1:{srv.port}"})
+        state = AppState(enable_weather=True)
+        end = clock[0] + hours * 3600
+        while clock[0] < end:
+            for lat, lon in STATIONS:
+                if weather.should_update_weather(state, lat, lon):
+                    weather._fetch_weather_background(state, lat, lon, f"{lat},{lon}")
+            clock[0] += step
+        return srv.requests, srv, state
+    finally:
+        srv.stop()
+
+
+def test_forecast_mode_cuts_calls_by_an_order_of_magnitude(clock):
+    current, _, _ = _simulate("current", clock)
+    weather._validators.clear()
+    weather._forecasts.clear()
+    forecast, srv, state = _simulate("forecast", clock)
+    assert srv.forecast_requests == forecast
+    assert current >= 10 * forecast, (current, forecast)
+
+    # 표시 값은 받아 둔 예보를 지금 시각으로 보간 → 서버의 현재 값과 거의 같음
+    for lat, lon in STATIONS:
+        shown = weather.get_cached_weather(state, lat, lon)
+        assert abs(shown["temp"] - srv.temp_at(lat, lon, clock[0])) <= 1.5
+
+
+def test_interpolate_forecast_between_points():
+    series = [(0.0, 10.0, "01"), (3600.0, 20.0, "10")]
+    assert weather.interpolate_forecast(series, 900.0) == {"icon": "01", "temp": 12}
+    assert weather.interpolate_forecast(series, 2700.0) == {"icon": "10", "temp": 18}
+    assert weather.interpolate_forecast(series, -5.0) == {"icon": "01", "temp": 10}
+    assert weather.interpolate_forecast(series, 3601.0) is None     # 예보 범위 밖 → 다시 받음
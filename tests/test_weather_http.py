@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from wr_radio import weather
+from wr_radio.standin import WeatherStandin
+from wr_radio.state import AppState
+
+LAT, LON = 37.5, 127.0
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    monkeypatch.setattr(weather, "_session", None)   # 테스트마다 새 연결 풀
+    srvs = []
+
+    def start(**kw):
+        srv = WeatherStandin(**kw).start()
+        srvs.append(srv)
+        weather.set_provider(weather.create_provider("standin", url=f"http://127.0.0.1:{srv.port}"))
+        return srv
+
+    yield start
+    for srv in srvs:
+        srv.stop()
+
+
+def _state():
+    state = AppState()
+    state.enable_weather = True
+    return state
+
+
+def test_etag_round_trip_refreshes_entry_with_304(standin):
+    srv = standin(max_age=600, clock=lambda: 1_000_000.0)
+    state = _state()
+    key = weather.cache_key(LAT, LON)
+
+    weather._fetch_weather_background(state, LAT, LON, "서울")
+    first_at, data = state.weather_cache[key]
+    assert weather._validators[key][0].startswith('"')       # ETag 저장
+
+    time.sleep(0.01)
+    weather._fetch_weather_background(state, LAT, LON, "서울")
+    assert srv.requests == 2 and srv.not_modified == 1       # If-None-Match → 304
+    refreshed_at, same = state.weather_cache[key]
+    assert same == data and refreshed_at > first_at          # 값은 그대로, 시각만 갱신
+    assert weather.fetch_stats.not_modified >= 1
+
+
+def test_max_age_extends_cache_ttl(standin):
+    standin(max_age=3600)
+    state = _state()
+    key = weather.cache_key(LAT, LON)
+    assert weather.cache_ttl(key) == weather.WEATHER_CACHE_TIME
+
+    weather._fetch_weather_background(state, LAT, LON, "서울")
+    assert weather.cache_ttl(key) == 3600
+    # max-age 안에서는 다시 받지 않음
+    stamp, data = state.weather_cache[key]
+    state.weather_cache[key] = (time.time() - weather.WEATHER_CACHE_TIME - 1, data)
+    assert not weather.should_update_weather(state, LAT, LON)
+    state.weather_cache[key] = (time.time() - 3601, data)
+    assert weather.should_update_weather(state, LAT, LON)
+
+
+def test_short_max_age_does_not_shorten_ttl(standin):
+    standin(max_age=60)
+    weather._fetch_weather_background(_state(), LAT, LON, "서울")
+    assert weather.cache_ttl(weather.cache_key(LAT, LON)) == weather.WEATHER_CACHE_TIME
+
+
+def test_read_timeout_is_not_retried(standin, monkeypatch):
+    srv = standin(response_delay=0.5)
+    monkeypatch.setattr(weather, "WEATHER_TIMEOUT", (1.0, 0.2))
+    t0 = time.perf_counter()
+    weather._fetch_weather_background(_state(), LAT, LON, "서울")
+    assert time.perf_counter() - t0 < weather.fetch_max_sec()
+    time.sleep(0.4)                                          # 서버 쪽 처리가 끝날 때까지
+    assert srv.requests == 1
+
+
+def test_server_error_is_retried_once(standin):
+    srv = standin(fail_every=1)
+    state = _state()
+    weather._fetch_weather_background(state, LAT, LON, "서울")
+    assert srv.requests == 2                                 # 처음 + 재시도 1회
+    assert weather.cache_key(LAT, LON) in weather._failed_until
@@ -0,0 +1,131 @@
+import time
+
+from wr_radio import weather
+from wr_radio.standin import WeatherStandin
+from wr_radio.state import AppState
+from wr_radio.weather_providers import OpenMeteoProvider
+from wr_radio.weather_scheduler import WeatherScheduler
+
+
+def _stations(n):
+    # 1° 간격 → 스테이션마다 다른 격자 칸
+    return [{"name": f"S{i}", "url": f"http://s{i}", "location": f"L{i}", "lat": (i // 100) - 50.0, "lon": (i % 100) - 50.0}
+            for i in range(n)]
+
+
+def _run_rounds(sched, state, rounds):
+    """스케줄러가 고른 항목을 바로 받아 캐시에 넣는 것을 반복. 라운드별 요청 수"""
+    counts = []
+    for _ in range(rounds):
+        items = sched._due_items(10_000)
+        with weather._weather_lock:
+            for key, _station in items:
+                weather._cache_put(state, key, (time.time(), {"icon": "01", "temp": 20}))
+        counts.append(len(items))
+    return counts
+
+
+def test_fetch_count_settles_with_more_cells_than_cache():
+    state = AppState()
+    state.radio_stations = _stations(400)
+    state.current_index = 123
+    sched = WeatherScheduler(state)
+    try:
+        counts = _run_rounds(sched, state, 5)
+    finally:
+        sched.pool.shutdown()
+    assert counts[0] == weather.WEATHER_CACHE_MAX
+    assert counts[1:] == [0, 0, 0, 0]
+    assert len(state.weather_cache) == weather.WEATHER_CACHE_MAX
+    # 현재 스테이션은 항상 포함
+    cur = state.radio_stations[state.current_index]
+    assert weather.cache_key(cur["lat"], cur["lon"]) in state.weather_cache
+
+
+def test_working_set_follows_current_station():
+    state = AppState()
+    state.radio_stations = _stations(400)
+    sched = WeatherScheduler(state)
+    try:
+        _run_rounds(sched, state, 2)
+        state.current_index = 200   # 멀리 이동 → 새 주변만 받고 다시 안정
+        counts = _run_rounds(sched, state, 4)
+    finally:
+        sched.pool.shutdown()
+    assert counts[0] > 0
+    assert counts[1:] == [0, 0, 0]
+    cur = state.radio_stations[200]
+    assert weather.cache_key(cur["lat"], cur["lon"]) in state.weather_cache
+
+
+# 가짜 서버가 돌려주는 WMO 코드 → 화면 아이콘 번호
+_WMO_EXPECTED = {0: "01", 1: "02", 2: "03", 3: "04", 61: "10", 71: "13", 95: "11"}
+_CLOCK = 1_000_000.0
+
+
+def _standin_stations(n):
+    return [{"name": f"S{i}", "url": f"http://s{i}", "location": f"L{i}", "lat": 10.0 + i, "lon": 20.0 + 2 * i}
+            for i in range(n)]
+
+
+def _run_until_cached(state, n, timeout=10.0):
+    state.enable_weather = True
+    sched = WeatherScheduler(state, workers=2, calls_per_minute=6000, burst=50)
+    state.weather_scheduler = sched
+    thread = sched.start()
+    try:
+        deadline = time.time() + timeout
+        while len(state.weather_cache) < n and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        state.shutting_down = True
+        sched._wake.set()
+        thread.join(2.0)
+    return sched
+
+
+def test_bulk_scheduler_splits_into_chunks_and_maps_wmo_icons(monkeypatch):
+    srv = WeatherStandin(clock=lambda: _CLOCK).start()
+    try:
+        weather.set_provider(weather.create_provider("standin", url=f"http://127.0.0.1:{srv.port}"),
+                             OpenMeteoProvider(srv.bulk_url))
+        monkeypatch.setattr(weather, "BULK_ENABLED", True)
+        monkeypatch.setattr(weather, "BULK_CHUNK", 4)
+        state = AppState()
+        state.radio_stations = _standin_stations(10)
+        _run_until_cached(state, 10)
+    finally:
+        srv.stop()
+
+    assert len(state.weather_cache) == 10
+    assert srv.bulk_requests == 3 and srv.requests == 3     # 10곳 / 4곳씩 → 일괄 요청 3회, 위치별 요청 없음
+    t = _CLOCK // srv.epoch_sec * srv.epoch_sec
+    codes = set()
+    for st in state.radio_stations:
+        code = srv._WMO[srv._icon_index(st["lat"], st["lon"], t)]
+        codes.add(code)
+        data = state.weather_cache[weather.cache_key(st["lat"], st["lon"])][1]
+        assert data["icon"] == _WMO_EXPECTED[code]
+        assert data["temp"] == int(srv.temp_at(st["lat"], st["lon"], t))
+    assert len(codes) > 3
+
+
+def test_failed_bulk_falls_back_to_per_location_requests(monkeypatch):
+    srv = WeatherStandin(clock=lambda: _CLOCK).start()
+    broken = WeatherStandin(fail_every=1).start()             # 일괄 요청은 항상 503
+    try:
+        weather.set_provider(weather.create_provider("standin", url=f"http://127.0.0.1:{srv.port}"),
+                             OpenMeteoProvider(broken.bulk_url))
+        monkeypatch.setattr(weather, "BULK_ENABLED", True)
+        monkeypatch.setattr(weather, "BULK_CHUNK", 4)
+        state = AppState()
+        state.radio_stations = _standin_stations(6)
+        sched = _run_until_cached(state, 6)
+    finally:
+        srv.stop()
+        broken.stop()
+
+    assert len(state.weather_cache) == 6
+    assert broken.requests >= 1 and broken.bulk_requests == 0  # 503 은 본문 처리 전에 응답
+    assert srv.bulk_requests == 0 and srv.requests == 6       # 실패 뒤 위치마다 한 번씩
+    assert sched._bulk_retry_at > time.time()                 # WEATHER_NEGATIVE_TTL 동안 일괄 요청 쉼
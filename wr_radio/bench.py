@@ -0,0 +1,1187 @@
+"""
+벤치마크 CLI.
+  python3 -m wr_radio.bench stations [--standin] [--profiles prod,low,safe] [--concurrency 2] [--json out.json]
+
+  python3 -m wr_radio.bench recovery [--rounds 5]
+
+stations: 설정된 스테이션마다 TCP 연결 시간, 첫 소리(audio-pts)까지 시간, core-idle=false 까지 시간을 측정.
+player.py 의 mpv 실행 인자 / IPC 코드를 그대로 사용하므로 운영 환경과 같은 조건으로 잰다.
+  python3 -m wr_radio.bench boot [--last 20]
+  python3 -m wr_radio.bench visualizer [--seconds 10]
+  python3 -m wr_radio.bench switch [--trace traces.json] [--ttfa 1.0]
+  python3 -m wr_radio.bench gap [--rounds 5] [--delay 0.5]
+  python3 -m wr_radio.bench weather [--locations 10] [--rounds 3] [--connect-delay 0.05]
+  python3 -m wr_radio.bench weather-cache [--stations 500] [--cities 25] [--grid 0.05] [--max 256]
+  python3 -m wr_radio.bench weather-forecast [--stations 20] [--hours 24]
+  python3 -m wr_radio.bench weather-outage [--seconds 20] [--stations 30]
+  python3 -m wr_radio.bench tz [--stations 10000] [--dataset cities15000.txt]
+  python3 -m wr_radio.bench settings-wear [--hours 1] [--min-interval 10] [--flush-interval 300]
+  python3 -m wr_radio.bench station-store [--sizes 10000,100000]
+  python3 -m wr_radio.bench nav [--sizes 10000,100000]
+
+recovery: mpv 자식 프로세스를 강제 종료하고 MpvSupervisor 가 재시작 + 상태 복원까지 걸린 시간을 측정.
+visualizer: 레벨 피드 + 파형 렌더링을 돌리면서 입력 루프(1ms 주기)의 지연이 얼마나 늘어나는지 측정.
+switch: 로터리 회전 기록(trace)을 재생해 고정 지연 / 회전 속도 기반 정책의 재생 시작 시점과 헛로딩 수 비교.
+gap: 채널 전환 시 무음 구간을 replace / make_before_break 두 방식으로 측정 (가짜 MP3 서버 사용).
+weather: 가짜 날씨 서버로 요청마다 새 연결 / 공용 세션 + 조건부 요청 / 일괄 조회의 요청 수, 지연, 전송량 비교.
+weather-cache: 도시별로 몰린 합성 스테이션 목록에서 격자 캐시 키의 항목 수 / 랜덤 탐색 시 적중률 측정.
+weather-forecast: 시계를 빨리 돌리며 current / forecast 모드의 API 호출 수와 표시 기온 오차 비교 (가짜 날씨 서버).
+weather-outage: 응답 없는 날씨 서버로 채널을 계속 넘기며 circuit breaker 유무에 따른 스레드 / 소켓 수 비교.
+tz: 합성 스테이션의 타임존 찾기 - 예전 표(유클리드) / 전체 비교 / KD-tree 의 조회 시간과 결과 비교.
+settings-wear: 합성 사용 패턴(채널 넘김 / 볼륨 / 밝기)으로 설정 저장 방식별 SD 카드 쓰기 바이트 / fsync 수 비교.
+station-store: 합성 스테이션 목록을 dict 목록(+ 정규화) / StationStore(JSON 스트리밍, 바이너리)로 읽는 시간과 메모리 비교.
+nav: 이름 / 나라 / 가까운 스테이션 색인의 생성 시간, 이동 1회 시간, 스테이션 추가 시 갱신 시간.
+boot: 실제 부팅 때 기록된 boot_times.jsonl 에서 첫 화면 / 첫 소리까지 시간과 단계별 시간 요약.
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import statistics
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from . import display, player, weather
+from .boot import BOOT_LOG, load_boot_log
+from .config import DEFAULT_STATIONS, TIMEZONE_LOOKUP, find_timezone_table, load_config, normalize_stations
+from .standin import StandinServer, WeatherStandin
+from .state import AppState
+from .supervisor import MpvSupervisor
+from .visualizer import LevelFeed
+from .input import InputConfig, SwitchPolicy, replay_trace, synthetic_traces
+from .crossfade import Switcher
+from . import runtime_state, tzindex
+from .stations import StationStore, load_stations
+from .navigation import StationNav, get_nav
+
+# (cache_secs, demuxer_readahead_secs, network_timeout)
+CACHE_PROFILES = {
+    "prod": (player.DEFAULT_CACHE_SECS, player.DEFAULT_READAHEAD_SECS, player.DEFAULT_NETWORK_TIMEOUT),
+    "low": (0.1, 0.1, 3.0),
+    "safe": (2.0, 2.0, 10.0),
+}
+POLL_SEC = 0.02
+
+
+def _connect_time(url: str, timeout: float) -> Optional[float]:
+    u = urlparse(url)
+    port = u.port or (443 if u.scheme == "https" else 80)
+    t0 = time.perf_counter()
+    try:
+        with socket.create_connection((u.hostname, port), timeout=timeout):
+            return time.perf_counter() - t0
+    except OSError:
+        return None
+
+
+def measure_station(station: Dict[str, Any], profile: str, slot: int, timeout: float, audible: bool) -> Dict[str, Any]:
+    cache, readahead, net_timeout = CACHE_PROFILES[profile]
+    result: Dict[str, Any] = {
+        "station": station["name"],
+        "profile": profile,
+        "connect": _connect_time(station["url"], net_timeout),
+        "first_audio": None,
+        "core_idle_false": None,
+        "error": None,
+    }
+
+    state = AppState(mpv_sock=f"/tmp/wr_bench_{os.getpid()}_{slot}.sock")
+    extra = () if audible else ("--ao=null",)
+    proc = None
+    try:
+        if os.path.exists(state.mpv_sock):
+            os.remove(state.mpv_sock)
+        proc = player.spawn_mpv(player.mpv_args(state.mpv_sock, cache, readahead, net_timeout, extra))
+        if not player._wait_for_sock(state.mpv_sock, timeout_sec=8.0, proc=proc):
+            result["error"] = "mpv IPC 소켓 없음"
+            return result
+
+        t0 = time.perf_counter()
+        if not player.mpv_cmd(state, {"command": ["loadfile", station["url"], "replace"]}):
+            result["error"] = "loadfile 실패"
+            return result
+
+        while time.perf_counter() - t0 < timeout:
+            props = player.get_properties(state, ["audio-pts", "core-idle"])
+            elapsed = time.perf_counter() - t0
+            if result["first_audio"] is None and props.get("audio-pts") is not None:
+                result["first_audio"] = elapsed
+            if result["core_idle_false"] is None and props.get("core-idle") is False:
+                result["core_idle_false"] = elapsed
+            if result["first_audio"] is not None and result["core_idle_false"] is not None:
+                break
+            time.sleep(POLL_SEC)
+        else:
+            result["error"] = "시간 초과"
+    except Exception as e:
+        result["error"] = str(e)[:60]
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except Exception:
+                proc.kill()
+        try:
+            os.remove(state.mpv_sock)
+        except OSError:
+            pass
+    return result
+
+
+def _fmt(v: Optional[float]) -> str:
+    return f"{v * 1000:7.0f}" if v is not None else "      -"
+
+
+def print_station_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'프로필':<6} {'연결ms':>7} {'첫소리ms':>8} {'재생ms':>7}  스테이션")
+    for r in results:
+        note = f"  ⚠️ {r['error']}" if r["error"] else ""
+        print(f"{r['profile']:<6} {_fmt(r['connect'])} {_fmt(r['first_audio']):>8} {_fmt(r['core_idle_false'])}  {r['station']}{note}")
+
+    print()
+    for profile in dict.fromkeys(r["profile"] for r in results):
+        vals = [r["core_idle_false"] for r in results if r["profile"] == profile and r["core_idle_false"] is not None]
+        if vals:
+            print(f"{profile}: 재생까지 중앙값 {statistics.median(vals) * 1000:.0f}ms ({len(vals)}개)")
+
+
+def bench_stations(args) -> None:
+    standin = None
+    if args.standin:
+        standin = StandinServer(first_byte_delay=args.standin_delay).start()
+        stations = [
+            {"name": f"standin-{i + 1}", "url": standin.url(f"standin{i + 1}.mp3")}
+            for i in range(args.standin_count)
+        ]
+    else:
+        cfg = load_config() or {}
+        stations = cfg.get("stations") or DEFAULT_STATIONS
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    for p in profiles:
+        if p not in CACHE_PROFILES:
+            raise SystemExit(f"알 수 없는 프로필: {p} (가능: {', '.join(CACHE_PROFILES)})")
+
+    jobs = [(st, p) for p in profiles for st in stations]
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            results = list(pool.map(
+                lambda ij: measure_station(ij[1][0], ij[1][1], ij[0], args.timeout, args.audible),
+                enumerate(jobs),
+            ))
+    finally:
+        if standin is not None:
+            standin.stop()
+
+    print_station_table(results)
+    out = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(out)
+        print(f"JSON 저장: {args.json}")
+    else:
+        print(out)
+
+
+def bench_recovery(args) -> None:
+    standin = StandinServer().start()
+    state = AppState(mpv_sock=f"/tmp/wr_bench_{os.getpid()}_recovery.sock")
+    state.current_volume = 37
+    state.play_url = standin.url()
+    state.is_playing = True
+    extra = ("--ao=null",)
+
+    results = []
+    try:
+        if not player.ensure_mpv_running(state, extra=extra):
+            raise SystemExit("mpv 실행 실패")
+        player.restore_player_state(state)
+        sup = MpvSupervisor(state, extra=extra)
+        sup.start()
+
+        for i in range(args.rounds):
+            time.sleep(args.settle)
+            sup.recovered.clear()
+            t0 = time.perf_counter()
+            state.player_process.kill()
+            ok = sup.recovered.wait(timeout=10.0)
+            dt = time.perf_counter() - t0
+            props = player.get_properties(state, ["volume", "path"])
+            restored = props.get("volume") == state.current_volume and props.get("path") == state.play_url
+            results.append({"round": i + 1, "recovered": ok, "recovery": dt, "state_restored": restored})
+            print(f"{i + 1:>2}: {'복구' if ok else '실패'} {dt * 1000:6.0f}ms  상태 복원={'O' if restored else 'X'}")
+    finally:
+        player.shutdown_player(state)
+        standin.stop()
+
+    times = [r["recovery"] for r in results if r["recovered"]]
+    if times:
+        print(f"\n복구 시간 중앙값 {statistics.median(times) * 1000:.0f}ms, 최대 {max(times) * 1000:.0f}ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def _pct(vals: List[float], q: float) -> float:
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(q * len(vals)))]
+
+
+def bench_boot(args) -> None:
+    runs = load_boot_log(args.log)[-args.last:]
+    if not runs:
+        print(f"부팅 기록이 없습니다: {args.log}")
+        return
+
+    print(f"최근 부팅 {len(runs)}회 (예산 {runs[-1].get('budget_sec', 0):.1f}s)")
+    print(f"{'항목':<12} {'중앙값ms':>8} {'p90ms':>7} {'최대ms':>7}")
+    rows: Dict[str, List[float]] = {}
+    for r in runs:
+        for k, v in r.get("marks", {}).items():
+            rows.setdefault("▶ " + k, []).append(v)
+        for k, p in r.get("phases", {}).items():
+            rows.setdefault(k, []).append(p["duration"])
+    for k, vals in rows.items():
+        print(f"{k:<12} {statistics.median(vals) * 1000:8.0f} {_pct(vals, 0.9) * 1000:7.0f} {max(vals) * 1000:7.0f}")
+
+    over = sum(1 for r in runs if max(r.get("marks", {}).values(), default=0) > r.get("budget_sec", 0))
+    if over:
+        print(f"⚠️  예산 초과 {over}회")
+
+
+class _NullGPIO:
+    HIGH = 1
+    LOW = 0
+
+    def output(self, pin, value):
+        pass
+
+
+class _NullSPI:
+    def writebytes(self, data):
+        pass
+
+    def writebytes2(self, data):
+        pass
+
+
+def _input_loop_gaps(seconds: float) -> List[float]:
+    """main() 입력 루프처럼 1ms 씩 자면서 실제 루프 간격 기록"""
+    gaps = []
+    end = time.perf_counter() + seconds
+    last = time.perf_counter()
+    while last < end:
+        time.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+    return gaps
+
+
+def _render_worker(state, feed, stop, fps: float) -> None:
+    from PIL import Image, ImageDraw
+
+    gpio, pins = _NullGPIO(), {"CS": 0, "DC": 0}
+    frame = 0
+    while not stop.is_set():
+        img = Image.new("RGB", (240, 240), (0, 0, 0))
+        levels = feed.snapshot() if feed is not None and feed.active else [abs((frame % 20) - 10) / 10.0] * 40
+        display.draw_level_wave(ImageDraw.Draw(img), frame, levels)
+        display.display_image_region(gpio, pins, state, img, 0, 125, 239, 165)
+        frame += 1
+        stop.wait(1.0 / fps)
+
+
+def bench_visualizer(args) -> None:
+    import threading
+
+    def summary(label, gaps):
+        print(f"{label:<10} 루프 간격 p50 {_pct(gaps, 0.5) * 1000:5.2f}ms  p99 {_pct(gaps, 0.99) * 1000:5.2f}ms  최대 {max(gaps) * 1000:6.2f}ms")
+
+    base = _input_loop_gaps(args.seconds)
+    summary("기준", base)
+
+    state = AppState(mpv_sock=f"/tmp/wr_bench_{os.getpid()}_vis.sock")
+    state.spi = _NullSPI()
+    standin = StandinServer().start()
+    feed = None
+    try:
+        if player.ensure_mpv_running(state, extra=("--ao=null",)):
+            player.load_url(state, standin.url())
+            state.is_playing = True
+            state.audio_playing = True
+            feed = LevelFeed(state, max_hz=args.max_hz, cpu_budget=args.cpu_budget)
+            feed.start()
+        else:
+            print("⚠️  mpv 없음 → 합성 레벨로 렌더링만 측정")
+
+        stop = threading.Event()
+        th = threading.Thread(target=_render_worker, args=(state, feed, stop, args.fps), daemon=True)
+        cpu0 = time.process_time()
+        th.start()
+        gaps = _input_loop_gaps(args.seconds)
+        stop.set()
+        th.join()
+        cpu = (time.process_time() - cpu0) / args.seconds
+    finally:
+        state.shutting_down = True
+        player.shutdown_player(state)
+        standin.stop()
+
+    summary("시각화", gaps)
+    print(f"프로세스 CPU {cpu * 100:.1f}% (입력 루프 포함)")
+    if feed is not None:
+        print(f"레벨 피드: {'동작' if feed.active else '값 없음'}, 주기 {1.0 / feed.interval:.1f}Hz, CPU {feed.cpu_usage * 100:.2f}%")
+
+
+def bench_switch(args) -> None:
+    if args.trace:
+        with open(args.trace, "r", encoding="utf-8") as f:
+            traces = json.load(f)
+    else:
+        traces = synthetic_traces(args.samples)
+
+    variants = {
+        "fixed": InputConfig(adaptive_switch=False),
+        "adaptive": InputConfig(adaptive_switch=True),
+    }
+    print(f"{'trace':<11} {'정책':<9} {'첫소리 중앙값ms':>15} {'헛로딩':>6}")
+    summary: Dict[str, List[float]] = {}
+    for name, runs in traces.items():
+        for vname, cfg in variants.items():
+            lat, wasted = [], 0
+            for trace in runs:
+                r = replay_trace(trace, SwitchPolicy(cfg))
+                if r["latency"] is not None:
+                    lat.append(r["latency"] + args.ttfa)
+                wasted += r["wasted"]
+            med = statistics.median(lat) if lat else float("nan")
+            summary.setdefault(vname, []).extend(lat)
+            print(f"{name:<11} {vname:<9} {med * 1000:15.0f} {wasted / max(len(runs), 1):6.2f}")
+    print()
+    for vname, lat in summary.items():
+        print(f"{vname:<9} 전체 중앙값 {statistics.median(lat) * 1000:.0f}ms")
+
+
+def _audible(sock: str) -> bool:
+    return player.get_properties(SimpleNamespace(mpv_sock=sock), ["core-idle"], timeout=0.1).get("core-idle") is False
+
+
+def _measure_switch_gap(state, index: int, timeout: float) -> Optional[float]:
+    """play_station 을 돌리는 동안 두 mpv 중 어느 쪽도 소리를 내지 않은 가장 긴 구간 (초)"""
+    worker = threading.Thread(target=player.play_station, args=(state, index), daemon=True)
+    t_end = time.perf_counter() + timeout
+    silent_since = None
+    longest = 0.0
+    worker.start()
+    while time.perf_counter() < t_end:
+        now = time.perf_counter()
+        if _audible(state.mpv_sock) or _audible(state.mpv_sock_standby):
+            if silent_since is not None:
+                longest = max(longest, now - silent_since)
+                silent_since = None
+            if not worker.is_alive() and _audible(state.mpv_sock):
+                state.audio_playing = True
+                return longest
+        elif silent_since is None:
+            silent_since = now
+        time.sleep(0.005)
+    return None
+
+
+def bench_gap(args) -> None:
+    standin = StandinServer(first_byte_delay=args.delay).start()
+    urls = [standin.url(f"gap{i}.mp3") for i in range(args.stations)]
+    extra = ("--ao=null",)
+    summary = {}
+    try:
+        for mode in ("replace", "make_before_break"):
+            tag = f"/tmp/wr_bench_{os.getpid()}_gap"
+            state = AppState(mpv_sock=tag + "_a.sock", mpv_sock_standby=tag + "_b.sock")
+            state.radio_stations = [{"name": f"gap{i}", "url": u} for i, u in enumerate(urls)]
+            state.switcher = Switcher(mode=mode, crossfade_sec=args.crossfade, extra=extra)
+            if not player.ensure_mpv_running(state, extra=extra):
+                raise SystemExit("mpv 실행 실패")
+            state.switcher.prepare(state)
+
+            gaps = []
+            try:
+                player.play_station(state, 0)
+                if _measure_switch_gap(state, 0, args.timeout) is None:
+                    raise SystemExit("첫 스테이션 재생 실패")
+                for i in range(args.rounds):
+                    time.sleep(args.settle)
+                    gap = _measure_switch_gap(state, (i + 1) % len(urls), args.timeout)
+                    gaps.append(gap)
+                    print(f"{mode:<18} {i + 1:>2}: {'시간 초과' if gap is None else f'{gap * 1000:6.0f}ms'}")
+            finally:
+                player.shutdown_player(state)
+
+            ok = [g for g in gaps if g is not None]
+            summary[mode] = {
+                "rounds": len(gaps),
+                "failed": len(gaps) - len(ok),
+                "gap_p50_ms": round(statistics.median(ok) * 1000, 1) if ok else None,
+                "gap_max_ms": round(max(ok) * 1000, 1) if ok else None,
+                "handovers": state.switcher.handovers,
+            }
+    finally:
+        standin.stop()
+
+    print()
+    for mode, r in summary.items():
+        print(f"{mode:<18} 무음 중앙값 {r['gap_p50_ms']}ms, 최대 {r['gap_max_ms']}ms, 실패 {r['failed']}/{r['rounds']}, 교대 {r['handovers']}회")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+def _weather_params(i: int) -> Dict[str, Any]:
+    return {"lat": 33.0 + i * 0.37, "lon": 126.0 + i * 0.21, "appid": "bench", "units": "metric", "lang": "kr"}
+
+
+def bench_weather(args) -> None:
+    results = {}
+    for mode in ("per_call", "session", "bulk"):
+        srv = WeatherStandin(connect_delay=args.connect_delay, response_delay=args.response_delay).start()
+        weather.WEATHER_URL = srv.url
+        weather.set_provider(weather.create_provider("standin", url=f"http://127.0.0.1:{srv.port}"),
+                             weather.OpenMeteoProvider(srv.bulk_url))
+        weather._validators.clear()
+        weather.fetch_stats = weather.FetchStats()
+        latencies, nbytes = [], 0
+        try:
+            for _ in range(args.rounds):
+                if mode == "bulk":
+                    # 전체 위치를 BULK_CHUNK 개씩 묶어 조회 (1회 = 위치 목록 전체)
+                    state = AppState()
+                    state.enable_weather = True
+                    t0 = time.perf_counter()
+                    weather.fetch_weather_bulk(state, [(p["lat"], p["lon"]) for p in map(_weather_params, range(args.locations))])
+                    latencies.append((time.perf_counter() - t0) / args.locations)
+                    continue
+                for i in range(args.locations):
+                    params = _weather_params(i)
+                    t0 = time.perf_counter()
+                    if mode == "per_call":
+                        r = requests.get(srv.url, params=params, timeout=5)
+                        nbytes += len(r.content) + sum(len(k) + len(v) + 4 for k, v in r.headers.items())
+                    else:
+                        weather.request_weather(weather.cache_key(params["lat"], params["lon"]), params)
+                    latencies.append(time.perf_counter() - t0)
+            if mode != "per_call":
+                nbytes = weather.fetch_stats.bytes_total
+        finally:
+            srv.stop()
+        n = args.rounds * args.locations
+        results[mode] = {
+            "locations": n,
+            "requests": srv.requests,
+            "connections": srv.connections,
+            "not_modified": srv.not_modified,
+            "p50_ms": round(_pct(latencies, 0.5) * 1000, 2),
+            "p95_ms": round(_pct(latencies, 0.95) * 1000, 2),
+            "bytes_per_fetch": round(nbytes / n, 1),
+        }
+    weather._session = None
+
+    print(f"{'방식':<10} {'위치':>5} {'요청':>5} {'연결':>5} {'304':>5} {'p50':>9} {'p95':>9} {'바이트/회':>10}")
+    for mode, r in results.items():
+        print(f"{mode:<10} {r['locations']:>5} {r['requests']:>5} {r['connections']:>5} {r['not_modified']:>5} "
+              f"{r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms {r['bytes_per_fetch']:>10.0f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def bench_weather_cache(args) -> None:
+    import random
+
+    rnd = random.Random(args.seed)
+    cities = [(rnd.uniform(-50, 60), rnd.uniform(-120, 140)) for _ in range(args.cities)]
+    stations = []
+    for _ in range(args.stations):
+        lat, lon = rnd.choice(cities)
+        # 같은 도시 안에서 수백 m ~ 수 km 떨어진 방송국
+        stations.append((lat + rnd.uniform(-0.02, 0.02), lon + rnd.uniform(-0.02, 0.02)))
+
+    saved = (weather.WEATHER_GRID_DEG, weather.WEATHER_CACHE_MAX)
+    print(f"스테이션 {args.stations}개 / 도시 {args.cities}곳, 탐색 {args.views}회")
+    try:
+        for grid in (0.0, args.grid):
+            weather.configure({"weather_grid_deg": grid, "weather_cache_max": args.max})
+            weather.fetch_stats = weather.FetchStats()
+            state = AppState()
+            state.enable_weather = True
+            keys = {weather.cache_key(lat, lon) for lat, lon in stations}
+            fetches = 0
+            for _ in range(args.views):
+                lat, lon = rnd.choice(stations)
+                if weather.get_cached_weather(state, lat, lon) is None:
+                    fetches += 1
+                    with weather._weather_lock:
+                        weather._cache_put(state, weather.cache_key(lat, lon), (time.time(), {"icon": "01", "temp": 0}))
+            fs = weather.fetch_stats
+            label = "좌표 그대로" if grid == 0 else f"격자 {grid}°"
+            print(f"  {label:<12} 키 {len(keys):>5}개, 캐시 {len(state.weather_cache):>4}/{args.max}, "
+                  f"적중률 {fs.hit_rate() * 100:5.1f}%, 요청 {fetches}회, 삭제 {fs.evictions}회")
+    finally:
+        weather.configure({"weather_grid_deg": saved[0], "weather_cache_max": saved[1]})
+
+
+class _FakeClock:
+    """weather 모듈의 time 대신 끼워 넣는 시계 (time() 만 가짜, 나머지는 실제 time 모듈)"""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def bench_weather_forecast(args) -> None:
+    clock = _FakeClock(time.time() // 3600 * 3600)
+    srv = WeatherStandin(clock=clock.time).start()
+    saved = (weather.WEATHER_MODE, weather.time)
+    weather.time = clock
+    points = [(30 + i * 0.7, 120 + i * 1.3) for i in range(args.stations)]
+    results = {}
+    try:
+        for mode in ("current", "forecast"):
+            weather.configure({"weather_mode": mode})
+            weather.set_provider(weather.create_provider("standin", url=f"http://127.0.0.1:{srv.port}"))
+            weather._forecasts.clear()
+            weather._validators.clear()
+            weather._failed_until.clear()
+            clock.now = time.time() // 3600 * 3600
+            state = AppState()
+            state.enable_weather = True
+            before = srv.requests
+            errors = []
+            end = clock.now + args.hours * 3600
+            while clock.now < end:
+                for lat, lon in points:
+                    if weather.should_update_weather(state, lat, lon):
+                        weather._fetch_weather(state, weather.cache_key(lat, lon), lat, lon, "")
+                    wd = weather.get_cached_weather(state, lat, lon)
+                    if wd is not None:
+                        errors.append(abs(wd["temp"] - srv.temp_at(lat, lon, clock.now)))
+                clock.now += args.step
+            results[mode] = {
+                "calls": srv.requests - before,
+                "calls_per_station_day": round((srv.requests - before) / args.stations / (args.hours / 24), 1),
+                "temp_err_mean": round(statistics.mean(errors), 2),
+                "temp_err_max": round(max(errors), 2),
+            }
+    finally:
+        weather.WEATHER_MODE, weather.time = saved
+        srv.stop()
+
+    print(f"스테이션 {args.stations}곳, {args.hours}시간 (표시 확인 {args.step:.0f}초마다)")
+    for mode, r in results.items():
+        print(f"  {mode:<9} 호출 {r['calls']:>5}회 (스테이션·일당 {r['calls_per_station_day']:>5}), "
+              f"기온 오차 평균 {r['temp_err_mean']:.2f}°C / 최대 {r['temp_err_max']}°C")
+    if results["forecast"]["calls"]:
+        print(f"  호출 감소: {results['current']['calls'] / results['forecast']['calls']:.1f}배")
+
+
+def _blackhole_server():
+    """연결은 받지만 아무 응답도 하지 않는 서버 (API 장애 흉내)"""
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(128)
+    held = []
+
+    def accept_loop():
+        while True:
+            try:
+                conn, _ = srv.accept()
+            except OSError:
+                return
+            held.append(conn)
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return srv, held
+
+
+def _open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+
+def bench_weather_outage(args) -> None:
+    srv, held = _blackhole_server()
+    base = f"http://127.0.0.1:{srv.getsockname()[1]}"
+    results = {}
+    saved_timeout = weather.WEATHER_TIMEOUT
+    weather.WEATHER_TIMEOUT = (args.timeout, args.timeout)
+    try:
+        for label, failures in (("breaker 없음", 10 ** 9), ("breaker", args.failures)):
+            weather.configure({"weather_breaker": {"failures": failures, "reset_sec": args.reset}})
+            weather.set_provider(weather.create_provider("standin", url=base))
+            weather._failed_until.clear()
+            weather._session = None
+            state = AppState()
+            state.enable_weather = True
+            state.radio_stations = [
+                {"name": f"s{i}", "lat": 10 + i * 0.5, "lon": 100.0, "location": f"L{i}"} for i in range(args.stations)
+            ]
+            threads0, fds0, conns0 = threading.active_count(), _open_fds(), len(held)
+            peak_threads = peak_fds = 0
+            t_end = time.perf_counter() + args.seconds
+            i = 0
+            while time.perf_counter() < t_end:
+                weather.start_weather_update(state, i % args.stations)  # 채널을 계속 넘기는 사용자
+                i += 1
+                peak_threads = max(peak_threads, threading.active_count() - threads0)
+                peak_fds = max(peak_fds, _open_fds() - fds0)
+                time.sleep(args.interval)
+            results[label] = {"peak_threads": peak_threads, "peak_sockets": peak_fds,
+                              "connections": len(held) - conns0, "breaker": weather.provider_status()["single"]}
+            # 다음 측정 전에 남은 요청이 끝나도록 대기
+            deadline = time.perf_counter() + sum(weather.WEATHER_TIMEOUT) * 4
+            while threading.active_count() > threads0 and time.perf_counter() < deadline:
+                time.sleep(0.2)
+    finally:
+        weather.WEATHER_TIMEOUT = saved_timeout
+        srv.close()
+        for c in held:
+            c.close()
+        weather.configure({})
+
+    print(f"응답 없는 서버, 스테이션 {args.stations}곳을 {args.interval}초마다 넘기며 {args.seconds:.0f}초")
+    for label, r in results.items():
+        b = r["breaker"]
+        print(f"  {label:<12} 최대 추가 스레드 {r['peak_threads']:>3}개, 소켓(fd) {r['peak_sockets']:>3}개, "
+              f"연결 시도 {r['connections']:>4}회  (상태 {b['state']}, 차단 {b['rejected']}회)")
+
+
+def bench_tz(args) -> None:
+    import random
+
+    t0 = time.perf_counter()
+    index = tzindex.get_index(args.dataset)
+    build = time.perf_counter() - t0
+    if index is None:
+        print("타임존 데이터(zone.tab)를 찾지 못함")
+        return
+
+    rnd = random.Random(args.seed)
+    # 절반은 기준 도시 근처(실제 방송국처럼), 절반은 전 세계 균등
+    refs = [(s["lat"], s["lon"]) for s in DEFAULT_STATIONS]
+    refs += [(rnd.uniform(-60, 70), rnd.uniform(-180, 180)) for _ in range(200)]
+    points = []
+    for i in range(args.stations):
+        if i % 2:
+            lat, lon = rnd.choice(refs)
+            points.append((max(-90.0, min(90.0, lat + rnd.gauss(0, 1))), (lon + rnd.gauss(0, 1) + 180) % 360 - 180))
+        else:
+            lat = math.degrees(math.asin(rnd.uniform(-1, 1)))  # 구면 위 균등
+            points.append((lat, rnd.uniform(-180, 180)))
+
+    def timed(fn, pts):
+        t = time.perf_counter()
+        out = [fn(lat, lon) for lat, lon in pts]
+        return out, (time.perf_counter() - t) / len(pts) * 1e6
+
+    table, t_table = timed(find_timezone_table, points)
+    tree, t_tree = timed(lambda a, b: index.nearest(a, b)[0], points)
+    sample = points[:args.verify]
+    linear, t_linear = timed(lambda a, b: index.nearest_linear(a, b)[0], sample)
+    mismatch = sum(1 for a, b in zip(tree, linear) if a != b)
+    changed = sum(1 for a, b in zip(tree, table) if a != b)
+
+    print(f"기준점 {len(index)}곳 / 타임존 {len(index.names)}개, 인덱스 생성 {build * 1000:.1f} ms")
+    print(f"스테이션 {args.stations}곳")
+    rows = [
+        (f"예전 표 (유클리드, {len(TIMEZONE_LOOKUP)}곳)", t_table, ""),
+        ("전체 비교 (대원 거리)", t_linear, f"  ({len(sample)}건)"),
+        ("KD-tree (대원 거리)", t_tree, f"  전체 비교와 불일치 {mismatch}건"),
+    ]
+    for label, us, note in rows:
+        print(f"  {label:<24} {us:9.1f} µs/건{note}")
+    print(f"  예전 표와 결과가 다른 스테이션 {changed}곳 ({changed / len(points) * 100:.1f}%)")
+    print("기본 스테이션:")
+    for st in DEFAULT_STATIONS:
+        tz, km = index.nearest(st["lat"], st["lon"])
+        print(f"  {st['location']:<20} {find_timezone_table(st['lat'], st['lon']):<22} → {tz} ({km:.0f} km)")
+
+
+def _usage_events(hours: float, seed: int) -> List[Tuple[float, str, int]]:
+    """(시각, 항목, 변화량) - 몇 분마다 채널 넘김 묶음, 가끔 볼륨 / 밝기 조절"""
+    import random
+
+    rnd = random.Random(seed)
+    events = []
+    t = 0.0
+    while t < hours * 3600:
+        t += rnd.uniform(120, 480)
+        kind = rnd.choices(["station", "volume", "brightness"], weights=[6, 3, 1])[0]
+        steps = rnd.randint(3, 15) if kind == "station" else rnd.randint(2, 6)
+        direction = rnd.choice((-1, 1))
+        for _ in range(steps):
+            t += rnd.uniform(0.1, 0.5) if kind == "station" else rnd.uniform(0.2, 1.5)
+            events.append((t, kind, direction))
+    return [e for e in events if e[0] < hours * 3600]
+
+
+def bench_settings_wear(args) -> None:
+    import tempfile
+
+    cfg = load_config() or {"stations": DEFAULT_STATIONS, "last_station": 0, "last_volume": 50, "last_brightness": 100}
+    events = _usage_events(args.hours, args.seed)
+    debounce = InputConfig().save_delay_sec
+    clock = _FakeClock(0.0)
+    saved_time = runtime_state.time
+    runtime_state.time = clock
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as disk, tempfile.TemporaryDirectory() as tmpfs:
+            variants = {
+                "config.json": None,
+                "runtime": runtime_state.RuntimeStateFile(
+                    os.path.join(disk, "a.json"), fsync="always", min_interval=args.min_interval),
+                "runtime+tmpfs": runtime_state.RuntimeStateFile(
+                    os.path.join(disk, "b.json"), fsync="always", staging_dir=tmpfs,
+                    flush_interval=args.flush_interval),
+            }
+            for label, store in variants.items():
+                clock.now = 0.0
+                values = {"station": 0, "volume": 50, "brightness": 100}
+                if store is not None:
+                    store.load()
+                old = {"writes": 0, "bytes_written": 0}
+                pending, last_change = False, 0.0
+                queue = list(events)
+                # 메인 루프와 같은 흐름: 값 변경 → save_delay_sec 뒤 저장 (0.1초 단위로 진행)
+                while clock.now < args.hours * 3600:
+                    while queue and queue[0][0] <= clock.now:
+                        _, kind, d = queue.pop(0)
+                        step = {"station": 1, "volume": 5, "brightness": 10}[kind]
+                        values[kind] += d * step
+                        pending, last_change = True, clock.now
+                    if pending and clock.now - last_change >= debounce:
+                        pending = False
+                        if store is None:
+                            # 예전 save_settings: config.json 전체를 다시 씀
+                            cfg.update(last_station=values["station"], last_volume=values["volume"],
+                                       last_brightness=values["brightness"])
+                            old["writes"] += 1
+                            old["bytes_written"] += len(json.dumps(cfg, indent=2, ensure_ascii=False).encode("utf-8"))
+                        else:
+                            store.update(**values)
+                    if store is not None:
+                        store.maybe_flush()
+                    clock.now += 0.1
+                if store is not None:
+                    store.update(**values)
+                    store.flush(shutdown=True)
+                    results[label] = store.stats()
+                else:
+                    results[label] = dict(old, fsyncs=0, staged_writes=0)
+    finally:
+        runtime_state.time = saved_time
+
+    print(f"{args.hours:g}시간, 입력 {len(events)}회 (스테이션 {len(cfg.get('stations', []))}개 config.json)")
+    for label, r in results.items():
+        per_hour = r["bytes_written"] / args.hours
+        print(f"  {label:<14} SD 쓰기 {r['writes']:>4}회, {per_hour:>9.0f} B/시간, fsync {r['fsyncs']:>4}회"
+              + (f", tmpfs 쓰기 {r['staged_writes']}회" if r["staged_writes"] else ""))
+
+
+def _synthetic_stations(n: int, seed: int) -> List[Dict[str, Any]]:
+    """Radio-Browser 목록 비슷한 스테이션 (timezone 없음, 일부만 색상)"""
+    import random
+
+    rnd = random.Random(seed)
+    countries = ["Korea", "Japan", "Germany", "France", "USA", "Brazil", "Kenya", "Australia", "India", "Canada"]
+    out = []
+    for i in range(n):
+        st = {
+            "name": f"{rnd.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{rnd.choice('aeiou')}dio {i:06d} FM",
+            "url": f"http://stream{i % 97}.example.net:8000/live/{i:06d}.mp3",
+            "location": f"City {i % 5000}, {rnd.choice(countries)}",
+            "lat": round(rnd.uniform(-55, 70), 5),
+            "lon": round(rnd.uniform(-180, 180), 5),
+        }
+        if i % 10 == 0:
+            st["color"] = [rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)]
+        out.append(st)
+    return out
+
+
+def _measure_load(fn) -> Tuple[float, int, Any]:
+    """(초, 유지 메모리 바이트, 결과) - 시간은 tracemalloc 없이 따로 잼"""
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    t = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, retained, result
+
+
+def bench_station_store(args) -> None:
+    import contextlib
+    import io
+    import tempfile
+
+    tzindex.get_index()  # 타임존 인덱스 생성 시간은 제외
+    with tempfile.TemporaryDirectory() as d:
+        for n in (int(v) for v in args.sizes.split(",")):
+            json_path = os.path.join(d, f"stations{n}.json")
+            bin_path = os.path.join(d, f"stations{n}.bin")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(_synthetic_stations(n, args.seed), f, ensure_ascii=False)
+            load_stations({"stations_file": json_path}).save_binary(bin_path)
+
+            def dict_list():
+                with open(json_path, "r", encoding="utf-8") as f:
+                    cfg = {"stations": json.load(f)}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    normalize_stations(cfg)  # 예전 시작 과정: 색상 변환 + timezone 전부 계산
+                return cfg["stations"]
+
+            rows = [
+                ("dict 목록 + 정규화", dict_list),
+                ("StationStore (JSON)", lambda: load_stations({"stations_file": json_path})),
+                ("StationStore (.bin)", lambda: StationStore.load_binary(bin_path)),
+            ]
+            print(f"스테이션 {n}개 (JSON {os.path.getsize(json_path) / 1e6:.1f} MB, .bin {os.path.getsize(bin_path) / 1e6:.1f} MB)")
+            for label, fn in rows:
+                elapsed, retained, stations = _measure_load(fn)
+                view_us = []
+                for _ in range(2):  # 첫 번째: 늦은 timezone 계산 포함, 두 번째: 계산된 값
+                    t = time.perf_counter()
+                    for i in range(0, len(stations), max(1, len(stations) // 1000)):
+                        stations[i]["name"], stations[i]["timezone"], stations[i]["color"]
+                    view_us.append((time.perf_counter() - t) / 1000 * 1e6)
+                print(f"  {label:<22} 시작 {elapsed * 1000:8.1f} ms, 메모리 {retained / 1e6:7.1f} MB, "
+                      f"카드 값 읽기 첫 {view_us[0]:5.1f} µs / 이후 {view_us[1]:4.1f} µs")
+
+
+def bench_nav(args) -> None:
+    import random
+
+    rnd = random.Random(args.seed)
+    for n in (int(v) for v in args.sizes.split(",")):
+        store = StationStore()
+        store.extend(_synthetic_stations(n, args.seed))
+        t = time.perf_counter()
+        nav = StationNav(store)
+        build = time.perf_counter() - t
+
+        picks = [rnd.randrange(n) for _ in range(args.lookups)]
+        timings = {}
+        for label, fn in (
+            ("첫 글자 이동", lambda i: nav.next_initial(i, 1)),
+            ("나라 이동", lambda i: nav.next_country(i, -1)),
+            (f"가까운 {args.k}곳", lambda i: nav.nearby(i, args.k)),
+        ):
+            t = time.perf_counter()
+            for i in picks:
+                fn(i)
+            timings[label] = (time.perf_counter() - t) / len(picks) * 1e6
+
+        store.extend(_synthetic_stations(args.add, args.seed + 1))
+        t = time.perf_counter()
+        nav.refresh()
+        incremental = time.perf_counter() - t
+        t = time.perf_counter()
+        StationNav(store)
+        rebuild = time.perf_counter() - t
+
+        print(f"스테이션 {n}개: 색인 생성 {build * 1000:.0f} ms")
+        for label, us in timings.items():
+            print(f"  {label:<12} {us:8.1f} µs/회")
+        print(f"  {args.add}개 추가 후 갱신 {incremental * 1000:.2f} ms (전체 재생성 {rebuild * 1000:.0f} ms)")
+
+
+def bench_config_reload(args) -> None:
+    """재시작 대신 다시 읽기: 준비 (감시 스레드) / 적용 (메인 루프) 시간, 그대로 유지되는 것 (timezone / 날씨 / 재생)"""
+    import contextlib
+    import io
+    import random
+
+    from .config_watch import apply_station_reload, prepare_station_reload
+
+    rnd = random.Random(args.seed)
+    tzindex.get_index()
+    for n in (int(v) for v in args.sizes.split(",")):
+        stations = _synthetic_stations(n, args.seed)
+        state = AppState()
+        state.radio_stations = load_stations({"stations": stations})
+        state.current_index = state.play_index = n // 2
+        state.station_nav = StationNav(state.radio_stations)
+        for i in range(0, n, max(1, n // 1000)):
+            st = state.radio_stations[i]
+            st["timezone"]  # 화면에 나왔던 스테이션만 timezone 이 계산되어 있음
+            state.weather_cache[weather.cache_key(st["lat"], st["lon"])] = (time.time(), {"temp": 20})
+
+        # 편집: 몇 곳 이름 변경 / 삭제 / 추가 (현재 스테이션은 그대로)
+        edited = [dict(st) for st in stations]
+        for i in rnd.sample(range(n), args.edits):
+            edited[i]["name"] += " (new)"
+        for i in sorted(rnd.sample(range(n // 2 + 1, n), args.edits), reverse=True):
+            del edited[i]
+        for st in _synthetic_stations(args.edits, args.seed + 1):
+            st["url"] += "?added"
+            edited.append(st)
+
+        resolved = len(state.radio_stations._tz_resolved)
+        cached = len(state.weather_cache)
+        t = time.perf_counter()
+        prepared = prepare_station_reload(state, {"stations": edited})
+        prepare = time.perf_counter() - t
+        t = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            r = apply_station_reload(state, prepared)
+        apply = time.perf_counter() - t
+        t = time.perf_counter()
+        get_nav(state)   # 적용 후 첫 이동 모드 진입 (색인을 미리 만들어 두었으면 바로)
+        first_nav = time.perf_counter() - t
+        print(f"스테이션 {n}개, 변경 {len(r['changed'])} / 삭제 {len(r['removed'])} / 추가 {len(r['added'])}: "
+              f"읽기·diff {prepare * 1000:.0f} ms (감시 스레드), 적용 {apply * 1000:.1f} ms (메인 루프)")
+        print(f"  timezone 재사용 {len(state.radio_stations._tz_resolved)}/{resolved}, "
+              f"날씨 캐시 유지 {len(state.weather_cache)}/{cached}, "
+              f"재생 {'다른 스테이션으로' if r['replay'] else '계속'}, 카드 다시 그림 {'예' if r['current_changed'] else '아니오'}, "
+              f"첫 이동 모드 {first_nav * 1000:.2f} ms")
+
+def bench_config_cache(args) -> None:
+    """부팅 시 스테이션 목록 준비: 예전 정규화 / 캐시 없음 / 캐시 있음 / touch 후 (sha1 확인)"""
+    import contextlib
+    import io
+    import tempfile
+
+    from .station_cache import StationCache
+
+    tzindex.get_index()
+    with tempfile.TemporaryDirectory() as d:
+        cfg_path = os.path.join(d, "config.json")
+        for n in (int(v) for v in args.sizes.split(",")):
+            with open(cfg_path, "w", encoding="utf-8") as f:
+                json.dump({"openweather_api_key": "", "stations": _synthetic_stations(n, args.seed)}, f,
+                          ensure_ascii=False, indent=2)
+            cache = StationCache(path=os.path.join(d, f"stations_cache{n}.bin"), config_path=cfg_path)
+            print(f"스테이션 {n}개 (config.json {os.path.getsize(cfg_path) / 1e6:.1f} MB)")
+
+            t = time.perf_counter()
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                cfg = json.load(f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                normalize_stations(cfg)  # 예전 시작 과정
+            print(f"  {'예전 (정규화 + timezone 전부)':<24} {(time.perf_counter() - t) * 1000:8.1f} ms")
+
+            for label, touch in (("캐시 없음 (첫 부팅 / 변경 후)", False), ("캐시 있음", False), ("touch 후", True)):
+                if touch:
+                    st = os.stat(cfg_path)
+                    os.utime(cfg_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+                t0 = time.perf_counter()
+                with open(cfg_path, "r", encoding="utf-8") as f:
+                    cfg = json.load(f)
+                t1 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stations = cache.load(cfg)
+                    stations[n // 2]["timezone"]  # 첫 화면의 스테이션
+                t2 = time.perf_counter()
+                line = (f"  {label:<24} {(t2 - t0) * 1000:8.1f} ms (config 파싱 {(t1 - t0) * 1000:.1f} + "
+                        f"스테이션 {(t2 - t1) * 1000:.1f}) [{cache.status}]")
+                if cache.needs_save:
+                    t = time.perf_counter()
+                    cache.save(stations)
+                    line += f", 캐시 저장 {(time.perf_counter() - t) * 1000:.0f} ms (백그라운드)"
+                print(line)
+            print(f"  캐시 파일 {os.path.getsize(cache.path) / 1e6:.1f} MB")
+
+def bench_state(args) -> None:
+    """관찰 필드 쓰기 비용 / 매 반복 비교 대신 dispatch() 의 비용"""
+    state = AppState()
+    hits = []
+    state.subscribe(("current_index",), lambda st, changed: hits.append(st.current_index))
+    n = args.iterations
+
+    t = time.perf_counter()
+    for i in range(n):
+        state.play_index = i          # 알림 없는 필드
+    plain = (time.perf_counter() - t) / n * 1e9
+    t = time.perf_counter()
+    for i in range(n):
+        state.current_index = i       # 알림 필드 (비교 + 변경 표시)
+    observed = (time.perf_counter() - t) / n * 1e9
+    state.discard_changes()
+
+    # 입력이 없는 반복: 예전 비교 (표시 인덱스 / 재생 표시 / 애니메이션 지움 여부) vs dispatch()
+    last_index, last_playing, cleared = 0, None, True
+    t = time.perf_counter()
+    for _ in range(n):
+        if state.current_mode == "normal" and state.current_index != last_index:
+            pass
+        if state.is_playing != last_playing and not state.is_playing and not cleared:
+            pass
+    polling = (time.perf_counter() - t) / n * 1e9
+    t = time.perf_counter()
+    for _ in range(n):
+        state.dispatch()
+    idle = (time.perf_counter() - t) / n * 1e9
+
+    # 로터리 한 칸마다 dispatch
+    t = time.perf_counter()
+    for i in range(n):
+        state.current_index = i
+        state.dispatch()
+    active = (time.perf_counter() - t) / n * 1e9
+    print(f"필드 쓰기: 일반 {plain:.0f} ns, 알림 필드 {observed:.0f} ns")
+    print(f"입력 없는 반복: 예전 비교 {polling:.0f} ns, dispatch() {idle:.0f} ns")
+    print(f"값 변경 + dispatch + 구독자 호출: {active:.0f} ns (호출 {len(hits)}회)")
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(prog="python3 -m wr_radio.bench", description="WR-Radio 벤치마크")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sp = sub.add_parser("stations", help="스테이션별 첫 소리까지 시간 측정")
+    sp.add_argument("--profiles", default="prod", help=f"쉼표 구분 ({', '.join(CACHE_PROFILES)})")
+    sp.add_argument("--concurrency", type=int, default=2, help="동시 측정 수")
+    sp.add_argument("--timeout", type=float, default=20.0, help="스테이션당 최대 대기 (초)")
+    sp.add_argument("--json", help="결과 JSON 저장 경로 (없으면 표 뒤에 출력)")
+    sp.add_argument("--audible", action="store_true", help="실제 오디오 출력 사용 (기본은 --ao=null)")
+    sp.add_argument("--standin", action="store_true", help="인터넷 대신 로컬 가짜 MP3 서버 사용")
+    sp.add_argument("--standin-count", type=int, default=3)
+    sp.add_argument("--standin-delay", type=float, default=0.2, help="가짜 서버 응답 지연 (초)")
+    sp.set_defaults(func=bench_stations)
+
+    sp = sub.add_parser("recovery", help="mpv 강제 종료 후 복구 시간 측정")
+    sp.add_argument("--rounds", type=int, default=5)
+    sp.add_argument("--settle", type=float, default=1.0, help="라운드 사이 대기 (초)")
+    sp.add_argument("--json", help="결과 JSON 저장 경로")
+    sp.set_defaults(func=bench_recovery)
+
+    sp = sub.add_parser("visualizer", help="레벨 시각화가 입력 루프 지연에 주는 영향 측정")
+    sp.add_argument("--seconds", type=float, default=10.0)
+    sp.add_argument("--fps", type=float, default=5.0, help="파형 갱신 주기 (main 루프와 동일하게 5fps)")
+    sp.add_argument("--max-hz", type=float, default=10.0)
+    sp.add_argument("--cpu-budget", type=float, default=0.02)
+    sp.set_defaults(func=bench_visualizer)
+
+    sp = sub.add_parser("switch", help="로터리 trace 재생으로 채널 전환 정책 비교")
+    sp.add_argument("--trace", help='{"이름": [[t0, t1, ...], ...]} 형식의 JSON (없으면 합성 trace)')
+    sp.add_argument("--samples", type=int, default=50)
+    sp.add_argument("--ttfa", type=float, default=1.0, help="loadfile 후 첫 소리까지 가정 시간 (초)")
+    sp.set_defaults(func=bench_switch)
+
+    sp = sub.add_parser("gap", help="채널 전환 무음 구간 측정 (replace / make_before_break)")
+    sp.add_argument("--rounds", type=int, default=5)
+    sp.add_argument("--stations", type=int, default=3, help="가짜 스테이션 수")
+    sp.add_argument("--delay", type=float, default=0.5, help="가짜 서버 첫 바이트 지연 (초)")
+    sp.add_argument("--crossfade", type=float, default=0.3)
+    sp.add_argument("--settle", type=float, default=1.0, help="전환 사이 대기 (초)")
+    sp.add_argument("--timeout", type=float, default=15.0)
+    sp.add_argument("--json", help="결과 JSON 저장 경로")
+    sp.set_defaults(func=bench_gap)
+
+    sp = sub.add_parser("weather", help="날씨 요청: 새 연결 / 공용 세션 + 조건부 요청 / 일괄 조회 비교")
+    sp.add_argument("--locations", type=int, default=10)
+    sp.add_argument("--rounds", type=int, default=3, help="위치 목록 반복 횟수 (2회째부터 304 가능)")
+    sp.add_argument("--connect-delay", type=float, default=0.05, help="새 연결마다 지연 (핸드셰이크 흉내, 초)")
+    sp.add_argument("--response-delay", type=float, default=0.01)
+    sp.add_argument("--json", help="결과 JSON 저장 경로")
+    sp.set_defaults(func=bench_weather)
+
+    sp = sub.add_parser("weather-cache", help="격자 캐시 키 / LRU 상한에 따른 날씨 캐시 적중률")
+    sp.add_argument("--stations", type=int, default=500)
+    sp.add_argument("--cities", type=int, default=25)
+    sp.add_argument("--views", type=int, default=5000)
+    sp.add_argument("--grid", type=float, default=0.05)
+    sp.add_argument("--max", type=int, default=256)
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_weather_cache)
+
+    sp = sub.add_parser("weather-forecast", help="예보 + 보간 모드의 API 호출 수 / 기온 오차")
+    sp.add_argument("--stations", type=int, default=20)
+    sp.add_argument("--hours", type=float, default=24)
+    sp.add_argument("--step", type=float, default=60.0, help="가짜 시계 진행 간격 (초)")
+    sp.set_defaults(func=bench_weather_forecast)
+
+    sp = sub.add_parser("weather-outage", help="날씨 API 장애 중 스레드 / 소켓 수 (circuit breaker 유무)")
+    sp.add_argument("--seconds", type=float, default=20.0)
+    sp.add_argument("--stations", type=int, default=30)
+    sp.add_argument("--interval", type=float, default=0.2, help="채널 넘기는 간격 (초)")
+    sp.add_argument("--failures", type=int, default=3, help="breaker 가 열리는 연속 실패 수")
+    sp.add_argument("--reset", type=float, default=30.0, help="breaker 열림 유지 시간 (초)")
+    sp.add_argument("--timeout", type=float, default=1.0, help="요청 타임아웃 (짧게 줄여 측정 시간 단축)")
+    sp.set_defaults(func=bench_weather_outage)
+
+    sp = sub.add_parser("tz", help="타임존 찾기: 예전 표 / 전체 비교 / KD-tree 조회 시간")
+    sp.add_argument("--stations", type=int, default=10000)
+    sp.add_argument("--dataset", default="", help="GeoNames cities*.txt (없으면 zone.tab)")
+    sp.add_argument("--verify", type=int, default=2000, help="전체 비교로 검증할 스테이션 수")
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_tz)
+
+    sp = sub.add_parser("settings-wear", help="설정 저장 방식별 시간당 SD 카드 쓰기량")
+    sp.add_argument("--hours", type=float, default=1.0)
+    sp.add_argument("--min-interval", type=float, default=10.0, help="runtime_state 최소 저장 간격 (초)")
+    sp.add_argument("--flush-interval", type=float, default=300.0, help="tmpfs 사용 시 SD 카드 반영 간격 (초)")
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_settings_wear)
+
+    sp = sub.add_parser("station-store", help="대량 스테이션 목록: dict 목록 / StationStore 시작 시간과 메모리")
+    sp.add_argument("--sizes", default="10000,100000", help="쉼표 구분 스테이션 수")
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_station_store)
+
+    sp = sub.add_parser("nav", help="스테이션 이동 색인 (이름 / 나라 / 가까운 곳) 생성 / 조회 시간")
+    sp.add_argument("--sizes", default="10000,100000", help="쉼표 구분 스테이션 수")
+    sp.add_argument("--lookups", type=int, default=2000)
+    sp.add_argument("--k", type=int, default=16, help="가까운 스테이션 몇 곳")
+    sp.add_argument("--add", type=int, default=10, help="색인 생성 후 추가할 스테이션 수")
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_nav)
+
+    sp = sub.add_parser("config-reload", help="config.json 스테이션 목록 다시 읽기: diff 적용 / 전체 재생성")
+    sp.add_argument("--sizes", default="1000,10000", help="쉼표 구분 스테이션 수")
+    sp.add_argument("--edits", type=int, default=10, help="변경 / 삭제 / 추가할 스테이션 수")
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_config_reload)
+
+    sp = sub.add_parser("config-cache", help="정규화된 스테이션 캐시: 캐시 없음 / 있음 시작 시간")
+    sp.add_argument("--sizes", default="100,10000", help="쉼표 구분 스테이션 수")
+    sp.add_argument("--seed", type=int, default=1)
+    sp.set_defaults(func=bench_config_cache)
+
+    sp = sub.add_parser("state", help="상태 변경 알림: 필드 쓰기 / dispatch 비용")
+    sp.add_argument("--iterations", type=int, default=200000)
+    sp.set_defaults(func=bench_state)
+
+    sp = sub.add_parser("boot", help="부팅 시간 기록 요약 (첫 화면 / 첫 소리)")
+    sp.add_argument("--log", default=BOOT_LOG)
+    sp.add_argument("--last", type=int, default=20, help="최근 N회만")
+    sp.set_defaults(func=bench_boot)
+
+    args = ap.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
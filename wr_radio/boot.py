@@ -0,0 +1,161 @@
+"""
+단계별 병렬 부팅.
+각 단계(phase)는 의존 관계만 지정하고, 의존 단계가 끝나는 대로 스레드 풀에서 동시에 실행된다.
+단계별 소요 시간과 첫 화면 / 첫 소리 시점을 기록하고 예산(budget)을 넘으면 경고.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import CONFIG_FILE
+
+BOOT_LOG = os.path.join(os.path.dirname(CONFIG_FILE), "boot_times.jsonl")
+BOOT_LOG_MAX_LINES = 200
+DEFAULT_BUDGET_SEC = 5.0
+
+
+@dataclass
+class Phase:
+    name: str
+    func: Callable[[], Any]
+    deps: Tuple[str, ...] = ()
+    start: float = 0.0
+    end: float = 0.0
+    background: bool = False   # True 면 끝날 때까지 기다리지 않음 (예: 날씨)
+    result: Any = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+@dataclass
+class BootPlan:
+    budget_sec: float = DEFAULT_BUDGET_SEC
+    t0: float = field(default_factory=time.perf_counter)
+    phases: Dict[str, Phase] = field(default_factory=dict)
+    marks: Dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, name: str, func: Callable[[], Any], deps: Tuple[str, ...] = (), background: bool = False) -> None:
+        self.phases[name] = Phase(name, func, tuple(deps), background=background)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def mark(self, name: str) -> None:
+        """첫 화면(first_frame), 첫 소리(first_audio) 같은 시점 기록 (처음 한 번만)"""
+        with self._lock:
+            if name not in self.marks:
+                self.marks[name] = self.elapsed()
+
+    def _run_phase(self, ph: Phase) -> None:
+        ph.start = self.elapsed()
+        try:
+            ph.result = ph.func()
+        except BaseException as e:  # 단계 실패는 기록만 하고 의존 단계는 건너뜀
+            ph.error = e
+        ph.end = self.elapsed()
+
+    def run(self, max_workers: int = 4) -> Dict[str, Phase]:
+        """background 가 아닌 단계가 모두 끝나면 반환"""
+        pending = dict(self.phases)
+        running = {}
+        done = set()
+
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="boot")
+        try:
+            while pending or any(not self.phases[n].background for n in running.values()):
+                for name, ph in list(pending.items()):
+                    if any(self.phases[d].error or self.phases[d].skipped for d in ph.deps if d in done):
+                        ph.skipped = True
+                        done.add(name)
+                        del pending[name]
+                    elif all(d in done for d in ph.deps):
+                        running[pool.submit(self._run_phase, ph)] = name
+                        del pending[name]
+
+                if not running:
+                    if pending:
+                        # 존재하지 않는 의존 단계 → 실행 불가
+                        for ph in pending.values():
+                            ph.skipped = True
+                        pending.clear()
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    done.add(running.pop(fut))
+        finally:
+            pool.shutdown(wait=False)
+
+        return self.phases
+
+    def failed(self, name: str) -> bool:
+        ph = self.phases.get(name)
+        return ph is None or ph.error is not None or ph.skipped
+
+    def report(self) -> None:
+        print("-" * 50)
+        print("⏱️  부팅 단계")
+        for ph in sorted(self.phases.values(), key=lambda p: p.start):
+            if ph.skipped:
+                status = "건너뜀"
+            elif ph.end == 0.0:
+                status = "진행 중"
+            elif ph.error is not None:
+                status = f"실패: {str(ph.error)[:40]}"
+            else:
+                status = ""
+            print(f"  {ph.name:<12} {ph.start * 1000:6.0f} → {ph.end * 1000:6.0f}ms ({ph.duration * 1000:5.0f}ms) {status}")
+        for name, t in self.marks.items():
+            print(f"  ▶ {name:<10} {t * 1000:6.0f}ms")
+        total = max(self.marks.values(), default=self.elapsed())
+        if total > self.budget_sec:
+            print(f"⚠️  부팅 예산 초과: {total:.2f}s > {self.budget_sec:.2f}s")
+        print("-" * 50)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "time": time.time(),
+            "budget_sec": self.budget_sec,
+            "phases": {
+                p.name: {"start": round(p.start, 4), "duration": round(p.duration, 4), "ok": not (p.error or p.skipped)}
+                for p in self.phases.values()
+            },
+            "marks": {k: round(v, 4) for k, v in self.marks.items()},
+        }
+
+    def save(self, path: str = BOOT_LOG) -> None:
+        """부팅 기록 1줄 추가 (최근 BOOT_LOG_MAX_LINES 줄만 유지)"""
+        try:
+            lines: List[str] = []
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    lines = f.read().splitlines()[-(BOOT_LOG_MAX_LINES - 1):]
+            lines.append(json.dumps(self.to_dict()))
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"⚠️  부팅 기록 저장 실패: {e}")
+
+
+def load_boot_log(path: str = BOOT_LOG) -> List[Dict[str, Any]]:
+    out = []
+    if not os.path.exists(path):
+        return out
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                pass
+    return out
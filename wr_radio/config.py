@@ -3,9 +3,11 @@ import math
 import os
 from typing import Any, Dict, List, Optional
 
+from . import tzindex
+
 CONFIG_FILE = "/home/wr-radio/wr-radio/config.json"
 
-# 주요 타임존 대표 좌표 (위도, 경도, 타임존)
+# 주요 타임존 대표 좌표 (위도, 경도, 타임존) - tzdata 를 못 찾을 때만 사용
 TIMEZONE_LOOKUP = [
     # 아시아
     (37.5, 127.0, "Asia/Seoul"),
@@ -106,8 +108,16 @@ DEFAULT_STATIONS: List[Dict[str, Any]] = [
 ]
 
 
-def find_timezone(lat: float, lon: float) -> str:
-    """위경도로 가장 가까운 타임존 찾기"""
+def find_timezone(lat: float, lon: float, dataset: str = "") -> str:
+    """위경도로 가장 가까운 타임존 찾기 (tzindex: 대원 거리 KD-tree, 데이터 없으면 TIMEZONE_LOOKUP)"""
+    index = tzindex.get_index(dataset)
+    if index is not None:
+        return index.nearest(lat, lon)[0]
+    return find_timezone_table(lat, lon)
+
+
+def find_timezone_table(lat: float, lon: float) -> str:
+    """TIMEZONE_LOOKUP 에서 가장 가까운 도시 (대략적인 값)"""
     min_dist = float('inf')
     best_tz = "UTC"
     
@@ -131,11 +141,41 @@ def load_config() -> Optional[Dict[str, Any]]:
     return None
 
 
+def atomic_write_bytes(path: str, data: bytes, fsync: bool = True) -> None:
+    """임시 파일에 쓴 뒤 rename → 쓰는 도중 전원이 나가도 이전 내용 또는 새 내용만 남음"""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if fsync:
+        # rename 자체도 디스크에 남도록 디렉토리까지 fsync
+        try:
+            dfd = os.open(d or ".", os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dfd)
+        except OSError:
+            pass
+        finally:
+            os.close(dfd)
+
+
+def atomic_write_json(path: str, obj: Any, indent: Optional[int] = 2, fsync: bool = True) -> None:
+    separators = (",", ":") if indent is None else None
+    data = json.dumps(obj, indent=indent, ensure_ascii=False, separators=separators).encode("utf-8")
+    atomic_write_bytes(path, data, fsync=fsync)
+
+
 def save_config(config: Dict[str, Any]) -> bool:
     try:
-        os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        atomic_write_json(CONFIG_FILE, config)
         return True
     except Exception as e:
         print(f"❌ 설정 저장 실패: {e}")
@@ -156,10 +196,11 @@ def create_default_config() -> Optional[Dict[str, Any]]:
     return None
 
 
-def setup_config_interactive() -> Optional[Dict[str, Any]]:
+def setup_config_interactive(normalize: bool = True) -> Optional[Dict[str, Any]]:
     """
     config.json이 없을 때만 1회 실행되는 인터랙티브 설정.
     (이미 존재하면 그냥 로드 결과를 반환)
+    normalize=False 면 스테이션 정규화는 호출 측에서 normalize_stations() 로 따로 수행.
     """
     config = load_config()
 
@@ -197,11 +238,21 @@ def setup_config_interactive() -> Optional[Dict[str, Any]]:
         print("=" * 60)
         print()
 
-    # 검증/정규화
+    _ensure_stations(config)
+    if normalize:
+        normalize_stations(config)
+    return config
+
+
+def _ensure_stations(config: Dict[str, Any]) -> None:
     if "stations" not in config or not config["stations"]:
         print("⚠️  스테이션 목록이 비어있습니다. 기본 목록 사용")
         config["stations"] = DEFAULT_STATIONS
 
+
+def normalize_stations(config: Dict[str, Any]) -> Dict[str, Any]:
+    """스테이션 목록 검증/정규화 (색상 tuple 변환, timezone 자동 찾기)"""
+    _ensure_stations(config)
     for st in config["stations"]:
         if isinstance(st.get("color"), list):
             st["color"] = tuple(st["color"])
@@ -210,20 +261,7 @@ def setup_config_interactive() -> Optional[Dict[str, Any]]:
         
         # timezone 자동 찾기
         if "timezone" not in st or not st["timezone"]:
-            st["timezone"] = find_timezone(st["lat"], st["lon"])
+            st["timezone"] = find_timezone(st["lat"], st["lon"], config.get("timezone_dataset", ""))
             print(f"🌍 {st['name']}: {st['timezone']}")
 
     return config
-
-
-def save_settings(index: int, volume: int, brightness: int) -> None:
-    try:
-        config = load_config()
-        if config:
-            config["last_station"] = index
-            config["last_volume"] = volume
-            config["last_brightness"] = brightness
-            save_config(config)
-            print(f"💾 저장 완료 (스테이션:{index+1}, 볼륨:{volume}%, 밝기:{brightness}%)")
-    except Exception as e:
-        print(f"저장 실패: {e}")
@@ -0,0 +1,263 @@
+"""
+config.json 변경 감시 + 스테이션 목록 다시 읽기 (재시작 없이).
+- inotify 로 config.json 이 있는 디렉토리를 감시 (편집기는 보통 새 파일을 쓰고 rename 하므로 파일이 아닌 디렉토리).
+  "stations_file" 을 쓰면 그 파일도 함께 감시 (목록 파일만 바뀌어도 다시 읽음)
+- inotify 를 쓸 수 없으면 poll_sec 간격으로 mtime / 크기 확인
+- 내용 해시가 같으면 무시, JSON 이 깨져 있으면 경고만 (편집 중일 수 있음)
+- 목록 읽기 + diff + 이동 색인은 감시 스레드에서 (prepare_station_reload), 적용은 메인 루프에서 (apply_station_reload):
+  바뀐 스테이션만 반영하고, 듣고 있던 스테이션이 남아 있으면 계속 재생
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from . import fswatch, player, weather
+from .config import CONFIG_FILE
+from .navigation import StationNav
+from .stations import diff_stations, load_stations
+
+
+class ConfigWatcher:
+    def __init__(self, path: str = CONFIG_FILE, poll_sec: float = 2.0, settle_sec: float = 0.3,
+                 prepare: Optional[Callable[[Dict[str, Any]], Any]] = None, stations_file: str = ""):
+        self.path = path
+        self.stations_file = stations_file   # 설정의 "stations_file" (다시 읽을 때마다 새 값으로)
+        self.prepare = prepare   # 새 설정으로 미리 할 일 (감시 스레드에서). 결과가 take() 로 나옴
+        self.poll_sec = poll_sec
+        self.settle_sec = settle_sec  # 마지막 변경 후 이만큼 조용해지면 읽음 (편집기의 여러 번 쓰기)
+        self.changes: "queue.Queue[Any]" = queue.Queue(maxsize=1)
+        self.mode = ""           # "inotify" / "poll"
+        self.reloads = 0
+        self.retries = 0         # 준비한 결과가 적용 전에 낡아 다시 준비한 횟수
+        self._digest = self._read_digest()[0]
+        self._cfg: Optional[Dict[str, Any]] = None   # 마지막으로 읽은 설정 (다시 준비용)
+        self._stop = threading.Event()
+        self._redo = threading.Event()   # retry() → 감시 스레드에서 다시 준비
+        self._watched: Dict[int, str] = {}   # inotify watch → 디렉토리
+
+    def _paths(self):
+        return [self.path, self.stations_file] if self.stations_file else [self.path]
+
+    def _read_digest(self):
+        """config.json 내용 + 목록 파일 내용의 해시 (목록 파일은 없어도 됨)"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, None
+        h = hashlib.sha1(data)
+        if self.stations_file:
+            try:
+                with open(self.stations_file, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        h.update(block)
+            except OSError:
+                pass
+        return h.hexdigest(), data
+
+    def _stat(self):
+        out = []
+        for path in self._paths():
+            try:
+                st = os.stat(path)
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return out
+
+    def _check(self) -> None:
+        digest, data = self._read_digest()
+        if digest is None or digest == self._digest:
+            return
+        try:
+            cfg = json.loads(data.decode("utf-8"))
+        except ValueError as e:
+            print(f"⚠️  config.json 파싱 실패 (다시 읽지 않음): {e}")
+            return
+        stations_file = cfg.get("stations_file") or ""
+        if stations_file != self.stations_file:
+            # 목록 파일이 바뀜 → 새 파일 기준 해시 (다음 확인에서 같은 변경을 또 읽지 않도록)
+            self.stations_file = stations_file
+            digest = self._read_digest()[0] or digest
+        self._digest = digest
+        self._cfg = cfg
+        self.reloads += 1
+        self._publish(cfg)
+
+    def _publish(self, cfg: Dict[str, Any]) -> None:
+        item: Any = cfg
+        if self.prepare is not None:
+            try:
+                item = self.prepare(cfg)
+            except Exception as e:
+                print(f"⚠️  스테이션 목록 다시 읽기 실패: {e}")
+                return
+        # 처리 안 된 이전 변경은 버리고 최신만
+        try:
+            self.changes.get_nowait()
+        except queue.Empty:
+            pass
+        self.changes.put_nowait(item)
+
+    def _check_redo(self) -> None:
+        if not self._redo.is_set():
+            return
+        self._redo.clear()
+        # 그 사이 새 변경을 읽었으면 _cfg 는 이미 최신 → 최신 설정으로 다시 준비
+        if self._cfg is not None:
+            self.retries += 1
+            self._publish(self._cfg)
+
+    def _watch(self, ino: "fswatch.Inotify") -> None:
+        """감시할 파일들이 있는 디렉토리 중 아직 등록 안 한 것 등록"""
+        for path in self._paths():
+            d = os.path.dirname(os.path.abspath(path))
+            if d not in self._watched.values():
+                wd = ino.add_watch(d, fswatch.IN_CLOSE_WRITE | fswatch.IN_MOVED_TO | fswatch.IN_CREATE)
+                self._watched[wd] = d
+
+    def _run_inotify(self, ino: "fswatch.Inotify") -> None:
+        pending_since = 0.0
+        while not self._stop.is_set():
+            self._check_redo()
+            targets = {os.path.abspath(p) for p in self._paths()}
+            events = ino.read(0.5 if not pending_since else self.settle_sec)
+            if any(os.path.join(self._watched.get(wd, ""), name) in targets for wd, _mask, name in events):
+                pending_since = time.time()
+                continue
+            if pending_since and time.time() - pending_since >= self.settle_sec:
+                pending_since = 0.0
+                self._check()
+                try:
+                    self._watch(ino)   # "stations_file" 이 다른 디렉토리로 바뀌었을 수 있음
+                except OSError as e:
+                    print(f"⚠️  스테이션 파일 감시 실패: {e}")
+
+    def _run_poll(self) -> None:
+        last = self._stat()
+        while not self._stop.is_set():
+            self._redo.wait(self.poll_sec)
+            if self._stop.is_set():
+                break
+            self._check_redo()
+            cur = self._stat()
+            if cur != last:
+                last = cur
+                time.sleep(self.settle_sec)
+                self._check()
+
+    def run(self) -> None:
+        ino = None
+        try:
+            ino = fswatch.Inotify()
+            self._watch(ino)
+        except OSError:
+            if ino is not None:
+                ino.close()
+            ino = None
+        self.mode = "inotify" if ino is not None else "poll"
+        try:
+            if ino is not None:
+                self._run_inotify(ino)
+            else:
+                self._run_poll()
+        finally:
+            if ino is not None:
+                ino.close()
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run, daemon=True)
+        t.start()
+        return t
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._redo.set()
+
+    def retry(self) -> None:
+        """메인 루프에서 호출: take() 결과가 적용 전에 낡음 (목록이 그 사이 바뀜) → 감시 스레드에서 다시 준비"""
+        self._redo.set()
+
+    def take(self) -> Any:
+        """메인 루프에서 호출: 새 설정 (prepare 가 있으면 그 결과) 이 있으면 반환"""
+        try:
+            return self.changes.get_nowait()
+        except queue.Empty:
+            return None
+
+
+def prepare_station_reload(state, cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    새 목록 읽기 + 지금 목록과 diff (오래 걸릴 수 있으므로 메인 루프 밖에서).
+    state 는 읽기만 함
+    """
+    old = state.radio_stations
+    new = load_stations(cfg)
+    diff = diff_stations(old, new)
+    changed = set(diff["changed"])
+    pairs = list(zip(diff["kept_old"], diff["kept_new"]))
+    # 바뀌지 않은 스테이션의 timezone 은 다시 계산하지 않음
+    new.adopt_timezones(old, ((i, j) for i, j in pairs if j not in changed))
+
+    # 삭제되었거나 좌표가 바뀐 스테이션 위치 중 더 이상 어떤 스테이션도 쓰지 않는 날씨 키
+    moved = [i for i, j in pairs if j in changed and (old[i]["lat"], old[i]["lon"]) != (new.lats[j], new.lons[j])]
+    unused = {weather.cache_key(old[i]["lat"], old[i]["lon"]) for i in diff["removed"] + moved}
+    if unused:
+        unused -= {weather.cache_key(lat, lon) for lat, lon in zip(new.lats, new.lons)}
+
+    # 이동 색인도 여기서 새로 (메인 루프의 get_nav 가 다시 만들지 않도록). 아직 안 만들었으면 처음 쓸 때
+    nav = StationNav(new) if state.station_nav is not None else None
+    return {"old": old, "new": new, "diff": diff, "cfg": cfg, "old_to_new": dict(pairs),
+            "unused_weather": unused, "nav": nav}
+
+
+def apply_station_reload(state, prepared: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    prepare_station_reload 결과를 state 에 반영 (메인 루프에서).
+    반환: diff + current_changed (현재 카드를 다시 그려야 함) + replay (현재 스테이션이 빠져 다른 곳 재생 필요)
+    """
+    if prepared["old"] is not state.radio_stations:
+        raise ValueError("준비한 뒤 스테이션 목록이 바뀜")
+    old, new, diff = prepared["old"], prepared["new"], prepared["diff"]
+    changed = set(diff["changed"])
+
+    old_to_new = prepared["old_to_new"]
+    cur_old = state.current_index
+    cur_new = old_to_new.get(cur_old)
+    replay = cur_new is None
+    if replay:
+        cur_new = min(cur_old, len(new) - 1)
+    play_new = old_to_new.get(state.play_index, -1)   # -1: 재생 중인 스테이션이 목록에서 빠짐
+    dropped = weather.invalidate(state, prepared["unused_weather"])
+
+    # 카드(이름 / 위치 / 시간 / "번호 / 개수")가 달라질 때만 다시 그림
+    current_changed = replay or cur_new in changed or cur_new != cur_old or len(new) != len(old)
+    with state.lock:
+        state.radio_stations = new
+        if prepared["nav"] is not None:
+            state.station_nav = prepared["nav"]
+        state.current_index = cur_new   # 바뀌면 저장 / 카드 구독자가 처리
+        state.play_index = play_new
+        player.remap_play_request(state, old_to_new)   # 아직 재생 스레드가 안 가져간 요청도 새 목록 기준으로
+        if current_changed:
+            state.mark_changed("current_index")
+
+    print(f"🔁 스테이션 목록 다시 읽음: 추가 {len(diff['added'])}, 변경 {len(changed)}, "
+          f"삭제 {len(diff['removed'])}, 날씨 항목 삭제 {dropped}")
+    return dict(diff, current_changed=current_changed, replay=replay)
+
+
+def start_config_watcher(state, cfg: Dict) -> Optional[ConfigWatcher]:
+    """config.json 의 "config_watch" 항목 (기본 활성)"""
+    opts = cfg.get("config_watch") or {}
+    if not opts.get("enabled", True):
+        return None
+    w = ConfigWatcher(poll_sec=float(opts.get("poll_sec", 2.0)),
+                      prepare=lambda new_cfg: prepare_station_reload(state, new_cfg),
+                      stations_file=cfg.get("stations_file") or "")
+    w.start()
+    return w
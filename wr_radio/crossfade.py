@@ -0,0 +1,161 @@
+"""
+make-before-break 채널 전환.
+두 번째(대기) mpv 에 새 스테이션을 먼저 열고, 실제로 소리가 나기 시작하면
+볼륨을 짧게 교차(crossfade)한 뒤 기존 인스턴스를 멈추고 역할을 맞바꾼다.
+기존 방식(loadfile replace)은 새 스트림이 버퍼링되는 동안 무음 구간이 생긴다.
+"""
+import os
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Deque, Dict, Optional
+
+from . import player
+
+SWITCH_MODES = ("replace", "make_before_break")
+_POLL_SEC = 0.05
+_FADE_STEP_SEC = 0.03
+
+
+class Switcher:
+    def __init__(
+        self,
+        mode: str = "make_before_break",
+        crossfade_sec: float = 0.3,
+        handover_timeout_sec: float = 8.0,
+        extra=(),
+    ):
+        self.mode = mode if mode in SWITCH_MODES else "replace"
+        self.crossfade_sec = crossfade_sec
+        self.handover_timeout_sec = handover_timeout_sec
+        self.extra = extra
+
+        self.gaps: Deque[float] = deque(maxlen=50)  # 전환별 무음 구간 (초)
+        self.handovers = 0
+        self.timeouts = 0
+        self._cut_at = 0.0
+
+    # --- 무음 구간 측정 ---
+    def mark_cut(self) -> None:
+        """기존 소리가 끊긴 시점 (replace 방식 전환)"""
+        self._cut_at = time.perf_counter()
+
+    def mark_audio(self) -> None:
+        """새 소리가 나기 시작한 시점 (오디오 모니터에서 호출)"""
+        if self._cut_at:
+            self.gaps.append(time.perf_counter() - self._cut_at)
+            self._cut_at = 0.0
+
+    # --- 대기 인스턴스 ---
+    def can_handover(self, state) -> bool:
+        # 지금 소리가 나고 있을 때만 의미가 있음 (정지 / 일시정지 / 버퍼링 중이면 그냥 교체)
+        return self.mode == "make_before_break" and state.is_playing and state.audio_playing and not state.paused
+
+    def _ensure_standby(self, state) -> bool:
+        if state.shutting_down:
+            return False   # 부팅 실패 / 종료 중에는 새로 띄우지 않음
+        if state.standby_process is not None and state.standby_process.poll() is None \
+                and player._can_connect(state.mpv_sock_standby):
+            return True
+        # 살아 있지만 응답이 없는 대기 mpv 는 정리한 뒤 새로 (덮어쓰면 프로세스가 남음)
+        player.stop_process(state.standby_process)
+        state.standby_process = None
+        try:
+            if os.path.exists(state.mpv_sock_standby):
+                os.remove(state.mpv_sock_standby)
+        except Exception:
+            pass
+        try:
+            state.standby_process = player.spawn_mpv(
+                player.mpv_args(state.mpv_sock_standby, extra=(*self.extra, "--volume=0"))
+            )
+        except Exception as e:
+            print(f"⚠️  대기 mpv 실행 실패: {e}")
+            state.standby_process = None
+            return False
+        return player._wait_for_sock(state.mpv_sock_standby, timeout_sec=8.0, proc=state.standby_process)
+
+    def prepare(self, state) -> None:
+        """부팅 시 대기 인스턴스를 미리 띄워 첫 전환 지연을 없앰"""
+        if self.mode == "make_before_break":
+            self._ensure_standby(state)
+
+    # --- 전환 ---
+    def _crossfade(self, old, new, volume: int) -> None:
+        steps = max(1, int(self.crossfade_sec / _FADE_STEP_SEC))
+        for i in range(1, steps + 1):
+            v = round(volume * i / steps)
+            player.mpv_cmd(new, {"command": ["set_property", "volume", v]})
+            player.mpv_cmd(old, {"command": ["set_property", "volume", volume - v]})
+            if i < steps:
+                time.sleep(self.crossfade_sec / steps)
+
+    def handover(self, state, index: int) -> Optional[bool]:
+        """
+        대기 인스턴스에서 index 스테이션을 열고 소리가 나면 교대.
+        반환: True 성공 / False 실패 / None 더 새로운 요청이 들어와 취소.
+        """
+        url = state.radio_stations[index]["url"]
+        if not self._ensure_standby(state):
+            # 대기 인스턴스를 못 띄우면 기존 방식으로
+            self.mark_cut()
+            state.audio_playing = False
+            player.apply_buffering(state, state, url)
+            return player.load_url(state, url)
+
+        old = SimpleNamespace(mpv_sock=state.mpv_sock, relay=state.relay)
+        new = SimpleNamespace(mpv_sock=state.mpv_sock_standby, relay=state.relay)
+        player.mpv_cmd(new, {"command": ["set_property", "volume", 0]})
+        player.mpv_cmd(new, {"command": ["set_property", "pause", False]})
+        player.apply_buffering(state, new, url)
+        if not player.load_url(new, url):
+            return False
+
+        deadline = time.time() + self.handover_timeout_sec
+        audible = False
+        while time.time() < deadline and not state.shutting_down:
+            if player._superseded(state, index):
+                player.mpv_cmd(new, {"command": ["stop"]})
+                return None
+            if player.get_properties(new, ["core-idle"]).get("core-idle") is False:
+                audible = True
+                break
+            time.sleep(_POLL_SEC)
+
+        if audible:
+            self._crossfade(old, new, state.current_volume)
+            self.gaps.append(0.0)
+        else:
+            # 시간 안에 소리가 안 나도 전환은 진행 (이후 재시도는 스트림 상태 감시가 담당)
+            self.timeouts += 1
+            player.mpv_cmd(new, {"command": ["set_property", "volume", state.current_volume]})
+            self.mark_cut()
+            state.audio_playing = False
+
+        player.mpv_cmd(old, {"command": ["stop"]})
+        with state.lock:
+            state.mpv_sock, state.mpv_sock_standby = state.mpv_sock_standby, state.mpv_sock
+            state.player_process, state.standby_process = state.standby_process, state.player_process
+        self.handovers += 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        gaps = sorted(self.gaps)
+        return {
+            "mode": self.mode,
+            "switches": len(gaps),
+            "handovers": self.handovers,
+            "timeouts": self.timeouts,
+            "gap_p50_ms": gaps[len(gaps) // 2] * 1000 if gaps else 0.0,
+            "gap_max_ms": gaps[-1] * 1000 if gaps else 0.0,
+        }
+
+
+def create_switcher(cfg: Dict, extra=()) -> Switcher:
+    """config.json 의 "switch_mode" / "crossfade_sec" / "handover_timeout_sec" (기본 replace)"""
+    return Switcher(
+        mode=str(cfg.get("switch_mode", "replace")),
+        crossfade_sec=float(cfg.get("crossfade_sec", 0.3)),
+        handover_timeout_sec=float(cfg.get("handover_timeout_sec", 8.0)),
+        extra=extra,
+    )
@@ -1,7 +1,7 @@
 import math
 import time
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
 import pytz
 
 # LCD 핀은 main에서 GPIO setup 후 사용
@@ -75,54 +75,65 @@ def set_window(GPIO, pins, state, x0, y0, x1, y1):
     write_cmd(GPIO, pins["DC"], pins["CS"], state.spi, 0x2C)
 
 
-def display_image(GPIO, pins, state, image: Image.Image):
-    if image.size != (240, 240):
-        image = image.resize((240, 240))
-    image = image.convert("RGB")
-    set_window(GPIO, pins, state, 0, 0, 239, 239)
+# RGB888 → RGB565 (big-endian) 변환용 LUT: 상위 바이트 = R[7:3] G[7:5], 하위 바이트 = G[4:2] B[7:3]
+_LUT_R_HI = [v & 0xF8 for v in range(256)]
+_LUT_G_HI = [v >> 5 for v in range(256)]
+_LUT_G_LO = [(v << 3) & 0xE0 for v in range(256)]
+_LUT_B_LO = [v >> 3 for v in range(256)]
+
 
-    pixels = []
-    for y in range(240):
-        for x in range(240):
-            r, g, b = image.getpixel((x, y))
-            c = rgb565(r, g, b)
-            pixels.append((c >> 8) & 0xFF)
-            pixels.append(c & 0xFF)
+def _rgb565_bytes(image: Image.Image) -> bytes:
+    """PIL 밴드 연산으로 한 번에 변환 (픽셀 단위 getpixel 루프 대비 수십 배 빠름)"""
+    r, g, b = image.convert("RGB").split()
+    hi = ImageChops.add(r.point(_LUT_R_HI), g.point(_LUT_G_HI))
+    lo = ImageChops.add(g.point(_LUT_G_LO), b.point(_LUT_B_LO))
+    return Image.merge("LA", (hi, lo)).tobytes()
 
+
+def _write_pixels(GPIO, pins, state, data: bytes):
     GPIO.output(pins["DC"], GPIO.HIGH)
     GPIO.output(pins["CS"], GPIO.LOW)
 
-    chunk = 4096
-    for i in range(0, len(pixels), chunk):
-        state.spi.writebytes(pixels[i:i + chunk])
+    if hasattr(state.spi, "writebytes2"):
+        state.spi.writebytes2(data)
+    else:
+        chunk = 4096
+        for i in range(0, len(data), chunk):
+            state.spi.writebytes(list(data[i:i + chunk]))
 
     GPIO.output(pins["CS"], GPIO.HIGH)
 
 
-def display_image_region(GPIO, pins, state, image: Image.Image, x0, y0, x1, y1):
+def display_image(GPIO, pins, state, image: Image.Image):
     if image.size != (240, 240):
         image = image.resize((240, 240))
-    image = image.convert("RGB")
-    set_window(GPIO, pins, state, x0, y0, x1, y1)
+    set_window(GPIO, pins, state, 0, 0, 239, 239)
+    _write_pixels(GPIO, pins, state, _rgb565_bytes(image))
+
 
-    pixels = []
-    for y in range(y0, y1 + 1):
-        for x in range(x0, x1 + 1):
-            r, g, b = image.getpixel((x, y))
-            c = rgb565(r, g, b)
-            pixels.append((c >> 8) & 0xFF)
-            pixels.append(c & 0xFF)
+def clear_screen(GPIO, pins, state, color=(0, 0, 0)):
+    """단색 전체 채우기 (픽셀 단위 변환 없이 바로 전송)"""
+    set_window(GPIO, pins, state, 0, 0, 239, 239)
+    c = rgb565(*color)
+    row = [(c >> 8) & 0xFF, c & 0xFF] * 240
 
     GPIO.output(pins["DC"], GPIO.HIGH)
     GPIO.output(pins["CS"], GPIO.LOW)
 
-    chunk = 4096
-    for i in range(0, len(pixels), chunk):
-        state.spi.writebytes(pixels[i:i + chunk])
+    chunk = row * 8  # 3840 bytes
+    for _ in range(0, 240, 8):
+        state.spi.writebytes(chunk)
 
     GPIO.output(pins["CS"], GPIO.HIGH)
 
 
+def display_image_region(GPIO, pins, state, image: Image.Image, x0, y0, x1, y1):
+    if image.size != (240, 240):
+        image = image.resize((240, 240))
+    set_window(GPIO, pins, state, x0, y0, x1, y1)
+    _write_pixels(GPIO, pins, state, _rgb565_bytes(image.crop((x0, y0, x1 + 1, y1 + 1))))
+
+
 def draw_weather_icon(draw: ImageDraw.ImageDraw, x: int, y: int, icon_code: str):
     if icon_code == "01":
         draw.ellipse([x, y, x + 14, y + 14], fill=(255, 200, 0))
@@ -196,6 +207,24 @@ def draw_sine_wave_animation(draw: ImageDraw.ImageDraw, frame: int, volume: int
         draw.line([pts[i], pts[i + 1]], fill=(80, 150, 200), width=2)
 
 
+def draw_level_wave(draw: ImageDraw.ImageDraw, frame: int, levels):
+    """실제 소리 레벨(0~1) 기록으로 진폭이 변하는 파형. 오른쪽이 최신."""
+    center_y = 145
+    wavelength = 40
+    num_points = 200
+    n = len(levels)
+
+    pts = []
+    for i in range(num_points):
+        x = i + 20
+        level = levels[i * n // num_points] if n else 0.0
+        amplitude = 1 + level * 18
+        phase = (i + frame * 3) * 2 * math.pi / wavelength
+        pts.append((x, center_y + amplitude * math.sin(phase)))
+
+    draw.line(pts, fill=(80, 150, 200), width=2)
+
+
 def draw_loading_indicator(draw: ImageDraw.ImageDraw, frame: int):
     """간단한 로딩 표시 (점 3개 애니메이션)"""
     try:
@@ -213,7 +242,8 @@ def draw_loading_indicator(draw: ImageDraw.ImageDraw, frame: int):
     draw.text((x, 140), text, font=font, fill=(120, 120, 120))
 
 
-def display_mode_indicator(GPIO, pins, state, mode: str, value: int):
+def display_mode_indicator(GPIO, pins, state, mode: str, value):
+    """value: volume / brightness 는 %, 이동 모드(nav_*)는 표시할 글자 (첫 글자 / 나라 / 거리)"""
     image = Image.new("RGB", (240, 240), (0, 0, 0))
     draw = ImageDraw.Draw(image)
     try:
@@ -227,8 +257,19 @@ def display_mode_indicator(GPIO, pins, state, mode: str, value: int):
     elif mode == "brightness":
         text = f"BRT {value}%"
         color = (255, 200, 100)
+    elif mode == "nav_name":
+        text = f"ABC {value}"
+        color = (150, 255, 150)
+    elif mode == "nav_country":
+        text = f"NAT {value}"
+        color = (150, 255, 150)
+    elif mode == "nav_nearby":
+        text = f"NEAR {value}"
+        color = (150, 255, 150)
     else:
         return
+    if len(text) > 24:
+        text = text[:23] + "…"
 
     bbox = draw.textbbox((0, 0), text, font=font_small)
     text_width = bbox[2] - bbox[0]
@@ -238,96 +279,119 @@ def display_mode_indicator(GPIO, pins, state, mode: str, value: int):
     display_image_region(GPIO, pins, state, image, 0, 0, 239, 25)
 
 
-def display_radio_info(GPIO, pins, state, weather_data=None, force_full=False):
-    """
-    weather_data: {'icon': '01', 'temp': 15} or None
-    """
-    station = state.radio_stations[state.current_index]
-    station_changed = (state.current_index != state.last_displayed_index)
-    playing_changed = (state.is_playing != state.last_displayed_playing)
+# 스테이션 카드 안의 날씨 아이콘 / 기온 줄 (시간 표시 아래 ~ 카드 끝)
+WEATHER_STRIP = (0, 84, 239, 112)
 
-    image = Image.new("RGB", (240, 240), (0, 0, 0))
-    draw = ImageDraw.Draw(image)
 
+def _load_card_fonts():
     try:
-        font_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20)
-        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-        font_tiny = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
+        return (
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14),
+        )
     except Exception:
-        font_medium = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_tiny = ImageFont.load_default()
+        return ImageFont.load_default(), ImageFont.load_default(), ImageFont.load_default()
 
-    if force_full or station_changed:
-        station_name = station["name"]
 
-        bbox = draw.textbbox((0, 0), station_name, font=font_small)
-        tw = bbox[2] - bbox[0]
+def _draw_station_card(draw, station, weather_data, font_small, font_tiny):
+    """스테이션 이름 / 위치 / 현지 시간 / 날씨 (화면 0~115 줄)"""
+    station_name = station["name"]
 
+    bbox = draw.textbbox((0, 0), station_name, font=font_small)
+    tw = bbox[2] - bbox[0]
+
+    if tw > 230:
+        bbox = draw.textbbox((0, 0), station_name, font=font_tiny)
+        tw = bbox[2] - bbox[0]
         if tw > 230:
-            bbox = draw.textbbox((0, 0), station_name, font=font_tiny)
+            try:
+                font_mini = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
+            except Exception:
+                font_mini = ImageFont.load_default()
+            bbox = draw.textbbox((0, 0), station_name, font=font_mini)
             tw = bbox[2] - bbox[0]
-            if tw > 230:
-                try:
-                    font_mini = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-                except Exception:
-                    font_mini = ImageFont.load_default()
-                bbox = draw.textbbox((0, 0), station_name, font=font_mini)
-                tw = bbox[2] - bbox[0]
-                x = max(5, (240 - tw) // 2)
-                draw.text((x, 32), station_name, font=font_mini, fill=(220, 220, 220))
-                location_y = 47
-            else:
-                x = max(5, (240 - tw) // 2)
-                draw.text((x, 30), station_name, font=font_tiny, fill=(220, 220, 220))
-                location_y = 47
+            x = max(5, (240 - tw) // 2)
+            draw.text((x, 32), station_name, font=font_mini, fill=(220, 220, 220))
+            location_y = 47
         else:
-            x = (240 - tw) // 2
-            draw.text((x, 28), station_name, font=font_small, fill=(220, 220, 220))
+            x = max(5, (240 - tw) // 2)
+            draw.text((x, 30), station_name, font=font_tiny, fill=(220, 220, 220))
             location_y = 47
-
-        bbox = draw.textbbox((0, 0), station["location"], font=font_tiny)
-        tw = bbox[2] - bbox[0]
+    else:
         x = (240 - tw) // 2
-        draw.text((x, location_y + 2), station["location"], font=font_tiny, fill=(120, 120, 120))
+        draw.text((x, 28), station_name, font=font_small, fill=(220, 220, 220))
+        location_y = 47
 
-        # 현지 시간 표시
-        if "timezone" in station:
-            try:
-                tz = pytz.timezone(station["timezone"])
-                local_time = datetime.now(tz)
-                utc_offset = local_time.strftime("%z")  # +0900
-                utc_offset_str = f"UTC{utc_offset[:3]}:{utc_offset[3:]}"  # UTC+09:00
-                time_str = f"{local_time.strftime('%H:%M')} ({utc_offset_str})"
-                
-                bbox = draw.textbbox((0, 0), time_str, font=font_tiny)
-                tw = bbox[2] - bbox[0]
-                x = (240 - tw) // 2
-                draw.text((x, location_y + 21), time_str, font=font_tiny, fill=(100, 200, 255))
-            except Exception as e:
-                print(f"⚠️  타임존 처리 실패: {e}")
-
-        # 날씨 아이콘 (시간 표시 때문에 아래로 이동)
-        if weather_data:
-            icon_x = 90
-            icon_y = location_y + 40
-            draw_weather_icon(draw, icon_x, icon_y, str(weather_data.get("icon", "")))
-            temp_text = f"{int(weather_data.get('temp', 0))}°C"
-            draw.text((icon_x + 28, location_y + 42), temp_text, font=font_small, fill=(100, 200, 255))
-
-        display_image_region(GPIO, pins, state, image, 0, 0, 239, 115)
-
-        station_num = f"{state.current_index + 1} / {len(state.radio_stations)}"
-        bbox = draw.textbbox((0, 0), station_num, font=font_medium)
-        tw = bbox[2] - bbox[0]
-        x = (240 - tw) // 2
-        draw.text((x, 200), station_num, font=font_medium, fill=(120, 120, 120))
-        display_image_region(GPIO, pins, state, image, 0, 195, 239, 239)
+    bbox = draw.textbbox((0, 0), station["location"], font=font_tiny)
+    tw = bbox[2] - bbox[0]
+    x = (240 - tw) // 2
+    draw.text((x, location_y + 2), station["location"], font=font_tiny, fill=(120, 120, 120))
+
+    # 현지 시간 표시
+    if "timezone" in station:
+        try:
+            tz = pytz.timezone(station["timezone"])
+            local_time = datetime.now(tz)
+            utc_offset = local_time.strftime("%z")  # +0900
+            utc_offset_str = f"UTC{utc_offset[:3]}:{utc_offset[3:]}"  # UTC+09:00
+            time_str = f"{local_time.strftime('%H:%M')} ({utc_offset_str})"
+            
+            bbox = draw.textbbox((0, 0), time_str, font=font_tiny)
+            tw = bbox[2] - bbox[0]
+            x = (240 - tw) // 2
+            draw.text((x, location_y + 21), time_str, font=font_tiny, fill=(100, 200, 255))
+        except Exception as e:
+            print(f"⚠️  타임존 처리 실패: {e}")
+
+    # 날씨 아이콘 (시간 표시 때문에 아래로 이동)
+    if weather_data:
+        icon_x = 90
+        icon_y = location_y + 40
+        draw_weather_icon(draw, icon_x, icon_y, str(weather_data.get("icon", "")))
+        temp_text = f"{int(weather_data.get('temp', 0))}°C"
+        draw.text((icon_x + 28, location_y + 42), temp_text, font=font_small, fill=(100, 200, 255))
+
+
+def display_weather_strip(GPIO, pins, state, weather_data):
+    """
+    날씨 줄만 다시 그림 (백그라운드 조회 완료 시). 카드 전체를 그린 뒤 WEATHER_STRIP 줄만 전송하므로
+    경계에 걸친 글자도 원래와 같은 픽셀이 되고, 위아래 영역은 건드리지 않는다.
+    """
+    station = state.radio_stations[state.current_index]
+    image = Image.new("RGB", (240, 240), (0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    _, font_small, font_tiny = _load_card_fonts()
+    _draw_station_card(draw, station, weather_data, font_small, font_tiny)
+    display_image_region(GPIO, pins, state, image, *WEATHER_STRIP)
+    state.last_displayed_weather = weather_data
 
-        state.last_displayed_index = state.current_index
 
-    if force_full or station_changed or playing_changed:
-        draw_sine_wave_animation(draw, state.animation_frame, state.current_volume)
-        state.animation_frame = (state.animation_frame + 1) % 100
-        display_image_region(GPIO, pins, state, image, 0, 125, 239, 165)
-        state.last_displayed_playing = state.is_playing
+def display_radio_info(GPIO, pins, state, weather_data=None):
+    """
+    카드(이름 / 위치 / 시간 / 날씨 / 번호) + 애니메이션 영역을 그림.
+    언제 그릴지는 호출 측이 정함 (current_index 구독 / 모드 복귀)
+    weather_data: {'icon': '01', 'temp': 15} or None
+    """
+    station = state.radio_stations[state.current_index]
+
+    image = Image.new("RGB", (240, 240), (0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    font_medium, font_small, font_tiny = _load_card_fonts()
+
+    _draw_station_card(draw, station, weather_data, font_small, font_tiny)
+    state.last_displayed_weather = weather_data
+
+    display_image_region(GPIO, pins, state, image, 0, 0, 239, 115)
+
+    station_num = f"{state.current_index + 1} / {len(state.radio_stations)}"
+    bbox = draw.textbbox((0, 0), station_num, font=font_medium)
+    tw = bbox[2] - bbox[0]
+    x = (240 - tw) // 2
+    draw.text((x, 200), station_num, font=font_medium, fill=(120, 120, 120))
+    display_image_region(GPIO, pins, state, image, 0, 195, 239, 239)
+
+    draw_sine_wave_animation(draw, state.animation_frame, state.current_volume)
+    state.animation_frame = (state.animation_frame + 1) % 100
+    display_image_region(GPIO, pins, state, image, 0, 125, 239, 165)
@@ -0,0 +1,126 @@
+"""
+inotify (ctypes) 래퍼. 파일 생성/변경을 폴링 없이 기다리기 위한 용도.
+리눅스가 아니거나 inotify를 쓸 수 없으면 Inotify() 가 OSError 를 낸다 → 호출 측에서 폴링으로 대체.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Callable, List, Optional, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _lib():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(_libc, "inotify_init1"):
+            raise OSError("inotify 사용 불가")
+    return _libc
+
+
+class Inotify:
+    def __init__(self):
+        fd = _lib().inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.fd = fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = _lib().inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {path}")
+        return wd
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read(self, timeout: Optional[float]) -> List[Tuple[int, int, str]]:
+        """(wd, mask, name) 목록. timeout 동안 이벤트가 없으면 빈 목록."""
+        r, _, _ = select.select([self.fd], [], [], timeout)
+        if not r:
+            return []
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return []
+        events = []
+        i = 0
+        while i + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, i)
+            i += _EVENT.size
+            name = data[i:i + length].rstrip(b"\0").decode("utf-8", "replace")
+            i += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def wait_for_path(
+    path: str,
+    ready: Callable[[], bool],
+    timeout: float,
+    alive: Optional[Callable[[], bool]] = None,
+    poll_sec: float = 0.05,
+) -> bool:
+    """
+    path 가 생기고 ready() 가 True 가 될 때까지 대기.
+    inotify 로 디렉토리의 생성 이벤트를 받고, 안 되면 poll_sec 간격 폴링.
+    alive() 가 False 가 되면 (예: 프로세스 종료) 바로 포기.
+    """
+    deadline = time.time() + timeout
+    if ready():
+        return True
+
+    ino = None
+    try:
+        ino = Inotify()
+        ino.add_watch(os.path.dirname(path) or ".", IN_CREATE | IN_MOVED_TO)
+    except OSError:
+        if ino is not None:
+            ino.close()   # add_watch 실패 (디렉토리 없음 등) → fd 정리 후 폴링
+        ino = None
+
+    base = os.path.basename(path)
+    try:
+        while time.time() < deadline:
+            if alive is not None and not alive():
+                return False
+            if ino is None:
+                time.sleep(poll_sec)
+                if ready():
+                    return True
+                continue
+
+            # 알림 대기 (프로세스 생존 확인 겸 최대 0.2초)
+            for _wd, _mask, name in ino.read(min(0.2, max(0.0, deadline - time.time()))):
+                if name == base:
+                    break
+            # bind 직후 listen 전일 수 있으므로 짧게 재확인
+            for _ in range(20):
+                if ready():
+                    return True
+                if not os.path.exists(path):
+                    break
+                time.sleep(0.005)
+        return ready()
+    finally:
+        if ino is not None:
+            ino.close()
@@ -0,0 +1,282 @@
+"""
+스트림 상태 감시 (stall / EOF / 디코더 오류 감지 → 지터 섞인 지수 백오프로 재연결).
+mpv 이벤트 소켓에 계속 붙어서 end-file / property-change 를 받는다.
+연속 실패가 쌓이면 스테이션의 "fallback_url" 로 전환.
+"""
+import json
+import os
+import random
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+from . import player
+
+METRICS_FILE = "/tmp/wr_radio_health.json"
+
+_OBSERVED = {1: "core-idle", 2: "paused-for-cache", 3: "idle-active"}
+
+
+@dataclass
+class HealthConfig:
+    stall_timeout_sec: float = 6.0      # 재생 중 소리가 이만큼 끊기면 stall
+    first_audio_timeout_sec: float = 15.0  # loadfile 후 이 시간 안에 소리가 안 나면 실패
+    backoff_base_sec: float = 1.0
+    backoff_max_sec: float = 30.0
+    fallback_after: int = 3             # 이 횟수만큼 재시도 실패 시 fallback_url 사용
+
+
+@dataclass
+class HealthMetrics:
+    stalls: int = 0
+    eofs: int = 0
+    errors: int = 0
+    reconnects: int = 0
+    fallbacks: int = 0
+    recoveries: int = 0
+    total_stall_sec: float = 0.0
+    last_stall_sec: float = 0.0
+    last_recovery_sec: float = 0.0      # 감지 → 소리 복구까지
+    recent_recovery_sec: Deque[float] = field(default_factory=lambda: deque(maxlen=50))
+
+    def snapshot(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["recent_recovery_sec"] = list(self.recent_recovery_sec)
+        return d
+
+
+def _backoff_delay(cfg: HealthConfig, attempt: int) -> float:
+    delay = min(cfg.backoff_max_sec, cfg.backoff_base_sec * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class StreamHealth:
+    def __init__(self, state, cfg: Optional[HealthConfig] = None, metrics_file: str = METRICS_FILE):
+        self.state = state
+        self.cfg = cfg or HealthConfig()
+        self.metrics = HealthMetrics()
+        self.metrics_file = metrics_file
+
+        self._sock: Optional[socket.socket] = None
+        self._sock_path = ""
+        self._buf = b""
+        self._props: Dict[str, Any] = {}
+        self._generation = -1
+
+        self._had_audio = False
+        self._silent_since = 0.0     # 소리가 끊긴 시각 (0 = 소리 남)
+        self._failed_at = 0.0        # stall/EOF/오류 감지 시각 (0 = 정상)
+        self._attempt = 0
+        self._next_retry = 0.0
+        self._using_fallback = False
+
+    # --- mpv 이벤트 연결 ---
+    def _connect(self) -> bool:
+        try:
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            s.settimeout(0.25)
+            path = self.state.mpv_sock
+            s.connect(path)
+            for oid, name in _OBSERVED.items():
+                s.send((json.dumps({"command": ["observe_property", oid, name]}) + "\n").encode("utf-8"))
+            self._sock = s
+            self._sock_path = path
+            self._buf = b""
+            self._props = {}
+            return True
+        except Exception:
+            self._sock = None
+            return False
+
+    def _read_events(self):
+        try:
+            chunk = self._sock.recv(4096)
+        except socket.timeout:
+            return []
+        except Exception:
+            chunk = b""
+        if not chunk:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+            return []
+        self._buf += chunk
+        *lines, self._buf = self._buf.split(b"\n")
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                pass
+        return events
+
+    # --- 감시 루프 ---
+    def run(self) -> None:
+        while not self.state.shutting_down:
+            if self._sock is not None and self._sock_path != self.state.mpv_sock:
+                # make-before-break 전환으로 mpv 인스턴스가 바뀜 → 새 소켓으로 다시 연결
+                self._sock.close()
+                self._sock = None
+            if self._sock is None and not self._connect():
+                time.sleep(0.5)
+                continue
+            for ev in self._read_events():
+                self._handle_event(ev)
+            self._tick(time.time())
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run, daemon=True)
+        t.start()
+        return t
+
+    def _handle_event(self, ev: Dict[str, Any]) -> None:
+        name = ev.get("event")
+        if name == "property-change":
+            self._props[ev.get("name")] = ev.get("data")
+        elif name == "end-file" and self.state.is_playing:
+            reason = ev.get("reason")
+            if reason == "eof":
+                self.metrics.eofs += 1
+                self._mark_failed(time.time(), "EOF")
+            elif reason == "error":
+                self.metrics.errors += 1
+                self._record_open_failure()
+                self._mark_failed(time.time(), f"오류 ({ev.get('file_error', '?')})")
+
+    def _record_open_failure(self) -> None:
+        """첫 소리 전에 mpv 가 스트림을 열지 못함 → 스테이션 통계에 실패 (모니터가 다시 세지 않도록 시작 시각을 지움)"""
+        st = self.state
+        url, name, started_at = st.snapshot("play_url", "play_name", "play_started_at")
+        if st.stream_stats is None or not url or started_at <= 0:
+            return
+        st.play_started_at = 0.0
+        st.stream_stats.record_failure(url, name)
+
+    def _audio_ok(self) -> bool:
+        return (
+            self._props.get("core-idle") is False
+            and not self._props.get("paused-for-cache")
+            and not self._props.get("idle-active")
+        )
+
+    def _tick(self, now: float) -> None:
+        st = self.state
+        if st.play_generation != self._generation:
+            # 사용자가 채널을 바꿈 → 새 스트림 기준으로 초기화
+            self._generation = st.play_generation
+            self._reset(now)
+
+        if not st.is_playing:
+            self._failed_at = 0.0
+            self._silent_since = 0.0
+            return
+
+        if self._audio_ok():
+            if self._failed_at > 0:
+                self._recovered(now)
+            self._had_audio = True
+            self._silent_since = 0.0
+            return
+
+        if self._silent_since == 0.0:
+            self._silent_since = now
+        if self._failed_at == 0.0:
+            limit = self.cfg.stall_timeout_sec if self._had_audio else self.cfg.first_audio_timeout_sec
+            if now - self._silent_since >= limit:
+                self._mark_failed(now, "stall")
+        elif now >= self._next_retry:
+            self._retry(now)
+
+    def _reset(self, now: float) -> None:
+        self._had_audio = False
+        self._silent_since = now
+        self._failed_at = 0.0
+        self._attempt = 0
+        self._next_retry = 0.0
+        self._using_fallback = False
+
+    def _mark_failed(self, now: float, why: str) -> None:
+        if self._failed_at > 0:
+            # 재시도 중 다시 실패 → 다음 백오프
+            self._next_retry = now + _backoff_delay(self.cfg, self._attempt)
+            return
+        self._failed_at = now
+        self._silent_since = self._silent_since or now
+        self.metrics.stalls += 1
+        self._next_retry = now + _backoff_delay(self.cfg, 0)
+        print(f"⚠️  스트림 끊김 감지: {self.state.play_name} ({why})")
+        self._export()
+
+    def _retry(self, now: float) -> None:
+        st = self.state
+        if st.play_index < 0:
+            # 목록에서 빠진 스테이션 (config 다시 읽기) → 듣던 주소 그대로
+            station = {"name": st.play_name, "url": st.play_url}
+        else:
+            try:
+                station = st.radio_stations[st.play_index]
+            except IndexError:
+                return
+
+        attempt = self._attempt + 1
+        url = station["url"]
+        fallback = station.get("fallback_url")
+        use_fallback = bool(fallback) and (self._using_fallback or attempt > self.cfg.fallback_after)
+        if use_fallback:
+            url = fallback
+
+        # 재생 스레드를 거치지 않으므로 그 사이 채널이 바뀌었으면 보내지 않음 (다음 _tick 에서 초기화)
+        if player.load_if_current(st, url, self._generation) is None:
+            return
+        if use_fallback and not self._using_fallback:
+            self.metrics.fallbacks += 1
+            print(f"🔀 대체 URL로 전환: {station['name']}")
+        self._using_fallback = use_fallback
+        self._attempt = attempt
+        self.metrics.reconnects += 1
+        print(f"🔄 재연결 시도 {self._attempt}: {station['name']}")
+        self._next_retry = now + _backoff_delay(self.cfg, self._attempt)
+
+    def _recovered(self, now: float) -> None:
+        stall = now - (self._silent_since or self._failed_at)
+        recovery = now - self._failed_at
+        m = self.metrics
+        m.recoveries += 1
+        m.last_stall_sec = stall
+        m.total_stall_sec += stall
+        m.last_recovery_sec = recovery
+        m.recent_recovery_sec.append(round(recovery, 3))
+        print(f"✅ 스트림 복구: {self.state.play_name} (끊김 {stall:.1f}s, 재시도 {self._attempt}회)")
+        self._failed_at = 0.0
+        self._attempt = 0
+        self._export()
+
+    def _export(self) -> None:
+        if not self.metrics_file:
+            return
+        try:
+            tmp = self.metrics_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.metrics.snapshot(), f)
+            os.replace(tmp, self.metrics_file)
+        except Exception:
+            pass
+
+
+def start_stream_health(state, cfg: Dict) -> Optional[StreamHealth]:
+    """config.json 의 "stream_health" 항목 (기본 활성) 으로 감시 스레드 시작"""
+    opts = dict(cfg.get("stream_health") or {})
+    if not opts.pop("enabled", True):
+        return None
+    try:
+        health = StreamHealth(state, HealthConfig(**opts))
+    except TypeError as e:
+        print(f"⚠️  stream_health 설정 오류: {e}")
+        health = StreamHealth(state)
+    health.start()
+    return health
@@ -1,6 +1,8 @@
+import random
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Deque, Dict, List, Optional
 
 @dataclass
 class InputConfig:
@@ -13,6 +15,95 @@ class InputConfig:
     short_press_min_sec: float = 0.05
     long_press_sec: float = 1.0
 
+    # 회전 속도 기반 재생 전환 (adaptive_switch=False 면 play_switch_delay_sec 고정)
+    adaptive_switch: bool = True
+    switch_min_delay_sec: float = 0.12     # 한 칸만 돌리고 멈춘 경우
+    switch_max_delay_sec: float = 0.60     # 빠르게 돌리는 중
+    switch_delay_per_detent: float = 0.06  # 최근 창 안의 회전 1칸당 추가 지연
+    switch_velocity_window_sec: float = 1.0
+    switch_spin_gap_factor: float = 6.0    # 빠르게 돌리다 멈추면 평균 회전 간격의 이 배수만 기다림
+
+
+class SwitchPolicy:
+    """
+    마지막 회전 후 언제 재생을 시작할지 결정.
+    최근 velocity_window 안의 회전 수가 적으면(천천히 고름) 바로, 많으면(빠르게 지나감) 더 기다림.
+    """
+
+    def __init__(self, cfg: InputConfig):
+        self.cfg = cfg
+        self._detents: Deque[float] = deque()
+        self._delay = cfg.play_switch_delay_sec
+
+    def on_detent(self, now: float) -> None:
+        cfg = self.cfg
+        self._detents.append(now)
+        while self._detents and now - self._detents[0] > cfg.switch_velocity_window_sec:
+            self._detents.popleft()
+        if cfg.adaptive_switch:
+            n = len(self._detents)
+            d = cfg.switch_min_delay_sec + (n - 1) * cfg.switch_delay_per_detent
+            if n > 1:
+                # 빠르게 돌리는 중: 계속 돌릴 거라면 다음 칸이 평균 간격 안에 옴 → 그 몇 배만 기다리면 충분
+                gap = (now - self._detents[0]) / (n - 1)
+                d = min(d, gap * cfg.switch_spin_gap_factor)
+            self._delay = max(cfg.switch_min_delay_sec, min(cfg.switch_max_delay_sec, d))
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    def ready(self, now: float, last_change: float) -> bool:
+        return (now - last_change) >= self._delay
+
+
+def synthetic_traces(n: int, seed: int = 1) -> Dict[str, List[List[float]]]:
+    """회전 시각(초) 목록. 마지막 칸이 사용자가 고른 스테이션. (벤치마크 / 테스트용)"""
+    rnd = random.Random(seed)
+
+    def jit(v):
+        return max(0.005, v * rnd.uniform(0.7, 1.3))
+
+    def seq(gaps):
+        t, out = 0.0, [0.0]
+        for g in gaps:
+            t += jit(g)
+            out.append(t)
+        return out
+
+    return {
+        "deliberate": [seq([]) for _ in range(n)],                       # 한 칸 돌리고 멈춤
+        "step2": [seq([0.15]) for _ in range(n)],                         # 두 칸
+        "browse": [seq([0.8] * 5) for _ in range(n)],                     # 하나씩 들어보며 이동
+        "spin": [seq([0.03] * 14) for _ in range(n)],                     # 빠르게 돌림
+        "spin_pause": [seq([0.04] * 7 + [0.3] + [0.04] * 7) for _ in range(n)],
+    }
+
+
+def replay_trace(trace: List[float], policy: SwitchPolicy, step: float = 0.001) -> Dict[str, Any]:
+    """main() 루프와 같은 방식으로 trace 를 재생 → loadfile 요청 시점 기록"""
+    loads = []
+    pending = False
+    last_change = 0.0
+    i = 0
+    t = 0.0
+    end = trace[-1] + 2.0
+    while t <= end:
+        while i < len(trace) and trace[i] <= t:
+            policy.on_detent(trace[i])
+            pending = True
+            last_change = trace[i]
+            i += 1
+        if pending and policy.ready(t, last_change):
+            loads.append((t, i))
+            pending = False
+        t += step
+    final = [tt for tt, pos in loads if pos == len(trace)]
+    return {
+        "latency": (final[0] - trace[-1]) if final else None,
+        "wasted": sum(1 for _, pos in loads if pos != len(trace)),
+    }
+
 
 @dataclass
 class ButtonState:
@@ -11,11 +11,24 @@ import spidev
 from PIL import Image
 
 from .state import AppState
-from .config import setup_config_interactive, save_settings
+from .config import setup_config_interactive
 from . import player
 from . import weather
 from . import display
-from .input import InputConfig, ButtonState, read_rotary, handle_button
+from .relay import create_relay
+from .stats import open_stats
+from .health import start_stream_health
+from .supervisor import start_mpv_supervisor
+from .boot import BootPlan, DEFAULT_BUDGET_SEC
+from .visualizer import start_level_feed
+from .crossfade import create_switcher
+from .weather_scheduler import start_weather_scheduler
+from .runtime_state import open_runtime_state
+from .station_cache import open_station_cache
+from .stations import load_stations
+from . import navigation
+from .config_watch import apply_station_reload, start_config_watcher
+from .input import InputConfig, ButtonState, SwitchPolicy, read_rotary, handle_button
 
 LOCK_FILE = "/tmp/wr_radio.lock"
 
@@ -92,30 +105,7 @@ def set_brightness(state: AppState, level: int, bl_pin: int) -> int:
         return level
 
 
-def main():
-    cfg = setup_config_interactive()
-    if cfg is None:
-        print("❌ 설정 초기화 실패")
-        return
-
-    state = AppState()
-    state.openweather_api_key = cfg.get("openweather_api_key", "")
-    state.enable_weather = bool(state.openweather_api_key)
-    state.radio_stations = cfg["stations"]
-    state.current_index = cfg.get("last_station", 0)
-    if not (0 <= state.current_index < len(state.radio_stations)):
-        state.current_index = 0
-
-    # 저장된 볼륨/밝기 로드
-    state.current_volume = cfg.get("last_volume", 50)
-    state.current_brightness = cfg.get("last_brightness", 100)
-    print(f"🔊 볼륨: {state.current_volume}%  💡 밝기: {state.current_brightness}%")
-
-    print("🌤️  날씨 기능 " + ("활성화" if state.enable_weather else "비활성화 (API 키 없음)"))
-    print(f"📻 스테이션 {len(state.radio_stations)}개 로드")
-
-    acquire_lock()
-
+def _boot_gpio(state: AppState):
     # SPI init
     state.spi = spidev.SpiDev()
     state.spi.open(0, 0)
@@ -135,16 +125,8 @@ def main():
     GPIO.setup(PIN_RST, GPIO.OUT)
     GPIO.setup(PIN_BL, GPIO.OUT)
 
-    pins = {
-        "S1": PIN_S1,
-        "S2": PIN_S2,
-        "KEY": PIN_KEY,
-        "CS": PIN_CS,
-        "DC": PIN_DC,
-        "RST": PIN_RST,
-        "BL": PIN_BL,
-    }
 
+def _boot_panel(state: AppState):
     # LCD init
     print("LCD 초기화 중...")
     display.init_display(GPIO, {"CS": PIN_CS, "DC": PIN_DC, "RST": PIN_RST}, state, rotation=90)
@@ -160,23 +142,24 @@ def main():
         state.pwm_backlight = None
 
     # clear screen
-    clear_image = Image.new("RGB", (240, 240), (0, 0, 0))
-    display.display_image(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, clear_image)
+    display.clear_screen(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state)
     print("화면 클리어 완료")
 
-    # mpv init
+
+def _boot_mpv(state: AppState):
     if not player.ensure_mpv_running(state):
-        print("mpv를 시작할 수 없어 종료합니다.")
-        try:
-            pwm_safe_close(state)
-        except Exception:
-            pass
-        try:
-            GPIO.cleanup()
-        except Exception:
-            pass
-        release_lock()
-        return
+        raise RuntimeError("mpv 시작 실패")
+
+
+def _boot_audio(state: AppState, cfg):
+    # mpv 프로세스 감시 (죽으면 재시작 + 상태 복원)
+    state.mpv_supervisor = start_mpv_supervisor(state)
+
+    # 스트림 릴레이 (선택)
+    state.relay = create_relay(cfg)
+
+    # 스테이션별 스트림 통계 / 적응형 버퍼
+    state.stream_stats = open_stats(cfg)
 
     # 저장된 볼륨 적용
     player.set_volume(state, state.current_volume)
@@ -185,13 +168,216 @@ def main():
     player.start_audio_monitor(state)
     print("🎧 오디오 모니터 시작")
 
-    # initial render
-    wd = weather.get_cached_weather(state, state.radio_stations[state.current_index]["lat"], state.radio_stations[state.current_index]["lon"])
-    display.display_radio_info(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, weather_data=wd, force_full=True)
+    # 스트림 끊김 감지 / 자동 재연결
+    state.stream_health = start_stream_health(state, cfg)
+
+    # 실제 소리 레벨 피드 (파형 애니메이션용)
+    state.level_feed = start_level_feed(state, cfg)
+
+    # 채널 전환 방식 (replace / make_before_break)
+    state.switcher = create_switcher(cfg)
 
     # auto play
     player.play_station(state, state.current_index)
     state.is_playing = True
+    player.start_play_worker(state)
+
+
+def _save_runtime_state(state: AppState) -> None:
+    state.runtime_state.update(
+        station=state.current_index, volume=state.current_volume, brightness=state.current_brightness
+    )
+
+
+def _show_card(state: AppState) -> None:
+    """현재 스테이션 카드 전체 (캐시된 날씨 포함)"""
+    st = state.radio_stations[state.current_index]
+    wd = weather.get_cached_weather(state, st["lat"], st["lon"])
+    display.display_radio_info(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, weather_data=wd)
+
+
+def _clear_animation(state: AppState) -> None:
+    img = Image.new("RGB", (240, 240), (0, 0, 0))
+    display.display_image_region(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, img, 0, 125, 239, 165)
+    state.animation_frame = 0
+
+
+# --- 상태 구독 (state.dispatch() 에서 메인 스레드로 호출) ---
+def _on_station_changed(state: AppState, changed, settle_sec: float) -> None:
+    """
+    current_index: 입력이 멈추면 날씨 조회 + 카드.
+    일반 모드에서만 (이동 모드는 로터리 처리에서 직접 그리고, 다른 모드는 일반 모드로 돌아올 때 전체를 그림)
+    """
+    if state.current_mode != "normal":
+        return
+    if time.time() - state.last_input_time < settle_sec:
+        state.mark_changed("current_index")   # 아직 돌리는 중 → 다음 dispatch 에서
+        return
+    weather.start_weather_update(state, state.current_index)
+    _show_card(state)
+
+
+def _on_settings_changed(state: AppState, changed) -> None:
+    """current_index / current_volume / current_brightness: 잠시 뒤 (save_delay_sec) 실행 상태 파일에 저장"""
+    state.needs_save = True
+    state.last_change_time = time.time()
+
+
+def _on_playing_changed(state: AppState, changed) -> None:
+    """is_playing: 재생이 멈추면 애니메이션 영역 지움"""
+    if not state.is_playing:
+        _clear_animation(state)
+
+
+def _drain_weather_events(state: AppState) -> None:
+    """백그라운드 날씨 조회 완료 → 지금 보고 있는 스테이션이면 날씨 줄만 다시 그림"""
+    wd = weather.take_strip_update(state)
+    if wd is not None:
+        display.display_weather_strip(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, wd)
+
+
+def _enter_nav_mode(state: AppState, mode: str, now: float) -> None:
+    nav = navigation.get_nav(state)
+    if mode == "nav_nearby":
+        nav.start_nearby(state.current_index)
+    state.current_mode = mode
+    state.mode_enter_time = now
+    print({"nav_name": "🔤 이름 이동 모드", "nav_country": "🌐 나라 이동 모드", "nav_nearby": "📍 가까운 스테이션 모드"}[mode])
+    display.display_mode_indicator(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, mode, nav.label(mode, state.current_index))
+
+
+def _reload_stations(state: AppState, prepared, now: float) -> None:
+    """config.json 이 바뀜 → 스테이션 목록만 반영 (mpv / LCD 는 그대로)"""
+    if prepared["old"] is not state.radio_stations:
+        # 준비하는 사이 목록이 바뀜 → 지금 목록 기준으로 감시 스레드에서 다시 (메인 루프에서 읽지 않음)
+        state.config_watcher.retry()
+        return
+    try:
+        result = apply_station_reload(state, prepared)
+    except Exception as e:
+        print(f"⚠️  스테이션 목록 다시 읽기 실패: {e}")
+        return
+    if result["replay"]:
+        # 듣던 스테이션이 목록에서 빠짐 → 같은 자리의 스테이션 재생
+        state.pending_play = True
+        state.last_station_change_time = now
+
+
+def _boot_weather(state: AppState, cfg):
+    # 모든 스테이션 날씨를 현재 스테이션부터 차례로 미리 받음
+    state.weather_scheduler = start_weather_scheduler(state, cfg)
+    if state.weather_scheduler is not None:
+        return
+    st = state.radio_stations[state.current_index]
+    if weather.should_update_weather(state, st["lat"], st["lon"]):
+        weather._fetch_weather_background(state, st["lat"], st["lon"], st["location"])
+
+
+def _abort_boot(state: AppState) -> None:
+    """부팅 실패: 띄운 mpv / 릴레이 / 통계 / GPIO 정리 + lock 파일 삭제"""
+    try:
+        player.shutdown_player(state)
+    except Exception:
+        pass
+    try:
+        pwm_safe_close(state)
+    except Exception:
+        pass
+    try:
+        GPIO.cleanup()
+    except Exception:
+        pass
+    try:
+        if state.spi:
+            state.spi.close()
+    except Exception:
+        pass
+    release_lock()
+
+
+def _boot_first_frame(state: AppState, boot: BootPlan):
+    # initial render
+    _show_card(state)
+    boot.mark("first_frame")
+
+
+def main():
+    cfg = setup_config_interactive(normalize=False)
+    if cfg is None:
+        print("❌ 설정 초기화 실패")
+        return
+    boot = BootPlan(budget_sec=float(cfg.get("boot_budget_sec", DEFAULT_BUDGET_SEC)))
+
+    state = AppState()
+    state.openweather_api_key = cfg.get("openweather_api_key", "")
+    weather.configure(cfg)
+    # OpenWeather 외의 제공자 / 일괄 조회(Open-Meteo)는 API 키 없이도 사용 가능
+    state.enable_weather = bool(state.openweather_api_key) or weather.BULK_ENABLED or not weather.needs_api_key()
+    # 지난 실행의 날씨 캐시 → 첫 화면부터 날씨 표시
+    state.weather_store = weather.open_weather_cache(state, cfg)
+    # 스테이션 목록 (열 단위 저장소, timezone 등은 처음 볼 때 계산)
+    # 원본이 그대로면 지난 부팅에 저장한 정규화 캐시에서 (JSON 파싱 / timezone 계산 없음)
+    station_cache = open_station_cache(cfg)
+    state.radio_stations = station_cache.load(cfg) if station_cache is not None else load_stations(cfg)
+    # 마지막 스테이션/볼륨/밝기: runtime_state.json (없으면 예전처럼 config.json 의 last_* 값)
+    state.runtime_state = open_runtime_state(cfg)
+    saved = state.runtime_state.load(cfg)
+    state.current_index = saved["station"]
+    if not (0 <= state.current_index < len(state.radio_stations)):
+        state.current_index = 0
+
+    # 저장된 볼륨/밝기 로드
+    state.current_volume = saved["volume"]
+    state.current_brightness = saved["brightness"]
+    print(f"🔊 볼륨: {state.current_volume}%  💡 밝기: {state.current_brightness}%")
+
+    print("🌤️  날씨 기능 " + ("활성화" if state.enable_weather else "비활성화 (API 키 없음)"))
+    print(f"📻 스테이션 {len(state.radio_stations)}개 로드"
+          + (f" (캐시: {station_cache.status})" if station_cache is not None else ""))
+
+    acquire_lock()
+
+    pins = {
+        "S1": PIN_S1,
+        "S2": PIN_S2,
+        "KEY": PIN_KEY,
+        "CS": PIN_CS,
+        "DC": PIN_DC,
+        "RST": PIN_RST,
+        "BL": PIN_BL,
+    }
+
+    # 부팅 단계: mpv / 패널 / 첫 스테이션 timezone / 첫 날씨 조회를 동시에
+    boot.add("stations", lambda: state.radio_stations[state.current_index]["timezone"])
+    boot.add("gpio", lambda: _boot_gpio(state))
+    boot.add("panel", lambda: _boot_panel(state), deps=("gpio",))
+    boot.add("mpv", lambda: _boot_mpv(state))
+    boot.add("audio", lambda: _boot_audio(state, cfg), deps=("mpv",))
+    boot.add("weather", lambda: _boot_weather(state, cfg), background=True)
+    boot.add("standby", lambda: state.switcher.prepare(state), deps=("audio",), background=True)
+    nav_opts = cfg.get("navigation") or {}
+    if navigation.nav_enabled(state, nav_opts):
+        # 이름 / 나라 / 위치 색인 (스테이션이 많으면 수 초 걸리므로 백그라운드)
+        boot.add("navigation", lambda: navigation.get_nav(state), background=True)
+    if station_cache is not None and station_cache.needs_save:
+        # 원본이 바뀌었으면 timezone 을 전부 계산해 캐시 다시 저장 (다음 부팅부터 빠름)
+        stations = state.radio_stations
+        boot.add("station_cache", lambda: station_cache.save(stations), background=True)
+    boot.add("first_frame", lambda: _boot_first_frame(state, boot), deps=("panel", "stations"))
+    boot.run()
+
+    # GPIO / 패널 실패도 mpv 는 이미 떠 있을 수 있음 → 정리한 뒤 다시 던짐
+    boot_error = next((boot.phases[n].error for n in ("gpio", "panel") if boot.phases[n].error is not None), None)
+    if boot_error is not None or boot.failed("mpv"):
+        if boot_error is None:
+            print("mpv를 시작할 수 없어 종료합니다.")
+        _abort_boot(state)
+        if boot_error is not None:
+            raise boot_error
+        return
+
+    # config.json 수정 시 재시작 없이 스테이션 목록 반영
+    state.config_watcher = start_config_watcher(state, cfg)
 
     # input loop vars
     input_cfg = InputConfig(
@@ -202,8 +388,17 @@ def main():
         save_delay_sec=1.0,
         short_press_min_sec=0.05,
         long_press_sec=1.0,
+        adaptive_switch=bool(cfg.get("adaptive_switch", True)),
     )
     btn_state = ButtonState()
+    switch_policy = SwitchPolicy(input_cfg)
+
+    # 상태 구독: 카드 / 저장 / 애니메이션 영역은 관련 필드가 바뀔 때만 (매 반복 비교하지 않음)
+    state.subscribe(("current_index",), lambda st, changed: _on_station_changed(st, changed, input_cfg.display_update_delay))
+    state.subscribe(("current_index", "current_volume", "current_brightness"), _on_settings_changed)
+    state.subscribe(("is_playing",), _on_playing_changed)
+    state.discard_changes()   # 부팅 중 설정한 값 (첫 화면은 이미 그림)
+    state.mark_changed("is_playing")   # 재생이 시작되지 않았으면 첫 화면의 애니메이션 영역 지움
 
     s1_last = GPIO.input(PIN_S1)
     key_last = GPIO.input(PIN_KEY)
@@ -224,12 +419,19 @@ def main():
         while True:
             now = time.time()
 
+            # 부팅 리포트: 첫 소리가 나면 (또는 예산의 3배가 지나면) 기록
+            if boot is not None and (state.audio_playing or boot.elapsed() > boot.budget_sec * 3):
+                if state.audio_playing:
+                    boot.mark("first_audio")
+                boot.report()
+                boot.save()
+                boot = None
+
             # mode timeout auto return
             if state.current_mode != "normal" and (now - state.mode_enter_time) >= input_cfg.mode_timeout_sec:
                 state.current_mode = "normal"
                 print("→ 일반 모드 (자동)")
-                wd = weather.get_cached_weather(state, state.radio_stations[state.current_index]["lat"], state.radio_stations[state.current_index]["lon"])
-                display.display_radio_info(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, weather_data=wd, force_full=True)
+                _show_card(state)
 
             # rotary
             s1_last, direction, last_rotation_time = read_rotary(
@@ -237,33 +439,45 @@ def main():
             )
             if direction != 0:
                 if state.current_mode == "normal":
+                    state.last_input_time = now
                     state.current_index = (state.current_index + direction) % len(state.radio_stations)
                     print(f"→ {state.radio_stations[state.current_index]['name']}")
-                    state.last_input_time = now
-                    state.needs_save = True
-                    state.last_change_time = now
                     state.pending_play = True
                     state.last_station_change_time = now
+                    switch_policy.on_detent(now)
                 elif state.current_mode == "volume":
                     player.set_volume(state, state.current_volume + direction * 5)
-                    state.needs_save = True
-                    state.last_change_time = now
                     state.mode_enter_time = now
                     display.display_mode_indicator(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, "volume", state.current_volume)
                 elif state.current_mode == "brightness":
                     set_brightness(state, state.current_brightness + direction * 10, PIN_BL)
-                    state.needs_save = True
-                    state.last_change_time = now
                     state.mode_enter_time = now
                     display.display_mode_indicator(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, "brightness", state.current_brightness)
+                elif state.current_mode in navigation.NAV_MODES:
+                    index, label = navigation.get_nav(state).step(state.current_mode, state.current_index, direction)
+                    state.mode_enter_time = now
+                    if index != state.current_index:
+                        state.current_index = index
+                        print(f"→ {state.radio_stations[index]['name']}")
+                        state.pending_play = True
+                        state.last_station_change_time = now
+                        switch_policy.on_detent(now)
+                        # 모드 표시를 카드 위에 그려야 하므로 구독자를 기다리지 않고 바로
+                        weather.start_weather_update(state, index)
+                        _show_card(state)
+                    display.display_mode_indicator(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, state.current_mode, label)
 
             # button events
             key_last, ev = handle_button(GPIO, pins, state, now, key_last, btn_state, input_cfg)
             if ev == "exit_mode":
-                state.current_mode = "normal"
-                print("→ 일반 모드")
-                wd = weather.get_cached_weather(state, state.radio_stations[state.current_index]["lat"], state.radio_stations[state.current_index]["lon"])
-                display.display_radio_info(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, weather_data=wd, force_full=True)
+                # 볼륨 모드에서 버튼 → 이름 → 나라 → 가까운 곳 이동 모드 차례로 (스테이션이 적으면 바로 일반 모드)
+                nxt = navigation.next_mode(state.current_mode, navigation.nav_enabled(state, nav_opts))
+                if nxt != "normal":
+                    _enter_nav_mode(state, nxt, now)
+                else:
+                    state.current_mode = "normal"
+                    print("→ 일반 모드")
+                    _show_card(state)
 
             elif ev == "enter_brightness":
                 state.current_mode = "brightness"
@@ -277,41 +491,43 @@ def main():
                 print("🔊 볼륨 조절 모드")
                 display.display_mode_indicator(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, "volume", state.current_volume)
 
-            # display update after input settled (normal mode)
-            if state.current_mode == "normal":
-                if state.last_input_time > 0 and state.current_index != state.last_updated_index:
-                    if (now - state.last_input_time) >= input_cfg.display_update_delay:
-                        if weather.should_update_weather(state, state.radio_stations[state.current_index]["lat"], state.radio_stations[state.current_index]["lon"]):
-                            weather.start_weather_update(state, state.current_index)
-                        wd = weather.get_cached_weather(state, state.radio_stations[state.current_index]["lat"], state.radio_stations[state.current_index]["lon"])
-                        display.display_radio_info(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, weather_data=wd, force_full=False)
-                        state.last_updated_index = state.current_index
+            # 바뀐 상태 → 구독자 (카드는 입력이 멈춘 뒤 / 저장 예약 / 재생 중지 시 애니메이션 영역 지우기)
+            state.dispatch()
+
+            # 날씨 조회 완료 → 날씨 줄만 갱신
+            if not state.weather_events.empty():
+                _drain_weather_events(state)
+
+            # config.json 변경 → 스테이션 목록 다시 읽기
+            if state.config_watcher is not None:
+                prepared = state.config_watcher.take()
+                if prepared is not None:
+                    _reload_stations(state, prepared, now)
 
             # play switch after rotary stop
-            if state.pending_play and (now - state.last_station_change_time) >= input_cfg.play_switch_delay_sec:
-                player.play_station(state, state.current_index)
+            # (회전 속도에 따라 대기 시간 결정, 실제 loadfile 은 재생 스레드에서)
+            if state.pending_play and switch_policy.ready(now, state.last_station_change_time):
+                player.request_play(state, state.current_index)
                 state.pending_play = False
                 # 채널 변경 시 애니메이션 영역 즉시 지우기
-                img = Image.new("RGB", (240, 240), (0, 0, 0))
-                display.display_image_region(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, img, 0, 125, 239, 165)
-                state.animation_frame = 0
-                state.animation_cleared = True
+                _clear_animation(state)
 
             # 애니메이션: audio_playing 플래그 기반 (normal 모드에서만)
             if state.is_playing and state.current_mode == "normal":
                 if state.audio_playing:
                     # 실제 소리 나는 중 → 사인파 애니메이션 (볼륨 기반 진폭)
-                    state.animation_cleared = False
                     if (now - last_animation_update) >= 0.2:
                         img = Image.new("RGB", (240, 240), (0, 0, 0))
                         draw = ImageDraw.Draw(img)
-                        display.draw_sine_wave_animation(draw, state.animation_frame, state.current_volume)
+                        if state.level_feed is not None and state.level_feed.active:
+                            display.draw_level_wave(draw, state.animation_frame, state.level_feed.snapshot())
+                        else:
+                            display.draw_sine_wave_animation(draw, state.animation_frame, state.current_volume)
                         state.animation_frame = (state.animation_frame + 1) % 100
                         display.display_image_region(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, img, 0, 125, 239, 165)
                         last_animation_update = now
                 else:
                     # 재생 명령 보냈지만 아직 소리 안 남 → Loading
-                    state.animation_cleared = False
                     if (now - last_animation_update) >= 0.2:
                         img = Image.new("RGB", (240, 240), (0, 0, 0))
                         draw = ImageDraw.Draw(img)
@@ -320,24 +536,16 @@ def main():
                         display.display_image_region(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, img, 0, 125, 239, 165)
                         last_animation_update = now
 
-            elif not state.is_playing and not state.animation_cleared:
-                # 재생 중지 → 영역 지우기
-                img = Image.new("RGB", (240, 240), (0, 0, 0))
-                display.display_image_region(GPIO, {"CS": PIN_CS, "DC": PIN_DC}, state, img, 0, 125, 239, 165)
-                state.animation_frame = 0
-                state.animation_cleared = True
-
             # save (station, volume, brightness 통합)
             if state.needs_save and (now - state.last_change_time) >= input_cfg.save_delay_sec:
-                save_settings(state.current_index, state.current_volume, state.current_brightness)
+                _save_runtime_state(state)
                 state.needs_save = False
+            state.runtime_state.maybe_flush()
 
             time.sleep(0.001)
 
     except KeyboardInterrupt:
         print("\n\n프로그램 종료")
-        if state.needs_save:
-            save_settings(state.current_index, state.current_volume, state.current_brightness)
         try:
             player.stop_playback(state)
         except Exception:
@@ -346,8 +554,19 @@ def main():
     finally:
         print("\n정리 중...")
 
+        if state.config_watcher is not None:
+            state.config_watcher.stop()
+
         player.shutdown_player(state)
 
+        if state.runtime_state is not None:
+            _save_runtime_state(state)
+            if state.runtime_state.flush(shutdown=True):
+                print(f"💾 저장 완료 (스테이션:{state.current_index+1}, 볼륨:{state.current_volume}%, 밝기:{state.current_brightness}%)")
+
+        if state.weather_store is not None:
+            state.weather_store.maybe_save(state, force=True)
+
         try:
             pwm_safe_close(state)
         except Exception:
@@ -0,0 +1,217 @@
+"""
+스테이션이 많을 때 빨리 찾아가기 위한 색인 + 로터리 이동 모드.
+  nav_name    : 이름 첫 글자 단위로 이동 (A → B → C ...)
+  nav_country : 나라(location 의 마지막 부분) 단위로 이동
+  nav_nearby  : 모드에 들어온 스테이션에서 가까운 순서로 이동
+
+색인은 스테이션 목록이 늘어나면 새 항목만 추가 (이름/나라: 정렬된 목록에 insort,
+위치: 트리에 바로 넣지 않고 작은 대기 목록에 모았다가 커지면 트리를 다시 만듦).
+"""
+import bisect
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .spatial import SphereTree, chord_to_km, unit_vector
+
+NAV_MODES = ("nav_name", "nav_country", "nav_nearby")
+
+_build_lock = threading.Lock()  # 부팅 중 백그라운드 생성과 버튼 입력이 겹칠 때 한 번만 만들도록
+
+
+def _name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+def _initial(key: str) -> str:
+    return key[:1] or " "
+
+
+def country_of(location: str) -> str:
+    """'Acra, New York' → 'New York', 'California, USA' → 'USA'"""
+    part = location.rsplit(",", 1)[-1].strip()
+    return part or "?"
+
+
+class StationNav:
+    def __init__(self, stations: Any):
+        self.stations = stations
+        self._lock = threading.Lock()
+        self._names: List[Tuple[str, int]] = []        # (이름 키, index) 정렬
+        self._name_of: List[str] = []                  # index → 이름 키
+        self._countries: List[str] = []                # 나라 키 정렬
+        self._groups: Dict[str, List[Tuple[str, int]]] = {}  # 나라 → (이름 키, index) 정렬
+        self._country_of: List[str] = []
+        self._tree: Optional[SphereTree] = None
+        self._tree_size = 0                            # 트리에 들어 있는 스테이션 수 (앞에서부터)
+        self._count = 0                                # 색인에 반영된 스테이션 수
+
+        # nav_nearby: 모드에 들어온 스테이션 기준 가까운 순서
+        self._origin = -1
+        self._ranked: List[Tuple[float, int]] = []
+        self._rank_pos = 0
+        self.refresh()
+
+    # --- 색인 ---
+    def _coords(self, i: int) -> Tuple[float, float]:
+        st = self.stations
+        if hasattr(st, "lats"):
+            return st.lats[i], st.lons[i]
+        return st[i]["lat"], st[i]["lon"]
+
+    def _name(self, i: int) -> str:
+        st = self.stations
+        return st.name(i) if hasattr(st, "name") else st[i]["name"]
+
+    def _location(self, i: int) -> str:
+        st = self.stations
+        return st.location(i) if hasattr(st, "location") else st[i].get("location", "")
+
+    def refresh(self) -> int:
+        """목록에 새로 추가된 스테이션을 색인에 반영. 추가된 수 반환"""
+        with self._lock:
+            n = len(self.stations)
+            if n < self._count:
+                raise ValueError("스테이션 목록이 줄어듦 → StationNav 를 새로 만들 것")
+            added = n - self._count
+            if not added:
+                return 0
+            bulk = added > 64
+            names = []
+            for i in range(self._count, n):
+                key = _name_key(self._name(i))
+                country = country_of(self._location(i))
+                self._name_of.append(key)
+                self._country_of.append(country)
+                group = self._groups.get(country)
+                if group is None:
+                    group = self._groups[country] = []
+                    bisect.insort(self._countries, country)
+                if bulk:
+                    names.append((key, i))
+                    group.append((key, i))
+                else:
+                    bisect.insort(self._names, (key, i))
+                    bisect.insort(group, (key, i))
+            if bulk:
+                # 한꺼번에 많이 늘었으면 insort 대신 정렬 한 번
+                self._names.extend(names)
+                self._names.sort()
+                for group in self._groups.values():
+                    group.sort()
+            self._count = n
+            # 트리 밖 스테이션이 많아지면 다시 만듦 (대기 목록은 선형 검색)
+            if n - self._tree_size > max(64, int(math.sqrt(n))):
+                self._tree = SphereTree(self._coords(i) for i in range(n))
+                self._tree_size = n
+            return added
+
+    def _sync(self) -> None:
+        if len(self.stations) != self._count:
+            self.refresh()
+
+    # --- 이름 ---
+    def next_initial(self, index: int, direction: int) -> Tuple[int, str]:
+        """다음(이전) 첫 글자의 첫 스테이션. (index, 첫 글자)"""
+        self._sync()
+        names = self._names
+        c = _initial(self._name_of[index])
+        if direction > 0:
+            pos = bisect.bisect_left(names, (c + "\U0010ffff",))
+            if pos >= len(names):
+                pos = 0
+        else:
+            pos = bisect.bisect_left(names, (c,)) - 1
+            if pos < 0:
+                pos = len(names) - 1
+            # 그 글자의 첫 스테이션으로
+            pos = bisect.bisect_left(names, (_initial(names[pos][0]),))
+        key, i = names[pos]
+        return i, _initial(key).upper()
+
+    # --- 나라 ---
+    def next_country(self, index: int, direction: int) -> Tuple[int, str]:
+        """다음(이전) 나라의 첫 스테이션 (이름순). (index, 나라)"""
+        self._sync()
+        countries = self._countries
+        c = self._country_of[index]
+        pos = bisect.bisect_left(countries, c) + (1 if direction > 0 else -1)
+        country = countries[pos % len(countries)]
+        return self._groups[country][0][1], country
+
+    # --- 가까운 스테이션 ---
+    def nearby(self, origin: int, k: int) -> List[Tuple[float, int]]:
+        """origin 에서 가까운 순 [(km, index), ...] (origin 제외) 최대 k개"""
+        self._sync()
+        lat, lon = self._coords(origin)
+        found = self._tree.nearest_k(lat, lon, k + 1) if self._tree is not None else []
+        if self._tree_size < self._count:
+            qx, qy, qz = unit_vector(lat, lon)
+            for i in range(self._tree_size, self._count):
+                x, y, z = unit_vector(*self._coords(i))
+                found.append((chord_to_km((x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2), i))
+            found.sort()
+        return [(km, i) for km, i in found if i != origin][:k]
+
+    def start_nearby(self, origin: int) -> None:
+        self._origin = origin
+        self._ranked = []
+        self._rank_pos = 0
+
+    def step_nearby(self, direction: int) -> Tuple[int, str]:
+        """모드에 들어온 스테이션 기준 다음(이전) 순위. (index, '12 km')"""
+        pos = self._rank_pos + direction
+        if pos <= 0:
+            self._rank_pos = 0
+            return self._origin, "0 km"
+        if pos > len(self._ranked):
+            # 필요한 만큼만 (두 배씩) 더 찾음
+            self._ranked = self.nearby(self._origin, max(16, len(self._ranked) * 2, pos))
+            pos = min(pos, len(self._ranked))
+            if pos == 0:
+                return self._origin, "0 km"
+        self._rank_pos = pos
+        km, i = self._ranked[pos - 1]
+        return i, f"{km:.0f} km"
+
+    # --- 로터리 ---
+    def label(self, mode: str, index: int) -> str:
+        """모드에 들어올 때 표시할 현재 값"""
+        self._sync()
+        if mode == "nav_name":
+            return _initial(self._name_of[index]).upper()
+        if mode == "nav_country":
+            return self._country_of[index]
+        return "0 km"
+
+    def step(self, mode: str, index: int, direction: int) -> Tuple[int, str]:
+        if mode == "nav_name":
+            return self.next_initial(index, direction)
+        if mode == "nav_country":
+            return self.next_country(index, direction)
+        return self.step_nearby(direction)
+
+
+def next_mode(mode: str, nav_enabled: bool) -> str:
+    """모드 중 버튼: volume → 이름 → 나라 → 가까운 곳 → normal (이동 모드가 꺼져 있으면 바로 normal)"""
+    if not nav_enabled:
+        return "normal"
+    if mode == "volume":
+        return NAV_MODES[0]
+    if mode in NAV_MODES[:-1]:
+        return NAV_MODES[NAV_MODES.index(mode) + 1]
+    return "normal"
+
+
+def nav_enabled(state, opts: Dict) -> bool:
+    """config.json 의 "navigation" 항목: 스테이션이 min_stations 개 이상일 때만 (기본 20)"""
+    return bool(opts.get("enabled", True)) and len(state.radio_stations) >= int(opts.get("min_stations", 20))
+
+
+def get_nav(state) -> StationNav:
+    """state.radio_stations 용 색인 (목록 객체가 바뀌면 새로 만들고, 늘어나면 새 항목만 반영)"""
+    with _build_lock:
+        nav = state.station_nav
+        if nav is None or nav.stations is not state.radio_stations or len(state.radio_stations) < nav._count:
+            nav = state.station_nav = StationNav(state.radio_stations)
+        return nav
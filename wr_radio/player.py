@@ -4,6 +4,17 @@ import socket
 import subprocess
 import threading
 import time
+from typing import Dict, Optional
+
+from . import fswatch
+from .stats import DEFAULT_CACHE_SECS, DEFAULT_READAHEAD_SECS, DEFAULT_NETWORK_TIMEOUT
+
+_MONITOR_PROPS = ["core-idle", "pause", "paused-for-cache", "audio-bitrate", "demuxer-cache-duration"]
+STATS_NO_AUDIO_FAIL_SEC = 20.0  # 이 시간 안에 소리가 안 나면 실패로 기록
+
+# 재생 요청 (request_play → 재생 스레드). 대기 중인 요청은 하나만 유지.
+_play_cond = threading.Condition()
+_loading = False   # loadfile 처리 중 (재생 스레드 또는 load_if_current). _play_cond 로 보호
 
 
 def _can_connect(sock_path: str, timeout: float = 0.2) -> bool:
@@ -19,13 +30,15 @@ def _can_connect(sock_path: str, timeout: float = 0.2) -> bool:
         return False
 
 
-def _wait_for_sock(sock_path: str, timeout_sec: float = 8.0) -> bool:
-    start = time.time()
-    while time.time() - start < timeout_sec:
-        if _can_connect(sock_path, timeout=0.2):
-            return True
-        time.sleep(0.05)
-    return False
+def _wait_for_sock(sock_path: str, timeout_sec: float = 8.0, proc=None) -> bool:
+    """소켓 생성 알림(inotify)을 받아 연결 확인. proc 이 먼저 죽으면 바로 False."""
+    alive = (lambda: proc.poll() is None) if proc is not None else None
+    return fswatch.wait_for_path(
+        sock_path,
+        ready=lambda: _can_connect(sock_path, timeout=0.2),
+        timeout=timeout_sec,
+        alive=alive,
+    )
 
 
 def mpv_cmd(state, payload: dict) -> bool:
@@ -40,35 +53,115 @@ def mpv_cmd(state, payload: dict) -> bool:
         return False
 
 
-def _get_core_idle(state) -> bool:
-    """core-idle 값 반환. True = 재생 안 됨, False = 재생 중. 실패 시 True 반환."""
+def mpv_request(state, command: list, timeout: float = 0.5) -> bool:
+    """mpv_cmd 와 달리 응답까지 기다림 (적용된 뒤에 조회해야 할 때). mpv 가 success 를 돌려주면 True"""
     try:
         s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        s.settimeout(0.3)
+        s.settimeout(timeout)
         s.connect(state.mpv_sock)
-        s.send((json.dumps({"command": ["get_property", "core-idle"]}) + "\n").encode("utf-8"))
+        s.send((json.dumps({"command": command, "request_id": 0}) + "\n").encode("utf-8"))
         resp = b""
         while True:
-            chunk = s.recv(256)
+            chunk = s.recv(4096)
             if not chunk:
                 break
             resp += chunk
-            if b"\n" in resp:
+            *lines, resp = resp.split(b"\n")
+            for line in lines:
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("request_id") == 0:   # 이벤트 메시지는 건너뜀
+                    s.close()
+                    return data.get("error") == "success"
+        s.close()
+    except Exception:
+        pass
+    return False
+
+
+def get_properties(state, names, timeout: float = 0.3) -> dict:
+    """여러 프로퍼티를 한 번의 연결로 조회. 실패한 항목은 결과에서 빠짐."""
+    out = {}
+    try:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(timeout)
+        s.connect(state.mpv_sock)
+        req = b"".join(
+            (json.dumps({"command": ["get_property", n], "request_id": i}) + "\n").encode("utf-8")
+            for i, n in enumerate(names)
+        )
+        s.send(req)
+        resp = b""
+        pending = len(names)
+        while pending > 0:
+            chunk = s.recv(4096)
+            if not chunk:
                 break
+            resp += chunk
+            *lines, resp = resp.split(b"\n")
+            for line in lines:
+                if not line:
+                    continue
+                data = json.loads(line)
+                if "request_id" not in data:
+                    continue  # 이벤트 메시지 무시
+                pending -= 1
+                if data.get("error") == "success":
+                    out[names[data["request_id"]]] = data.get("data")
         s.close()
-        data = json.loads(resp.split(b"\n")[0])
-        return bool(data.get("data", True))
     except Exception:
-        return True
+        pass
+    return out
+
+
+def _get_core_idle(state) -> bool:
+    """core-idle 값 반환. True = 재생 안 됨, False = 재생 중. 실패 시 True 반환."""
+    return bool(get_properties(state, ["core-idle"]).get("core-idle", True))
+
+
+def _record_stats(state, props: dict, interval: float) -> None:
+    """모니터 스레드에서 호출: 스테이션별 통계 기록"""
+    stats = state.stream_stats
+    # 재생 스레드가 스테이션을 바꾸는 중이어도 url / 이름 / 시작 시각은 같은 스테이션 것
+    url, name, started_at = state.snapshot("play_url", "play_name", "play_started_at")
+    if stats is None or not url:
+        return
+
+    if started_at > 0:
+        if state.audio_playing:
+            ttfa = time.time() - started_at
+            stats.record_play(url, name, ttfa)
+            state.play_started_at = 0.0
+            print(f"[Stats] {name}: 첫 소리까지 {ttfa:.2f}s")
+        elif time.time() - started_at > STATS_NO_AUDIO_FAIL_SEC:
+            stats.record_failure(url, name)
+            state.play_started_at = 0.0
+    else:
+        paused = bool(props.get("paused-for-cache", False))
+        if paused and not state.last_paused_for_cache:
+            stats.record_underrun(url)
+            print(f"[Stats] {name}: 버퍼 부족")
+        state.last_paused_for_cache = paused
+        if state.audio_playing:
+            stats.record_sample(url, interval, props.get("audio-bitrate"), props.get("demuxer-cache-duration"))
+
+    stats.maybe_flush()
 
 
 def _audio_monitor_thread(state) -> None:
     """폴링 스레드: 0.5초마다 core-idle 확인 후 state.audio_playing 세팅."""
     while not state.shutting_down:
         if state.is_playing:
-            idle = _get_core_idle(state)
+            props = get_properties(state, _MONITOR_PROPS)
+            idle = bool(props.get("core-idle", True))
+            if "pause" in props:
+                state.paused = bool(props["pause"])   # mpv 재시작 시 복원용
+            if not idle and not state.audio_playing and state.switcher is not None:
+                state.switcher.mark_audio()
             state.audio_playing = not idle
             print(f"[Monitor] core-idle={idle}, audio_playing={state.audio_playing}") 
+            _record_stats(state, props, 0.5)
         else:
             state.audio_playing = False
         time.sleep(0.5)
@@ -80,17 +173,15 @@ def start_audio_monitor(state) -> threading.Thread:
     return t
 
 
-def ensure_mpv_running(state) -> bool:
-    if _can_connect(state.mpv_sock):
-        return True
-
-    try:
-        if os.path.exists(state.mpv_sock):
-            os.remove(state.mpv_sock)
-    except Exception:
-        pass
-
-    cmd = [
+def mpv_args(
+    sock_path: str,
+    cache_secs: float = DEFAULT_CACHE_SECS,
+    readahead_secs: float = DEFAULT_READAHEAD_SECS,
+    network_timeout: float = DEFAULT_NETWORK_TIMEOUT,
+    extra=(),
+) -> list:
+    """mpv 실행 인자 (운영 / 벤치마크 공용)"""
+    return [
         "mpv",
         "--no-video",
         "--idle=yes",
@@ -99,50 +190,199 @@ def ensure_mpv_running(state) -> bool:
         "--load-scripts=no",
         "--osc=no",
         "--input-default-bindings=no",
-        "--input-ipc-server=" + state.mpv_sock,
+        "--input-ipc-server=" + sock_path,
         "--volume=50",
         "--cache=yes",
-        "--cache-secs=0.3",
-        "--demuxer-readahead-secs=0.3",
-        "--network-timeout=3",
+        f"--cache-secs={cache_secs}",
+        f"--demuxer-readahead-secs={readahead_secs}",
+        f"--network-timeout={network_timeout:g}",
+        *extra,
     ]
 
+
+def spawn_mpv(cmd: list):
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_process(proc, timeout: float = 2.0) -> None:
+    """terminate → 기다림 → 안 죽으면 kill (좀비 / 고아 mpv 방지)"""
+    if proc is None or proc.poll() is not None:
+        return
     try:
-        state.player_process = subprocess.Popen(
-            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
+        proc.terminate()
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait(timeout=timeout)
+    except Exception:
+        pass
+
+
+def ensure_mpv_running(state, extra=()) -> bool:
+    if _can_connect(state.mpv_sock):
+        return True
+
+    # 다시 띄울 프로세스의 소켓만 지움 (대기 mpv 는 handover 후에도 살아 있을 수 있음)
+    try:
+        if os.path.exists(state.mpv_sock):
+            os.remove(state.mpv_sock)
+    except Exception:
+        pass
+
+    try:
+        state.player_process = spawn_mpv(mpv_args(state.mpv_sock, extra=extra))
     except Exception as e:
         print(f"❌ mpv 실행 실패: {e}")
         state.player_process = None
         return False
 
-    if not _wait_for_sock(state.mpv_sock, timeout_sec=8.0):
+    if not _wait_for_sock(state.mpv_sock, timeout_sec=8.0, proc=state.player_process):
         print("❌ mpv IPC 소켓 생성 실패")
         return False
 
     return True
 
 
+def restore_player_state(state) -> None:
+    """mpv 재시작 후 볼륨 / 재생 중이던 스테이션 / pause 상태 복원"""
+    set_volume(state, state.current_volume)
+    playing, url, generation = state.snapshot("is_playing", "play_url", "play_generation")
+    # 그 사이 들어온 재생 요청이 있으면 그쪽이 새 mpv 에 loadfile 함
+    if playing and url and load_if_current(state, url, generation) is not None:
+        with state.lock:
+            state.play_started_at = time.time()
+            state.play_generation += 1
+    if state.paused:
+        mpv_cmd(state, {"command": ["set_property", "pause", True]})
+
+
 def stop_playback(state) -> None:
     if mpv_cmd(state, {"command": ["stop"]}):
-        state.is_playing = False
-        state.audio_playing = False
+        state.update(is_playing=False, audio_playing=False)
         print("⏹️  재생 중지")
     else:
         print("⚠️  stop 실패")
 
 
+def load_url(state, url: str) -> bool:
+    """현재 스트림을 url 로 교체 (릴레이 사용 시 로컬 주소로 변환). state 는 mpv_sock / relay 를 가진 객체."""
+    if state.relay is not None:
+        url = state.relay.local_url(url)
+    return mpv_cmd(state, {"command": ["loadfile", url, "replace"]})
+
+
+def load_if_current(state, url: str, generation: int) -> Optional[bool]:
+    """
+    재생 스레드 밖(스트림 감시 재연결 / mpv 재시작 복원)에서 url 다시 열기.
+    반환: load_url 결과 / None 재생 요청이 대기 · 처리 중이거나 그 사이 채널이 바뀜 (play_generation) → 보내지 않음
+    """
+    global _loading
+    with _play_cond:
+        if _loading or state.play_request is not None or state.play_generation != generation:
+            return None
+        _loading = True
+    try:
+        return load_url(state, url)
+    finally:
+        with _play_cond:
+            _loading = False
+            _play_cond.notify_all()
+
+
+def _superseded(state, index: int) -> bool:
+    with _play_cond:
+        return state.play_request is not None and state.play_request != index
+
+
+def apply_buffering(state, target, url: str) -> None:
+    """스테이션별 버퍼 설정 (통계 기반, 다음 loadfile부터 적용). target 은 mpv_sock 을 가진 객체."""
+    if state.stream_stats is None:
+        return
+    cache, readahead, net_timeout = state.stream_stats.buffering_for(url)
+    mpv_cmd(target, {"command": ["set_property", "cache-secs", cache]})
+    mpv_cmd(target, {"command": ["set_property", "demuxer-readahead-secs", readahead]})
+    mpv_cmd(target, {"command": ["set_property", "network-timeout", net_timeout]})
+    print(f"   버퍼: cache={cache}s readahead={readahead}s timeout={net_timeout}s")
+
+
 def play_station(state, index: int) -> None:
     st = state.radio_stations[index]
     print(f"\n🎵 재생: {st['name']}")
-    # 채널 변경 시 audio_playing 즉시 False로
-    state.audio_playing = False
-    ok = mpv_cmd(state, {"command": ["loadfile", st["url"], "replace"]})
-    state.is_playing = bool(ok)
+    started = time.time()
+
+    if state.switcher is not None and state.switcher.can_handover(state):
+        # make-before-break: 새 스트림 소리가 날 때까지 기존 스트림 유지
+        ok = state.switcher.handover(state, index)
+        if ok is None:
+            print(f"   ↷ 취소: {st['name']}")
+            return
+    else:
+        # 채널 변경 시 audio_playing 즉시 False로
+        if state.audio_playing and state.switcher is not None:
+            state.switcher.mark_cut()
+        state.audio_playing = False
+        apply_buffering(state, state, st["url"])
+
+        # 그 사이 다른 스테이션 요청이 들어왔으면 오래된 loadfile 은 보내지 않음
+        if _superseded(state, index):
+            print(f"   ↷ 취소: {st['name']}")
+            return
+
+        started = time.time()
+        ok = load_url(state, st["url"])
+
+    with state.lock:
+        state.is_playing = bool(ok)
+        state.play_generation += 1
+        state.play_index = index
+        state.play_url = st["url"]
+        state.play_name = st["name"]
+        state.play_started_at = started if ok else 0.0
+        state.last_paused_for_cache = False
     if not ok:
+        # mpv 가 loadfile 을 받지 못함 (IPC 끊김 등) → 스테이션 실패로 기록하지 않음.
+        # 스트림 실패는 mpv 가 연 뒤에: 소리가 안 나면 모니터, 열다가 오류면 스트림 상태 감시가 기록
         print("❌ 재생 실패")
 
 
+def request_play(state, index: int) -> None:
+    """재생 요청만 남기고 바로 반환. 대기 중인 요청은 최신 것으로 덮어씀."""
+    with _play_cond:
+        state.play_request = index
+        _play_cond.notify()
+
+
+def remap_play_request(state, old_to_new: Dict[int, int]) -> None:
+    """스테이션 목록이 바뀜 → 대기 중인 요청을 새 목록의 index 로 (목록에서 빠진 스테이션이면 취소)"""
+    with _play_cond:
+        if state.play_request is not None:
+            state.play_request = old_to_new.get(state.play_request)
+
+
+def _play_worker_thread(state) -> None:
+    global _loading
+    while not state.shutting_down:
+        with _play_cond:
+            # load_if_current 가 보내는 중이면 끝난 뒤에 (새 스테이션이 옛 주소로 덮이지 않도록)
+            while (state.play_request is None or _loading) and not state.shutting_down:
+                _play_cond.wait(timeout=0.5)
+            index = state.play_request
+            state.play_request = None
+            _loading = index is not None
+        try:
+            if index is not None and not state.shutting_down:
+                play_station(state, index)
+        finally:
+            with _play_cond:
+                _loading = False
+
+
+def start_play_worker(state) -> threading.Thread:
+    t = threading.Thread(target=_play_worker_thread, args=(state,), daemon=True)
+    t.start()
+    return t
+
+
 def set_volume(state, volume: int) -> int:
     volume = max(0, min(100, volume))
     mpv_cmd(state, {"command": ["set_property", "volume", volume]})
@@ -154,10 +394,25 @@ def shutdown_player(state) -> None:
     state.shutting_down = True
     state.audio_playing = False
 
+    for proc in (state.player_process, state.standby_process):
+        try:
+            if proc:
+                proc.terminate()
+                proc.wait(timeout=2)
+        except Exception:
+            pass
+
+    try:
+        if state.stream_stats is not None:
+            state.stream_stats.close()
+            state.stream_stats = None
+    except Exception:
+        pass
+
     try:
-        if state.player_process:
-            state.player_process.terminate()
-            state.player_process.wait(timeout=2)
+        if state.relay is not None:
+            state.relay.stop()
+            state.relay = None
     except Exception:
         pass
 
@@ -0,0 +1,324 @@
+"""
+로컬 스트림 릴레이.
+원격 스트림 연결을 미리 열어두고 최근 몇 초를 링버퍼에 보관 →
+mpv는 http://127.0.0.1:<port>/s/<id> 에서 재생하므로 채널 전환 시 버퍼 내용이 즉시 전달됨.
+"""
+import re
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+DEFAULT_KBPS = 128
+_ICY_TITLE_RE = re.compile(rb"StreamTitle='(.*?)';", re.S)
+_FORWARD_HEADERS = ("icy-name", "icy-genre", "icy-br", "icy-description", "icy-url")
+
+
+class RingBuffer:
+    """고정 크기 바이트 링버퍼. 절대 오프셋(written)으로 위치를 추적."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self.written = 0
+
+    def write(self, data: bytes) -> None:
+        n = len(data)
+        if n >= self.capacity:
+            data = data[-self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+        pos = self.written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._buf[pos:pos + first] = data[:first]
+        if first < n:
+            self._buf[:n - first] = data[first:]
+        self.written += n
+
+    def oldest(self) -> int:
+        return max(0, self.written - self.capacity)
+
+    def read_from(self, offset: int) -> bytes:
+        """offset 이후 데이터 반환 (이미 밀려난 구간은 건너뜀)"""
+        offset = max(offset, self.oldest())
+        n = self.written - offset
+        if n <= 0:
+            return b""
+        pos = offset % self.capacity
+        first = min(n, self.capacity - pos)
+        out = bytes(self._buf[pos:pos + first])
+        if first < n:
+            out += bytes(self._buf[:n - first])
+        return out
+
+
+class _Channel:
+    def __init__(self, relay: "StreamRelay", cid: int, url: str):
+        self.relay = relay
+        self.id = cid
+        self.url = url
+        self.cond = threading.Condition()
+        self.ring: Optional[RingBuffer] = None
+        self.headers: Dict[str, str] = {}
+        self.content_type = "audio/mpeg"
+        self.title = ""
+        self.clients = 0
+        self.last_used = time.time()
+        self.closed = False
+        self.thread = threading.Thread(target=self._upstream_loop, daemon=True)
+
+    # --- upstream ---
+    def _upstream_loop(self) -> None:
+        backoff = 0.5
+        while not self.closed:
+            try:
+                self._read_upstream()
+                backoff = 0.5
+            except Exception as e:
+                if self.closed:
+                    break
+                print(f"⚠️  릴레이 업스트림 오류: {self.url} - {str(e)[:50]}")
+            if self.closed:
+                break
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 8.0)
+
+    def _read_upstream(self) -> None:
+        req = urllib.request.Request(self.url, headers={"Icy-MetaData": "1", "User-Agent": "wr-radio"})
+        with urllib.request.urlopen(req, timeout=self.relay.network_timeout) as resp:
+            headers = {k.lower(): v for k, v in resp.headers.items()}
+            metaint = int(headers.get("icy-metaint", "0") or 0)
+            try:
+                kbps = int(headers.get("icy-br", "").split(",")[0])
+            except ValueError:
+                kbps = DEFAULT_KBPS
+
+            with self.cond:
+                self.headers = {k: headers[k] for k in _FORWARD_HEADERS if k in headers}
+                self.content_type = headers.get("content-type", "audio/mpeg")
+                if self.ring is None:
+                    self.ring = RingBuffer(self.relay.capacity_for(kbps))
+
+            since_meta = 0
+            while not self.closed:
+                want = 4096
+                if metaint:
+                    want = min(want, metaint - since_meta)
+                data = resp.read(want)
+                if not data:
+                    return
+                self._publish(data)
+
+                if metaint:
+                    since_meta += len(data)
+                    if since_meta == metaint:
+                        since_meta = 0
+                        self._skip_metadata(resp)
+
+    def _skip_metadata(self, resp) -> None:
+        # ICY 메타데이터 블록 제거 (오디오 버퍼에 섞이지 않도록)
+        size = resp.read(1)
+        if not size:
+            return
+        length = size[0] * 16
+        meta = b""
+        while len(meta) < length:
+            part = resp.read(length - len(meta))
+            if not part:
+                return
+            meta += part
+        m = _ICY_TITLE_RE.search(meta)
+        if m:
+            self.title = m.group(1).decode("utf-8", "replace")
+
+    def _publish(self, data: bytes) -> None:
+        with self.cond:
+            if self.ring is not None:
+                self.ring.write(data)
+            self.cond.notify_all()
+
+    # --- downstream ---
+    def stream_to(self, wfile) -> None:
+        with self.cond:
+            self.clients += 1
+            self.last_used = time.time()
+            # 버퍼에 쌓인 최근 데이터부터 바로 전송
+            offset = self.ring.oldest() if self.ring else 0
+        try:
+            while not self.closed:
+                with self.cond:
+                    while not self.closed and (self.ring is None or self.ring.written <= offset):
+                        self.cond.wait(timeout=1.0)
+                    if self.closed:
+                        break
+                    data = self.ring.read_from(offset)
+                    offset = self.ring.written
+                wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.cond:
+                self.clients -= 1
+                self.last_used = time.time()
+
+    def close(self) -> None:
+        self.closed = True
+        with self.cond:
+            self.cond.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        relay: "StreamRelay" = self.server.relay  # type: ignore[attr-defined]
+        m = re.match(r"^/s/(\d+)$", self.path)
+        ch = relay.channel_by_id(int(m.group(1))) if m else None
+        if ch is None:
+            self.send_error(404)
+            return
+
+        # 헤더가 올 때까지 잠깐 대기 (첫 연결일 때만 해당)
+        with ch.cond:
+            deadline = time.time() + relay.network_timeout
+            while ch.ring is None and not ch.closed and time.time() < deadline:
+                ch.cond.wait(timeout=0.1)
+            headers = dict(ch.headers)
+            content_type = ch.content_type
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        ch.stream_to(self.wfile)
+
+
+class StreamRelay:
+    """
+    - buffer_sec: 스트림별 보관할 최근 오디오 길이 (icy-br 기준으로 바이트 환산)
+    - max_streams: 동시에 열어둘 업스트림 수 (최근 사용 순으로 유지)
+    - max_total_bytes: 전체 링버퍼 메모리 상한
+    """
+
+    def __init__(
+        self,
+        buffer_sec: float = 5.0,
+        max_streams: int = 3,
+        max_total_bytes: int = 2 * 1024 * 1024,
+        network_timeout: float = 3.0,
+        port: int = 0,
+    ):
+        self.buffer_sec = buffer_sec
+        self.max_streams = max(1, max_streams)
+        self.max_total_bytes = max_total_bytes
+        self.network_timeout = network_timeout
+
+        self._lock = threading.Lock()
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._by_id: Dict[int, _Channel] = {}
+        self._next_id = 1
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.relay = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def capacity_for(self, kbps: int) -> int:
+        per_stream = self.max_total_bytes // self.max_streams
+        return max(16 * 1024, min(per_stream, int(self.buffer_sec * kbps * 1000 / 8)))
+
+    def start(self) -> "StreamRelay":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"🔁 스트림 릴레이 시작 (127.0.0.1:{self.port})")
+        return self
+
+    def stop(self) -> None:
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+            self._by_id.clear()
+        for ch in channels:
+            ch.close()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def channel_by_id(self, cid: int) -> Optional[_Channel]:
+        with self._lock:
+            return self._by_id.get(cid)
+
+    def warm(self, url: str) -> _Channel:
+        """업스트림 연결을 열어두기만 함 (최근 사용 순서 갱신)"""
+        with self._lock:
+            ch = self._channels.get(url)
+            if ch is not None and not ch.closed:
+                self._channels.move_to_end(url)
+                ch.last_used = time.time()
+                return ch
+
+            ch = _Channel(self, self._next_id, url)
+            self._next_id += 1
+            self._channels[url] = ch
+            self._by_id[ch.id] = ch
+            evicted = self._evict_locked()
+        for old in evicted:
+            old.close()
+        ch.thread.start()
+        return ch
+
+    def local_url(self, url: str) -> str:
+        ch = self.warm(url)
+        return f"http://127.0.0.1:{self.port}/s/{ch.id}"
+
+    def buffered_bytes(self) -> int:
+        with self._lock:
+            return sum(ch.ring.capacity for ch in self._channels.values() if ch.ring)
+
+    def _evict_locked(self):
+        evicted = []
+        # 스트림 수 / 메모리 상한 초과 시 오래된 채널부터 닫음 (재생 중인 채널은 유지)
+        while len(self._channels) > self.max_streams or self._reserved_locked() > self.max_total_bytes:
+            victim = None
+            for ch in self._channels.values():
+                if ch.clients == 0:
+                    victim = ch
+                    break
+            if victim is None or victim is next(reversed(self._channels.values())):
+                break
+            del self._channels[victim.url]
+            self._by_id.pop(victim.id, None)
+            evicted.append(victim)
+        return evicted
+
+    def _reserved_locked(self) -> int:
+        return sum(
+            ch.ring.capacity if ch.ring else self.capacity_for(DEFAULT_KBPS)
+            for ch in self._channels.values()
+        )
+
+
+def create_relay(cfg: Dict) -> Optional[StreamRelay]:
+    """config.json 의 "stream_relay" 항목으로 릴레이 생성 (enabled가 아니면 None)"""
+    opts = cfg.get("stream_relay") or {}
+    if not opts.get("enabled"):
+        return None
+    try:
+        return StreamRelay(
+            buffer_sec=float(opts.get("buffer_sec", 5.0)),
+            max_streams=int(opts.get("max_streams", 3)),
+            max_total_bytes=int(opts.get("max_total_kb", 2048)) * 1024,
+            port=int(opts.get("port", 0)),
+        ).start()
+    except Exception as e:
+        print(f"⚠️  스트림 릴레이 시작 실패: {e}")
+        return None
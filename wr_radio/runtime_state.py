@@ -0,0 +1,145 @@
+"""
+실행 중 바뀌는 값(마지막 스테이션 / 볼륨 / 밝기)을 config.json 과 분리해 저장.
+- 스테이션 목록이 든 config.json 은 다시 쓰지 않음 → 저장 중 전원이 나가도 스테이션 목록은 안전
+- 작은 JSON 한 줄을 임시 파일 + rename 으로 원자적으로 씀
+- 연속 변경은 min_interval_sec 에 한 번으로 합침
+- staging_dir (tmpfs, 예: /dev/shm) 을 주면 변경은 즉시 그곳에만 쓰고, SD 카드에는 flush_interval_sec 마다 / 종료 시에만
+- fsync 정책: "always" (쓸 때마다) / "shutdown" (종료 시 마지막 쓰기만) / "never"
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config import CONFIG_FILE, atomic_write_bytes
+
+RUNTIME_STATE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), "runtime_state.json")
+FSYNC_POLICIES = ("always", "shutdown", "never")
+
+FIELDS = ("station", "volume", "brightness")
+# 예전 방식 (config.json 에 저장하던 값) 과 기본값: runtime_state.json 에 없는 값은 여기서
+LEGACY_KEYS = {"station": ("last_station", 0), "volume": ("last_volume", 50), "brightness": ("last_brightness", 100)}
+
+
+class RuntimeStateFile:
+    def __init__(self, path: str = RUNTIME_STATE_FILE, fsync: str = "always", min_interval: float = 10.0,
+                 staging_dir: str = "", flush_interval: float = 300.0):
+        if fsync not in FSYNC_POLICIES:
+            print(f"⚠️  알 수 없는 fsync 정책 '{fsync}' → always")
+            fsync = "always"
+        self.path = path
+        self.fsync = fsync
+        self.min_interval = min_interval
+        self.staging = os.path.join(staging_dir, os.path.basename(path)) if staging_dir else ""
+        self.flush_interval = flush_interval
+
+        self.values: Dict[str, Any] = {}
+        self._persisted: Dict[str, Any] = {}   # SD 카드에 마지막으로 쓴 값
+        self._staged: Dict[str, Any] = {}
+        self._last_persist = 0.0
+        self._lock = threading.Lock()
+
+        self.writes = 0          # SD 카드 쓰기 횟수
+        self.bytes_written = 0
+        self.fsyncs = 0
+        self.staged_writes = 0   # tmpfs 쓰기 (디스크 마모 없음)
+
+    # --- 읽기 ---
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️  실행 상태 로드 실패: {path} - {e}")
+            return None
+        return raw if isinstance(raw, dict) else None
+
+    def load(self, cfg: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        저장된 값. tmpfs 에 더 최근 값이 남아 있으면 (프로그램만 죽고 재부팅은 안 된 경우) 그것을 사용.
+        cfg 를 주면 파일에 없는 값은 config.json 의 last_* 값 (그것도 없으면 기본값) 으로 채워 반환
+        """
+        data = self._read(self.path) or {}
+        self._persisted = {k: data[k] for k in FIELDS if k in data}
+        if self.staging:
+            staged = self._read(self.staging)
+            if staged and float(staged.get("t", 0)) > float(data.get("t", 0)):
+                data = staged
+        self.values = {k: data[k] for k in FIELDS if k in data}
+        self._staged = dict(self.values)
+        self._last_persist = time.time()
+        out = dict(self.values)
+        if cfg is not None:
+            for k, (legacy, default) in LEGACY_KEYS.items():
+                out.setdefault(k, cfg.get(legacy, default))
+        return out
+
+    # --- 쓰기 ---
+    def _encode(self) -> bytes:
+        obj = dict(self.values)
+        obj["t"] = round(time.time(), 1)
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def update(self, **values: Any) -> None:
+        """값 변경 (디바운스 후 호출). SD 카드 쓰기는 maybe_flush / flush 에서"""
+        with self._lock:
+            self.values.update({k: v for k, v in values.items() if k in FIELDS})
+            if self.staging and self.values != self._staged:
+                try:
+                    atomic_write_bytes(self.staging, self._encode(), fsync=False)
+                    self._staged = dict(self.values)
+                    self.staged_writes += 1
+                except OSError as e:
+                    print(f"⚠️  실행 상태 임시 저장 실패: {e}")
+
+    def dirty(self) -> bool:
+        return self.values != self._persisted
+
+    def maybe_flush(self) -> bool:
+        """메인 루프에서 자주 불러도 됨: 바뀐 값이 있고 간격이 지났을 때만 씀"""
+        interval = self.flush_interval if self.staging else self.min_interval
+        if not self.dirty() or time.time() - self._last_persist < interval:
+            return False
+        return self.flush()
+
+    def flush(self, shutdown: bool = False) -> bool:
+        with self._lock:
+            if not self.dirty():
+                return False
+            data = self._encode()
+            sync = self.fsync == "always" or (shutdown and self.fsync == "shutdown")
+            try:
+                atomic_write_bytes(self.path, data, fsync=sync)
+            except OSError as e:
+                print(f"⚠️  실행 상태 저장 실패: {e}")
+                return False
+            self._persisted = dict(self.values)
+            self._last_persist = time.time()
+            self.writes += 1
+            self.bytes_written += len(data)
+            if sync:
+                self.fsyncs += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "fsyncs": self.fsyncs,
+            "staged_writes": self.staged_writes,
+        }
+
+
+def open_runtime_state(cfg: Dict) -> RuntimeStateFile:
+    """config.json 의 "runtime_state" 항목"""
+    opts = cfg.get("runtime_state") or {}
+    return RuntimeStateFile(
+        path=opts.get("file", RUNTIME_STATE_FILE),
+        fsync=opts.get("fsync", "always"),
+        min_interval=float(opts.get("min_interval_sec", 10)),
+        staging_dir=opts.get("staging_dir", ""),
+        flush_interval=float(opts.get("flush_interval_sec", 300)),
+    )
@@ -0,0 +1,104 @@
+"""
+구면 위 가장 가까운 점 찾기 (KD-tree).
+위경도를 단위 구 위의 3차원 점으로 바꿔 넣는다. 3차원 직선 거리(chord)는 대원 거리와 순서가 같으므로
+경도 ±180° 경계나 고위도에서도 가장 가까운 점이 맞다.
+트리는 배열(array) 에 암묵적으로 저장 (slice 중앙값이 노드) → 포인터 객체 없이 작고 빠름.
+"""
+import heapq
+import math
+from array import array
+from typing import Iterable, List, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    la, lo = math.radians(lat), math.radians(lon)
+    c = math.cos(la)
+    return c * math.cos(lo), c * math.sin(lo), math.sin(la)
+
+
+def chord_to_km(d2: float) -> float:
+    """단위 구 위 직선 거리의 제곱 → 대원 거리 (km)"""
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(d2) / 2.0))
+
+
+class SphereTree:
+    """points: (위도, 경도) 목록. 결과는 points 안의 위치(번호)로 돌려줌"""
+
+    def __init__(self, points: Iterable[Tuple[float, float]]):
+        pts = [(*unit_vector(lat, lon), i) for i, (lat, lon) in enumerate(points)]
+        # [lo, hi) 구간을 축(depth % 3) 기준으로 정렬하고 중앙값을 mid 에 두는 것을 반복
+        stack = [(0, len(pts), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= 1:
+                continue
+            pts[lo:hi] = sorted(pts[lo:hi], key=lambda p: p[axis])
+            mid = (lo + hi) // 2
+            nxt = (axis + 1) % 3
+            stack.append((lo, mid, nxt))
+            stack.append((mid + 1, hi, nxt))
+
+        self.xs = array("d", (p[0] for p in pts))
+        self.ys = array("d", (p[1] for p in pts))
+        self.zs = array("d", (p[2] for p in pts))
+        self.ids = array("I", (p[3] for p in pts))
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def nearest(self, lat: float, lon: float) -> Tuple[int, float]:
+        """(번호, km). 빈 트리면 (-1, inf)"""
+        found = self.nearest_k(lat, lon, 1)
+        if not found:
+            return -1, math.inf
+        return found[0][1], found[0][0]
+
+    def nearest_k(self, lat: float, lon: float, k: int) -> List[Tuple[float, int]]:
+        """가까운 순 [(km, 번호), ...] 최대 k개"""
+        if k <= 0 or not self.xs:
+            return []
+        qx, qy, qz = unit_vector(lat, lon)
+        q = (qx, qy, qz)
+        xs, ys, zs = self.xs, self.ys, self.zs
+        coords = (xs, ys, zs)
+        heap: List[Tuple[float, int]] = []   # (-d2, 배열 위치) - 가장 먼 후보가 맨 앞
+        worst = 5.0  # 단위 구 위 최대 거리² 는 4
+        stack = [(0, len(xs), 0, 0.0)]
+        while stack:
+            lo, hi, axis, bound = stack.pop()
+            if lo >= hi or bound >= worst:
+                continue
+            mid = (lo + hi) // 2
+            dx, dy, dz = xs[mid] - qx, ys[mid] - qy, zs[mid] - qz
+            d2 = dx * dx + dy * dy + dz * dz
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, mid))
+                if len(heap) == k:
+                    worst = -heap[0][0]
+            elif d2 < worst:
+                heapq.heapreplace(heap, (-d2, mid))
+                worst = -heap[0][0]
+            diff = q[axis] - coords[axis][mid]
+            nxt = axis + 1 if axis < 2 else 0
+            far = diff * diff
+            # 먼 쪽을 먼저 넣고 가까운 쪽을 나중에 (먼저 꺼내 탐색)
+            if diff < 0:
+                stack.append((mid + 1, hi, nxt, far))
+                stack.append((lo, mid, nxt, 0.0))
+            else:
+                stack.append((lo, mid, nxt, far))
+                stack.append((mid + 1, hi, nxt, 0.0))
+        ids = self.ids
+        return sorted((chord_to_km(-nd2), ids[pos]) for nd2, pos in heap)
+
+    def nearest_linear(self, lat: float, lon: float) -> Tuple[int, float]:
+        """트리 없이 전부 비교 (벤치마크 / 검증용)"""
+        qx, qy, qz = unit_vector(lat, lon)
+        best_d2, best = 5.0, -1
+        for x, y, z, i in zip(self.xs, self.ys, self.zs, self.ids):
+            d2 = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+            if d2 < best_d2:
+                best_d2, best = d2, i
+        return best, chord_to_km(best_d2)
@@ -0,0 +1,331 @@
+"""
+로컬 가짜 MP3 스트림 서버 / 가짜 날씨 API 서버.
+인터넷 없이 relay / player / weather 동작을 확인하기 위한 용도 (무음 MP3 프레임을 실시간 속도로 송출).
+"""
+import hashlib
+import json
+import math
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, joint stereo, 패딩 없음 → 417바이트 / 1152샘플
+_FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_SIZE = 417
+FRAME_SEC = 1152 / 44100
+SILENT_FRAME = _FRAME_HEADER + bytes(FRAME_SIZE - len(_FRAME_HEADER))
+BITRATE_KBPS = 128
+
+
+def _icy_meta_block(title: str) -> bytes:
+    text = f"StreamTitle='{title}';".encode("utf-8")
+    blocks = (len(text) + 15) // 16
+    return bytes([blocks]) + text.ljust(blocks * 16, b"\0")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        srv: "StandinServer" = self.server.standin  # type: ignore[attr-defined]
+        name = self.path.lstrip("/").split("?")[0]
+        with srv.lock:
+            srv.connections[name] = srv.connections.get(name, 0) + 1
+
+        if srv.first_byte_delay > 0:
+            time.sleep(srv.first_byte_delay)
+
+        want_meta = self.headers.get("Icy-MetaData") == "1" and srv.icy_metaint > 0
+
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("icy-name", name or "standin")
+        self.send_header("icy-br", str(BITRATE_KBPS))
+        if want_meta:
+            self.send_header("icy-metaint", str(srv.icy_metaint))
+        self.end_headers()
+
+        sent = 0
+        since_meta = 0
+        start = time.time()
+        frames = 0
+        try:
+            while not srv.stopped:
+                data = SILENT_FRAME
+                if want_meta:
+                    out = b""
+                    while data:
+                        room = srv.icy_metaint - since_meta
+                        out += data[:room]
+                        since_meta += len(data[:room])
+                        data = data[room:]
+                        if since_meta == srv.icy_metaint:
+                            out += _icy_meta_block(name)
+                            since_meta = 0
+                    data = out
+                self.wfile.write(data)
+                sent += FRAME_SIZE
+                frames += 1
+
+                if srv.drop_after_bytes and sent >= srv.drop_after_bytes:
+                    # 연결 끊김 흉내
+                    break
+
+                # 실시간 속도 유지 (speed배)
+                ahead = frames * FRAME_SEC / srv.speed - (time.time() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class StandinServer:
+    """
+    http://127.0.0.1:<port>/<name>.mp3 로 무한 MP3 스트림 제공.
+    - icy_metaint: 클라이언트가 Icy-MetaData: 1 을 보내면 ICY 메타데이터 삽입
+    - drop_after_bytes: 이만큼 보낸 뒤 연결을 끊음 (0이면 끊지 않음)
+    - first_byte_delay: 응답 전 지연 (느린 원격 서버 흉내)
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        icy_metaint: int = 8192,
+        drop_after_bytes: int = 0,
+        first_byte_delay: float = 0.0,
+        speed: float = 1.0,
+    ):
+        self.icy_metaint = icy_metaint
+        self.drop_after_bytes = drop_after_bytes
+        self.first_byte_delay = first_byte_delay
+        self.speed = speed
+        self.stopped = False
+        self.lock = threading.Lock()
+        self.connections: Dict[str, int] = {}
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def url(self, name: str = "standin.mp3") -> str:
+        return f"http://127.0.0.1:{self.port}/{name}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopped = True
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class _WeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        # 헤더와 본문을 따로 보내므로 Nagle 을 끄지 않으면 keep-alive 연결에서 지연 ACK(~40ms)를 기다림
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        srv: "WeatherStandin" = self.server.standin  # type: ignore[attr-defined]
+        with srv.lock:
+            srv.connections += 1
+        if srv.connect_delay > 0:
+            # 새 연결마다 드는 DNS / TCP / TLS 비용 흉내
+            time.sleep(srv.connect_delay)
+
+    def do_GET(self):
+        srv: "WeatherStandin" = self.server.standin  # type: ignore[attr-defined]
+        with srv.lock:
+            srv.requests += 1
+            n = srv.requests
+        if srv.response_delay > 0:
+            time.sleep(srv.response_delay)
+
+        if srv.fail_every and n % srv.fail_every == 0:
+            self._reply(503, b"", {"Retry-After": "0"})
+            return
+
+        u = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(u.query).items()}
+        if u.path == "/data/2.5/forecast":
+            with srv.lock:
+                srv.forecast_requests += 1
+            body = json.dumps(srv.forecast_payload(float(q.get("lat", 0)), float(q.get("lon", 0)))).encode("utf-8")
+            self._reply(200, body, {"Content-Type": "application/json; charset=utf-8"})
+            return
+        if u.path == "/v1/forecast":
+            # Open-Meteo 형식: 쉼표로 구분된 여러 좌표 → 배열 (좌표 1개면 객체)
+            with srv.lock:
+                srv.bulk_requests += 1
+            lats = [float(v) for v in q.get("latitude", "0").split(",")]
+            lons = [float(v) for v in q.get("longitude", "0").split(",")]
+            hourly = "hourly" in q
+            rows = [srv.bulk_payload(lat, lon, hourly) for lat, lon in zip(lats, lons)]
+            body = json.dumps(rows if len(rows) > 1 else rows[0]).encode("utf-8")
+            self._reply(200, body, {"Content-Type": "application/json; charset=utf-8"})
+            return
+        body = json.dumps(srv.payload(float(q.get("lat", 0)), float(q.get("lon", 0)))).encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest()[:16] + '"'
+        headers = {"ETag": etag, "Cache-Control": f"max-age={srv.max_age}"}
+        if self.headers.get("If-None-Match") == etag:
+            with srv.lock:
+                srv.not_modified += 1
+            self._reply(304, b"", headers)
+            return
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        self._reply(200, body, headers)
+
+    def _reply(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+class WeatherStandin:
+    """
+    http://127.0.0.1:<port>/data/2.5/weather 로 OpenWeather 형식 응답,
+    http://127.0.0.1:<port>/data/2.5/forecast 로 3시간 간격 예보,
+    http://127.0.0.1:<port>/v1/forecast 로 Open-Meteo 형식 다중 좌표 응답 (hourly 포함 가능).
+    - ETag / Cache-Control: max-age 헤더, If-None-Match 가 맞으면 304
+    - connect_delay: 새 연결마다 지연 (핸드셰이크 비용 흉내)
+    - response_delay: 요청마다 지연
+    - fail_every: N번째 요청마다 503 (재시도 확인용, 0이면 없음)
+    - 기온은 좌표별 하루 주기 사인파 (예보와 현재 값이 같은 모델), 현재 값은 epoch_sec 단위로 고정
+    - clock: 현재 시각 함수 (벤치마크에서 시간을 빨리 돌릴 때)
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        connect_delay: float = 0.0,
+        response_delay: float = 0.0,
+        fail_every: int = 0,
+        max_age: int = 600,
+        epoch_sec: float = 600.0,
+        clock=time.time,
+    ):
+        self.connect_delay = connect_delay
+        self.response_delay = response_delay
+        self.fail_every = fail_every
+        self.max_age = max_age
+        self.epoch_sec = epoch_sec
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.bulk_requests = 0
+        self.forecast_requests = 0
+        self.not_modified = 0
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _WeatherHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self  # type: ignore[attr-defined]
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/data/2.5/weather"
+
+    _ICONS = ["01", "02", "03", "04", "09", "10", "13"]
+    _WMO = [0, 1, 2, 3, 61, 71, 95]
+
+    def temp_at(self, lat: float, lon: float, t: float) -> float:
+        return round(15 - abs(lat) / 10 + 6 * math.sin(2 * math.pi * t / 86400 + lon / 10), 2)
+
+    def _icon_index(self, lat: float, lon: float, t: float) -> int:
+        return int(abs(lat * 7 + lon * 3) + t // 21600) % len(self._ICONS)  # 6시간마다 바뀜
+
+    def payload(self, lat: float, lon: float) -> Dict:
+        t = self.clock() // self.epoch_sec * self.epoch_sec
+        return {
+            "coord": {"lat": lat, "lon": lon},
+            "main": {"temp": self.temp_at(lat, lon, t)},
+            "weather": [{"icon": self._ICONS[self._icon_index(lat, lon, t)] + "d"}],
+        }
+
+    def forecast_payload(self, lat: float, lon: float) -> Dict:
+        start = self.clock() // 10800 * 10800
+        return {
+            "list": [
+                {
+                    "dt": int(start + i * 10800),
+                    "main": {"temp": self.temp_at(lat, lon, start + i * 10800)},
+                    "weather": [{"icon": self._ICONS[self._icon_index(lat, lon, start + i * 10800)] + "d"}],
+                }
+                for i in range(40)
+            ]
+        }
+
+    @property
+    def bulk_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1/forecast"
+
+    def bulk_payload(self, lat: float, lon: float, hourly: bool = False) -> Dict:
+        t = self.clock() // self.epoch_sec * self.epoch_sec
+        row = {
+            "latitude": round(lat, 2),
+            "longitude": round(lon, 2),
+            "current": {"temperature_2m": self.temp_at(lat, lon, t), "weather_code": self._WMO[self._icon_index(lat, lon, t)]},
+        }
+        if hourly:
+            start = self.clock() // 3600 * 3600
+            times = [start + i * 3600 for i in range(48)]
+            row["hourly"] = {
+                "time": [int(x) for x in times],
+                "temperature_2m": [self.temp_at(lat, lon, x) for x in times],
+                "weather_code": [self._WMO[self._icon_index(lat, lon, x)] for x in times],
+            }
+        return row
+
+    def start(self) -> "WeatherStandin":
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python3 -m wr_radio.standin")
+    ap.add_argument("--weather", action="store_true", help="가짜 날씨 API 서버 (weather_provider: standin)")
+    ap.add_argument("--port", type=int, default=0, help="기본: MP3 8765 / 날씨 8766")
+    args = ap.parse_args()
+
+    if args.weather:
+        srv = WeatherStandin(port=args.port or 8766).start()
+        print(f"🌤️  가짜 날씨 API: {srv.url}")
+    else:
+        srv = StandinServer(port=args.port or 8765).start()
+        print(f"🎙️  가짜 스트림: {srv.url()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        srv.stop()
@@ -1,16 +1,45 @@
 from __future__ import annotations
+import queue
+import sys
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
-@dataclass
+# 바뀌면 구독자에게 알리는 필드 (나머지 필드는 그냥 값)
+OBSERVED_FIELDS = frozenset({
+    "radio_stations", "current_index", "current_mode",
+    "current_volume", "current_brightness", "is_playing", "audio_playing",
+})
+_MISSING = object()
+_NOTHING: FrozenSet[str] = frozenset()
+_setattr = object.__setattr__
+
+# __slots__ 는 Python 3.10+ (dataclass slots=True). 그 이전에서는 일반 dataclass
+_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+@_dataclass
 class AppState:
+    """
+    여러 스레드(메인 루프 / 재생 / 소리 감시 / 날씨)가 함께 쓰는 상태.
+    OBSERVED_FIELDS 에 값을 쓰면 변경 표시만 남기고, 메인 루프의 dispatch() 가 그 필드를 구독한 함수를 호출
+    (그리는 일은 항상 메인 스레드에서). 여러 필드를 함께 바꿀 때는 update() 또는 with state.lock 으로 한 번에.
+    """
+    # 변경 알림 (맨 앞: __init__ 에서 다른 필드보다 먼저 만들어짐)
+    lock: Any = field(default_factory=threading.RLock, init=False, repr=False, compare=False)  # 여러 필드를 함께 바꿀 때 with state.lock
+    _changed: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _subscribers: List[Tuple[FrozenSet[str], Callable]] = field(default_factory=list, init=False, repr=False, compare=False)
+
     # config / stations
-    radio_stations: List[Dict[str, Any]] = field(default_factory=list)
+    radio_stations: Any = field(default_factory=list)  # StationStore (bench 등에서는 dict 목록도 가능)
     current_index: int = 0
+    station_nav: Any = None          # StationNav (이름 / 나라 / 가까운 곳 이동 색인)
+    config_watcher: Any = None       # ConfigWatcher (config.json 변경 시 스테이션 목록 다시 읽기)
 
     # runtime flags
     is_playing: bool = False
-    current_mode: str = "normal"  # 'normal', 'volume', 'brightness'
+    paused: bool = False             # mpv pause 프로퍼티 (재시작 시 복원용)
+    current_mode: str = "normal"  # 'normal', 'volume', 'brightness', 'nav_name', 'nav_country', 'nav_nearby'
 
     # mode values
     current_volume: int = 50
@@ -21,33 +50,114 @@ class AppState:
     enable_weather: bool = False
     openweather_api_key: str = ""
     weather_cache: Dict[str, Tuple[float, Dict[str, int]]] = field(default_factory=dict)
+    weather_scheduler: Any = None   # WeatherScheduler (config "weather_scheduler")
+    weather_store: Any = None       # WeatherCacheFile (재시작 후에도 유지되는 날씨 캐시)
+    weather_events: "queue.Queue[str]" = field(default_factory=lambda: queue.Queue(maxsize=64))  # 갱신된 캐시 키
 
     # display cache
-    last_displayed_index: int = -1
-    last_displayed_playing: Optional[bool] = None
+    last_displayed_weather: Optional[Dict[str, int]] = None
     animation_frame: int = 0
-    animation_cleared: bool = False  # 애니메이션 영역 지우기 완료 여부
 
     # audio monitoring
     audio_playing: bool = False      # 실제 소리 나는 중 (폴링 스레드가 세팅)
     shutting_down: bool = False      # 종료 신호 (폴링 스레드 정지용)
 
+    # stream stats (현재 재생 중인 스테이션 기준)
+    play_generation: int = 0         # play_station 호출마다 증가 (감시 스레드 초기화용)
+    play_index: int = 0              # -1: 다시 읽은 목록에서 빠짐 (play_url 은 그대로)
+    play_url: str = ""
+    play_name: str = ""
+    play_started_at: float = 0.0     # loadfile 보낸 시각 (첫 소리 나면 0으로)
+    last_paused_for_cache: bool = False
+
     # save
     needs_save: bool = False
+    runtime_state: Any = None       # RuntimeStateFile (마지막 스테이션 / 볼륨 / 밝기)
     last_change_time: float = 0.0
 
     # pending actions
     pending_play: bool = False
+    play_request: Optional[int] = None   # 재생 스레드가 처리할 최신 요청 (player.request_play)
     last_station_change_time: float = 0.0
 
     # input bookkeeping
     last_input_time: float = 0.0
-    last_updated_index: int = -1
 
     # handles
     spi: Any = None
     pwm_backlight: Any = None
     player_process: Any = None
+    relay: Any = None               # StreamRelay (config "stream_relay" 사용 시)
+    stream_stats: Any = None        # StatsStore (config "adaptive_buffering")
+    stream_health: Any = None       # StreamHealth (config "stream_health")
+    mpv_supervisor: Any = None      # MpvSupervisor
+    level_feed: Any = None          # LevelFeed (config "visualizer")
+    switcher: Any = None            # Switcher (채널 전환 방식 / 무음 구간 측정)
+    standby_process: Any = None     # make-before-break 용 두 번째 mpv
 
     # mpv socket path
     mpv_sock: str = "/tmp/wr_mpv.sock"
+    mpv_sock_standby: str = "/tmp/wr_mpv_b.sock"
+
+    def __post_init__(self) -> None:
+        self._changed.clear()   # 생성 시 기본값은 변경이 아님
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # 필드 하나 쓰기는 lock 없이: 값을 먼저 쓰고 표시 (GIL 아래 set.add 는 원자적이고,
+        # dispatch 가 표시를 하나씩 pop 하므로 쓰는 도중 dispatch 가 돌아도 표시가 사라지지 않음)
+        if name in OBSERVED_FIELDS:
+            old = getattr(self, name, _MISSING)
+            _setattr(self, name, value)
+            if old != value:
+                self._changed.add(name)
+        else:
+            _setattr(self, name, value)
+
+    # --- 변경 알림 ---
+    def update(self, **values: Any) -> None:
+        """여러 필드를 한 번에 (다른 스레드의 update / snapshot 과 섞이지 않음)"""
+        with self.lock:
+            for name, value in values.items():
+                setattr(self, name, value)
+
+    def snapshot(self, *names: str) -> Tuple[Any, ...]:
+        """여러 필드를 한 번에 읽기 (update 도중 값이 섞이지 않음)"""
+        with self.lock:
+            return tuple(getattr(self, name) for name in names)
+
+    def subscribe(self, fields: Iterable[str], callback: Callable[["AppState", FrozenSet[str]], None]) -> None:
+        """fields 중 하나라도 바뀌면 dispatch() 때 callback(state, 바뀐 필드들)"""
+        fields = frozenset(fields)
+        unknown = fields - OBSERVED_FIELDS
+        if unknown:
+            raise ValueError(f"알림 대상이 아닌 필드: {sorted(unknown)}")
+        self._subscribers.append((fields, callback))
+
+    def mark_changed(self, *names: str) -> None:
+        """값은 같아도 바뀐 것으로 (다시 그리기 / 나중에 다시 처리)"""
+        self._changed.update(names)
+
+    def is_changed(self, name: str) -> bool:
+        """아직 dispatch 되지 않은 변경이 있는지"""
+        return name in self._changed
+
+    def discard_changes(self) -> None:
+        self._changed.clear()
+
+    def dispatch(self) -> FrozenSet[str]:
+        """메인 루프에서 호출: 지난 dispatch 이후 바뀐 필드의 구독자 호출. 바뀐 필드 반환"""
+        pending = self._changed
+        if not pending:
+            return _NOTHING
+        names = []
+        while pending:
+            try:
+                names.append(pending.pop())
+            except KeyError:   # 다른 스레드의 discard_changes
+                break
+        changed = frozenset(names)
+        for fields, callback in self._subscribers:
+            hit = fields & changed
+            if hit:
+                callback(self, hit)
+        return changed
@@ -0,0 +1,126 @@
+"""
+정규화된 스테이션 목록 캐시 (부팅 시간 단축).
+config.json (또는 "stations_file" 의 JSON) 에서 만든 StationStore 를 색상 변환 / timezone 계산까지 끝낸 상태로
+바이너리(.bin 과 같은 형식)로 저장해 두고, 원본이 그대로면 다음 부팅에 JSON 파싱 / timezone 계산 없이 불러온다.
+- 키: 원본 경로 + mtime_ns + 크기 (stat 한 번) → 다르면 내용 sha1 비교 (touch / 같은 내용 다시 저장은 재사용)
+- timezone_dataset 이나 형식 버전이 달라도 다시 만듦
+- 파생 파일이므로 fsync 하지 않음 (깨져 있으면 다시 만들면 됨)
+- config 에 적힌 timezone 과 계산한 timezone 은 따로 저장 (다시 읽기 diff 가 계산 값을 '변경'으로 보지 않도록)
+"""
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from .config import CONFIG_FILE, atomic_write_bytes
+from .stations import BINARY_MAGIC, StationStore, load_stations
+
+STATION_CACHE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), "stations_cache.bin")
+CACHE_MAGIC = b"WRSC"
+CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sHII")   # magic, version, meta 길이, 스테이션 열 길이
+
+
+def _digest(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StationCache:
+    def __init__(self, path: str = STATION_CACHE_FILE, config_path: str = CONFIG_FILE):
+        self.path = path
+        self.config_path = config_path
+        self.status = ""          # hit / rehash (내용 같음) / miss / stale / corrupt / off
+        self.needs_save = False   # 부팅 후 (백그라운드) save() 필요
+        self._key: Dict[str, Any] = {}
+
+    def source(self, cfg: Dict[str, Any]) -> str:
+        """스테이션 원본 파일 ("stations_file" 이 있으면 그것, 없으면 config.json)"""
+        return os.path.abspath(cfg.get("stations_file") or self.config_path)
+
+    def _read(self) -> Tuple[Optional[Dict[str, Any]], bytes, bytes]:
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, b"", b""
+        try:
+            magic, version, meta_len, store_len = _CACHE_HEADER.unpack_from(data, 0)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return None, b"", b""
+            pos = _CACHE_HEADER.size
+            meta = json.loads(data[pos:pos + meta_len].decode("utf-8"))
+            pos += meta_len
+            return meta, data[pos:pos + store_len], data[pos + store_len:]
+        except (struct.error, ValueError):
+            return None, b"", b""
+
+    def load(self, cfg: Dict[str, Any]) -> StationStore:
+        """캐시가 원본과 맞으면 캐시에서, 아니면 원본에서 (→ needs_save)"""
+        dataset = cfg.get("timezone_dataset", "")
+        src = self.source(cfg)
+        try:
+            st = os.stat(src)
+            with open(src, "rb") as f:
+                if cfg.get("stations_file") and f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+                    # 이미 바이너리 → 캐시할 필요 없음
+                    self.status = "off"
+                    return load_stations(cfg)
+        except OSError:
+            self.status = "off"
+            return load_stations(cfg)
+        key = {"source": src, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "tz_dataset": dataset}
+
+        meta, store_bytes, tz_bytes = self._read()
+        self.status = "miss" if meta is None else "stale"
+        if meta is not None and all(meta.get(k) == v for k, v in key.items() if k not in ("mtime_ns", "size")):
+            if meta.get("mtime_ns") == key["mtime_ns"] and meta.get("size") == key["size"]:
+                self.status = "hit"
+            elif meta.get("size") == key["size"] and meta.get("sha1") == _digest(src):
+                self.status = "rehash"   # 내용은 같음 → 키만 새로 저장
+                self.needs_save = True
+        if self.status in ("hit", "rehash"):
+            try:
+                store = StationStore.from_bytes(store_bytes, dataset)
+                store.attach_resolved_timezones(tz_bytes)
+                key["sha1"] = meta["sha1"]
+                self._key = key
+                return store
+            except (ValueError, struct.error) as e:
+                print(f"⚠️  스테이션 캐시 손상, 다시 만듦: {e}")
+                self.status = "corrupt"
+
+        # 원본에서 (해시는 읽기 전에 계산 → 읽는 도중 바뀌면 다음 부팅에 다시 만들어짐)
+        key["sha1"] = _digest(src)
+        self._key = key
+        self.needs_save = True
+        return load_stations(cfg)
+
+    def save(self, store: StationStore) -> bool:
+        """timezone 을 전부 계산하고 저장 (부팅 후 백그라운드에서)"""
+        if not self._key:
+            return False
+        store.resolve_timezones()
+        meta = json.dumps(self._key, separators=(",", ":")).encode("utf-8")
+        store_bytes = store.to_bytes(merge_timezones=False)
+        data = b"".join((_CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(meta), len(store_bytes)),
+                         meta, store_bytes, store.resolved_timezones_bytes()))
+        try:
+            atomic_write_bytes(self.path, data, fsync=False)
+        except OSError as e:
+            print(f"⚠️  스테이션 캐시 저장 실패: {e}")
+            return False
+        self.needs_save = False
+        return True
+
+
+def open_station_cache(cfg: Dict[str, Any]) -> Optional[StationCache]:
+    """config.json 의 "station_cache" 항목 (기본 활성)"""
+    opts = cfg.get("station_cache") or {}
+    if not opts.get("enabled", True):
+        return None
+    return StationCache(path=opts.get("file", STATION_CACHE_FILE))
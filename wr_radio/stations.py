@@ -0,0 +1,439 @@
+"""
+스테이션 목록 저장소.
+수천~수십만 개 스테이션(Radio-Browser 목록 등)도 가볍게 다루기 위해 dict 목록 대신 열(column) 단위로 저장한다.
+- 위도/경도: array('d'), 색상: array('B') 3바이트, 문자열: 한 덩어리 bytearray + 오프셋 (접근할 때 디코드)
+- timezone 이 없는 스테이션은 처음 볼 때 계산 (시작 시 전부 계산하지 않음)
+- 불러오기: config.json 의 "stations", 또는 "stations_file" (JSON 배열 / JSON lines 를 스트리밍, 또는 바이너리 .bin)
+
+store[i] 는 dict 처럼 쓰는 가벼운 view (station["name"], station.get("fallback_url"), "timezone" in station).
+"""
+import json
+import math
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .config import DEFAULT_STATIONS, atomic_write_bytes, find_timezone
+
+DEFAULT_COLOR = (100, 200, 255)
+BINARY_MAGIC = b"WRST"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sHI")   # magic, version, 스테이션 수
+_SECTION = struct.Struct("<I")     # 구역 길이 (바이트)
+
+# 문자열 열 (extra: _EXTRA_KEYS 를 JSON 으로. Radio-Browser 의 나머지 필드는 버림)
+_STRING_COLUMNS = ("name", "url", "location", "timezone", "extra")
+_CORE_KEYS = ("name", "url", "location", "lat", "lon", "color", "timezone")
+_EXTRA_KEYS = ("fallback_url",)
+
+
+class _Strings:
+    """문자열 목록을 bytearray 하나 + 끝 오프셋으로 (문자열 객체를 스테이션 수만큼 만들지 않음)"""
+    __slots__ = ("blob", "ends")
+
+    def __init__(self, blob: Optional[bytearray] = None, ends: Optional[array] = None):
+        self.blob = blob if blob is not None else bytearray()
+        self.ends = ends if ends is not None else array("I")
+
+    def append(self, s: str) -> None:
+        self.blob += s.encode("utf-8")
+        self.ends.append(len(self.blob))
+
+    def __getitem__(self, i: int) -> str:
+        start = self.ends[i - 1] if i else 0
+        return self.blob[start:self.ends[i]].decode("utf-8")
+
+    def raw(self, i: int) -> bytes:
+        """디코드 없이 (비교용)"""
+        start = self.ends[i - 1] if i else 0
+        return self.blob[start:self.ends[i]]
+
+    def nbytes(self) -> int:
+        return len(self.blob) + self.ends.itemsize * len(self.ends)
+
+
+class Station(Mapping):
+    """StationStore 의 한 행 (읽기 전용 dict 처럼 동작)"""
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store: "StationStore", index: int):
+        self._store = store
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store.field(self.index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _CORE_KEYS
+        yield from self._store.extra(self.index)
+
+    def __len__(self) -> int:
+        return len(_CORE_KEYS) + len(self._store.extra(self.index))
+
+    def __repr__(self) -> str:
+        return f"Station({self.index}, {self._store.name(self.index)!r})"
+
+
+class StationStore:
+    def __init__(self, tz_dataset: str = ""):
+        self.tz_dataset = tz_dataset
+        self.lats = array("d")
+        self.lons = array("d")
+        self.colors = array("B")
+        self._str = {name: _Strings() for name in _STRING_COLUMNS}
+        self._tz_resolved: Dict[int, str] = {}   # 늦게 계산한 timezone
+        self._tz_cached: Optional[_Strings] = None   # 캐시 파일에서 읽은 계산된 timezone (station_cache)
+        self._lock = threading.Lock()
+        self.version = 0   # 목록이 바뀔 때마다 증가 (색인 갱신 확인용)
+        self.skipped = 0   # 좌표가 없어 건너뛴 항목
+
+    # --- 추가 ---
+    def append(self, st: Dict[str, Any]) -> Optional[int]:
+        """dict 한 개 추가 (Radio-Browser 필드 이름도 허용). 좌표나 URL 이 없으면 건너뛰고 None"""
+        lat = st.get("lat", st.get("geo_lat"))
+        lon = st.get("lon", st.get("geo_long"))
+        url = st.get("url") or st.get("url_resolved") or ""
+        try:
+            lat, lon = float(lat), float(lon)
+        except (TypeError, ValueError):
+            lat = lon = math.nan
+        if not url or math.isnan(lat) or math.isnan(lon):
+            self.skipped += 1
+            return None
+
+        location = st.get("location")
+        if location is None:
+            location = ", ".join(v for v in (st.get("state"), st.get("country")) if v)
+        color = st.get("color") or DEFAULT_COLOR
+        try:
+            r, g, b = (max(0, min(255, int(c))) for c in color)
+        except (TypeError, ValueError):
+            r, g, b = DEFAULT_COLOR
+        extra = {k: st[k] for k in _EXTRA_KEYS if k in st}
+
+        with self._lock:
+            self.lats.append(lat)
+            self.lons.append(lon)
+            self.colors.extend((r, g, b))
+            s = self._str
+            s["name"].append(str(st.get("name") or url))
+            s["url"].append(url)
+            s["location"].append(str(location or ""))
+            s["timezone"].append(str(st.get("timezone") or ""))
+            s["extra"].append(json.dumps(extra, ensure_ascii=False, separators=(",", ":")) if extra else "")
+            self.version += 1
+            return len(self.lats) - 1
+
+    def extend(self, stations: Iterable[Dict[str, Any]]) -> int:
+        n = 0
+        for st in stations:
+            if self.append(st) is not None:
+                n += 1
+        return n
+
+    # --- 읽기 ---
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def __getitem__(self, index: int) -> Station:
+        n = len(self.lats)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("station index out of range")
+        return Station(self, index)
+
+    def __iter__(self) -> Iterator[Station]:
+        for i in range(len(self.lats)):
+            yield Station(self, i)
+
+    def name(self, i: int) -> str:
+        return self._str["name"][i]
+
+    def location(self, i: int) -> str:
+        return self._str["location"][i]
+
+    def _resolved_timezone(self, i: int) -> Optional[str]:
+        tz = self._tz_resolved.get(i)
+        if tz is None and self._tz_cached is not None:
+            tz = self._tz_cached[i] or None
+        return tz
+
+    def timezone(self, i: int) -> str:
+        tz = self._str["timezone"][i]
+        if tz:
+            return tz
+        tz = self._resolved_timezone(i)
+        if tz is None:
+            tz = find_timezone(self.lats[i], self.lons[i], self.tz_dataset)
+            self._tz_resolved[i] = tz
+        return tz
+
+    def has_timezone(self, i: int) -> bool:
+        """config 에 timezone 이 적혀 있었는지 (늦게 계산한 값은 제외)"""
+        return bool(self._str["timezone"][i])
+
+    def adopt_timezones(self, old: "StationStore", pairs: Iterable) -> int:
+        """
+        old 에서 이미 계산한 timezone 을 물려받음 (목록 다시 읽기 후, 좌표가 같은 스테이션만).
+        pairs: (old index, new index). 물려받은 수 반환
+        """
+        n = 0
+        for i, j in pairs:
+            tz = old._resolved_timezone(i)
+            if tz and not self.has_timezone(j) and old.lats[i] == self.lats[j] and old.lons[i] == self.lons[j]:
+                self._tz_resolved[j] = tz
+                n += 1
+        return n
+
+    def row_key(self, i: int) -> tuple:
+        """config 에 적힌 값 그대로 (view / 늦은 timezone 계산 없이 비교용)"""
+        s = self._str
+        return (self.lats[i], self.lons[i], self.colors[i * 3:i * 3 + 3], s["name"].raw(i),
+                s["location"].raw(i), s["timezone"].raw(i), s["extra"].raw(i))
+
+    def extra(self, i: int) -> Dict[str, Any]:
+        raw = self._str["extra"][i]
+        return json.loads(raw) if raw else {}
+
+    def field(self, i: int, key: str) -> Any:
+        if key == "lat":
+            return self.lats[i]
+        if key == "lon":
+            return self.lons[i]
+        if key == "color":
+            return tuple(self.colors[i * 3:i * 3 + 3])
+        if key == "timezone":
+            return self.timezone(i)
+        if key in ("name", "url", "location"):
+            return self._str[key][i]
+        return self.extra(i)[key]
+
+    def nbytes(self) -> int:
+        cols = (self.lats, self.lons, self.colors)
+        return sum(a.itemsize * len(a) for a in cols) + sum(s.nbytes() for s in self._str.values())
+
+    def resolve_timezones(self) -> int:
+        """timezone 이 없는 스테이션을 전부 계산 (캐시 / .bin 저장 전). 새로 계산한 수 반환"""
+        n = 0
+        for i in range(len(self)):
+            if not self._str["timezone"][i] and self._resolved_timezone(i) is None:
+                self.timezone(i)
+                n += 1
+        return n
+
+    # --- 바이너리 형식 ---
+    def _resolved_column(self) -> _Strings:
+        tz = _Strings()
+        for i in range(len(self)):
+            tz.append(self._resolved_timezone(i) or "")
+        return tz
+
+    def to_bytes(self, merge_timezones: bool = True) -> bytes:
+        """
+        스테이션 수 + 열마다 (길이, 내용). 숫자는 little-endian.
+        merge_timezones: 늦게 계산한 timezone 도 timezone 열에 넣음 (False 면 config 에 적힌 값만)
+        """
+        tz = _Strings()
+        for i in range(len(self)):
+            tz.append(self._str["timezone"][i] or (self._resolved_timezone(i) or "" if merge_timezones else ""))
+        parts = [_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(self))]
+        columns: List[Any] = [self.lats, self.lons, self.colors]
+        for name in _STRING_COLUMNS:
+            s = tz if name == "timezone" else self._str[name]
+            columns.extend((s.ends, s.blob))
+        parts.extend(_pack_columns(columns))
+        return b"".join(parts)
+
+    def resolved_timezones_bytes(self) -> bytes:
+        """계산된 timezone 열만 (station_cache 가 to_bytes(merge_timezones=False) 와 따로 저장)"""
+        tz = self._resolved_column()
+        return b"".join(_pack_columns([tz.ends, tz.blob]))
+
+    def attach_resolved_timezones(self, data: bytes) -> None:
+        """resolved_timezones_bytes() 결과를 붙임 (dict 로 풀지 않고 열 그대로 사용)"""
+        sections = _unpack_sections(data, 0, 2)
+        ends = _typed("I", sections[0])
+        if len(ends) != len(self):
+            raise ValueError("timezone 열 길이가 스테이션 수와 다름")
+        self._tz_cached = _Strings(bytearray(sections[1]), ends)
+
+    def save_binary(self, path: str) -> None:
+        atomic_write_bytes(path, self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, tz_dataset: str = "") -> "StationStore":
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("스테이션 바이너리 형식이 아님")
+        sections = iter(_unpack_sections(data, _HEADER.size, 3 + 2 * len(_STRING_COLUMNS)))
+
+        store = cls(tz_dataset)
+        store.lats = _typed("d", next(sections))
+        store.lons = _typed("d", next(sections))
+        store.colors = _typed("B", next(sections))
+        for name in _STRING_COLUMNS:
+            ends = _typed("I", next(sections))
+            store._str[name] = _Strings(bytearray(next(sections)), ends)
+        if not (len(store.lats) == len(store.lons) == count and len(store.colors) == count * 3):
+            raise ValueError("스테이션 바이너리 손상")
+        store.version = count
+        return store
+
+    @classmethod
+    def load_binary(cls, path: str, tz_dataset: str = "") -> "StationStore":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), tz_dataset)
+
+
+def _pack_columns(columns: List[Any]) -> List[bytes]:
+    """(길이, 내용) 구역들. array 는 little-endian 으로"""
+    parts = []
+    for col in columns:
+        if isinstance(col, array):
+            if sys.byteorder == "big":
+                col = array(col.typecode, col)
+                col.byteswap()
+            data = col.tobytes()
+        else:
+            data = bytes(col)
+        parts.append(_SECTION.pack(len(data)))
+        parts.append(data)
+    return parts
+
+
+def _unpack_sections(data: bytes, pos: int, count: int) -> List[memoryview]:
+    mv = memoryview(data)
+    out = []
+    for _ in range(count):
+        (n,) = _SECTION.unpack_from(data, pos)
+        pos += _SECTION.size
+        if pos + n > len(data):
+            raise ValueError("스테이션 바이너리 손상 (잘린 파일)")
+        out.append(mv[pos:pos + n])
+        pos += n
+    return out
+
+
+def _typed(code: str, raw: memoryview) -> array:
+    a = array(code)
+    a.frombytes(raw)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+
+def iter_json_stations(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """JSON 배열 [{...}, {...}] 또는 JSON lines 를 한 항목씩 (파일 전체를 dict 목록으로 만들지 않음)"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+        while True:
+            # 다음 항목 시작까지 공백 / 구분자 건너뛰기
+            while pos < len(buf) and buf[pos] in " \t\r\n,[":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos) if pos < len(buf) else (None, -1)
+            except json.JSONDecodeError:
+                end = -1
+            # 항목이 덩어리 경계에 걸쳤으면 더 읽고 다시
+            if end < 0 or (end == len(buf) and not eof):
+                if eof:
+                    if pos < len(buf):
+                        raise ValueError(f"JSON 파싱 실패 (위치 {pos})")
+                    return
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            pos = end
+            if isinstance(obj, dict):
+                yield obj
+
+
+def diff_stations(old: Any, new: "StationStore") -> Dict[str, List[int]]:
+    """
+    URL 로 같은 스테이션을 짝지음.
+    반환: added / changed (new 의 index), removed (old 의 index), kept_old / kept_new (짝지어진 index 쌍)
+    """
+    columnar = isinstance(old, StationStore)
+    old_urls = old._str["url"] if columnar else [st["url"] for st in old]
+    old_by_url: Dict[str, int] = {}
+    for i in range(len(old)):
+        old_by_url.setdefault(old_urls[i], i)
+    new_urls = new._str["url"]
+    added, changed, kept_old, kept_new = [], [], [], []
+    for j in range(len(new)):
+        i = old_by_url.pop(new_urls[j], None)
+        if i is None:
+            added.append(j)
+            continue
+        kept_old.append(i)
+        kept_new.append(j)
+        if columnar:
+            if old.row_key(i) != new.row_key(j):
+                changed.append(j)
+            continue
+        a, b = old[i], new[j]
+        # timezone 은 새 항목에 값이 있을 때만 비교 (없으면 늦게 계산됨)
+        keys = [k for k in ("name", "location", "lat", "lon", "color", "fallback_url") if a.get(k) != b.get(k)]
+        if keys or (new.has_timezone(j) and a["timezone"] != b["timezone"]):
+            changed.append(j)
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": sorted(old_by_url.values()),
+        "kept_old": kept_old,
+        "kept_new": kept_new,
+    }
+
+
+def load_stations(cfg: Dict[str, Any]) -> StationStore:
+    """
+    config.json 의 "stations_file" (.bin 바이너리 / .json 배열 / JSON lines) 이 있으면 그 파일,
+    없으면 "stations" 목록으로 StationStore 생성
+    """
+    dataset = cfg.get("timezone_dataset", "")
+    path = cfg.get("stations_file", "")
+    if path:
+        try:
+            with open(path, "rb") as f:
+                is_binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+            if is_binary:
+                return StationStore.load_binary(path, dataset)
+            store = StationStore(dataset)
+            store.extend(iter_json_stations(path))
+            if store.skipped:
+                print(f"⚠️  좌표/URL 없는 스테이션 {store.skipped}개 제외")
+            if len(store):
+                return store
+            print(f"⚠️  스테이션 파일이 비어있음: {path}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️  스테이션 파일 로드 실패: {path} - {e}")
+    store = StationStore(dataset)
+    store.extend(cfg.get("stations") or [])
+    if not len(store):
+        print("⚠️  사용할 수 있는 스테이션이 없습니다. 기본 목록 사용")
+        store.extend(DEFAULT_STATIONS)
+    return store
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python3 -m wr_radio.stations", description="스테이션 목록 → 바이너리 (.bin)")
+    ap.add_argument("src", help="JSON 배열 / JSON lines")
+    ap.add_argument("dst", help="저장할 .bin 경로 (config.json 의 stations_file 로 지정)")
+    ap.add_argument("--timezones", action="store_true", help="timezone 을 미리 계산해 함께 저장")
+    args = ap.parse_args()
+
+    store = load_stations({"stations_file": args.src})
+    if args.timezones:
+        store.resolve_timezones()
+    store.save_binary(args.dst)
+    print(f"✅ 스테이션 {len(store)}개 저장: {args.dst} (제외 {store.skipped}개)")
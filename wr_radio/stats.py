@@ -0,0 +1,238 @@
+"""
+스테이션별 스트림 통계 (SQLite).
+첫 소리까지 걸린 시간, 버퍼 부족(underrun) 횟수, 비트레이트, 캐시 지터를 기록하고
+재생할 때마다 스테이션별 cache / readahead / network-timeout 값을 고른다.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .config import CONFIG_FILE
+
+STATS_DB = os.path.join(os.path.dirname(CONFIG_FILE), "stream_stats.db")
+FLUSH_INTERVAL_SEC = 60.0  # SD카드 쓰기 빈도 제한
+EWMA_ALPHA = 0.3
+
+# 기본값 (통계가 없는 스테이션)
+DEFAULT_CACHE_SECS = 0.3
+DEFAULT_READAHEAD_SECS = 0.3
+DEFAULT_NETWORK_TIMEOUT = 3.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS station_stats (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    plays INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    ttfa_avg REAL NOT NULL DEFAULT 0,
+    ttfa_max REAL NOT NULL DEFAULT 0,
+    underruns INTEGER NOT NULL DEFAULT 0,
+    bitrate_kbps REAL NOT NULL DEFAULT 0,
+    jitter REAL NOT NULL DEFAULT 0,
+    listen_sec REAL NOT NULL DEFAULT 0,
+    updated REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+@dataclass
+class StationStats:
+    url: str
+    name: str = ""
+    plays: int = 0
+    failures: int = 0
+    ttfa_avg: float = 0.0     # 첫 소리까지 (초, EWMA)
+    ttfa_max: float = 0.0
+    underruns: int = 0        # paused-for-cache 진입 횟수
+    bitrate_kbps: float = 0.0  # audio-bitrate (EWMA)
+    jitter: float = 0.0       # demuxer-cache-duration 변동폭 (초, EWMA)
+    listen_sec: float = 0.0
+    updated: float = 0.0
+
+    # 메모리에서만 사용
+    _last_cache_dur: Optional[float] = None
+
+    @property
+    def underruns_per_hour(self) -> float:
+        return self.underruns * 3600.0 / max(self.listen_sec, 600.0)
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / max(self.plays, 1)
+
+    def reliability(self) -> float:
+        """0~100, 높을수록 안정적"""
+        penalty = (
+            self.underruns_per_hour * 5.0
+            + self.failure_rate * 50.0
+            + self.ttfa_avg * 3.0
+            + self.jitter * 10.0
+        )
+        return max(0.0, 100.0 - penalty)
+
+
+def _ewma(old: float, new: float, first: bool) -> float:
+    return new if first else old + EWMA_ALPHA * (new - old)
+
+
+def choose_buffering(st: Optional[StationStats]) -> Tuple[float, float, float]:
+    """(cache_secs, demuxer_readahead_secs, network_timeout) 반환"""
+    if st is None or st.plays == 0:
+        return DEFAULT_CACHE_SECS, DEFAULT_READAHEAD_SECS, DEFAULT_NETWORK_TIMEOUT
+
+    # 끊김이 잦거나 캐시가 출렁이는 스트림일수록 버퍼를 늘림
+    cache = DEFAULT_CACHE_SECS + 0.5 * st.underruns_per_hour + 2.0 * st.jitter
+    cache = max(DEFAULT_CACHE_SECS, min(5.0, cache))
+    readahead = max(DEFAULT_READAHEAD_SECS, min(5.0, cache))
+    # 첫 응답이 느린 서버는 타임아웃 여유를 둠
+    timeout = max(DEFAULT_NETWORK_TIMEOUT, min(15.0, 2.0 * st.ttfa_max + 1.0))
+    return round(cache, 2), round(readahead, 2), round(timeout, 1)
+
+
+class StatsStore:
+    def __init__(self, path: str = STATS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._rows: Dict[str, StationStats] = {}
+        self._dirty: set = set()
+        self._last_flush = time.time()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        for row in self._db.execute(
+            "SELECT url, name, plays, failures, ttfa_avg, ttfa_max, underruns,"
+            " bitrate_kbps, jitter, listen_sec, updated FROM station_stats"
+        ):
+            self._rows[row[0]] = StationStats(*row)
+
+    def _get(self, url: str, name: str = "") -> StationStats:
+        st = self._rows.get(url)
+        if st is None:
+            st = StationStats(url=url, name=name)
+            self._rows[url] = st
+        elif name:
+            st.name = name
+        self._dirty.add(url)
+        st.updated = time.time()
+        return st
+
+    def get(self, url: str) -> Optional[StationStats]:
+        with self._lock:
+            return self._rows.get(url)
+
+    def all(self) -> List[StationStats]:
+        with self._lock:
+            return list(self._rows.values())
+
+    def buffering_for(self, url: str) -> Tuple[float, float, float]:
+        return choose_buffering(self.get(url))
+
+    # --- 기록 ---
+    def record_play(self, url: str, name: str, ttfa: float) -> None:
+        with self._lock:
+            st = self._get(url, name)
+            st.ttfa_avg = _ewma(st.ttfa_avg, ttfa, st.plays == 0)
+            st.ttfa_max = max(st.ttfa_max, ttfa)
+            st.plays += 1
+            st._last_cache_dur = None
+
+    def record_failure(self, url: str, name: str) -> None:
+        with self._lock:
+            st = self._get(url, name)
+            st.plays += 1
+            st.failures += 1
+
+    def record_underrun(self, url: str) -> None:
+        with self._lock:
+            self._get(url).underruns += 1
+
+    def record_sample(self, url: str, interval: float, bitrate_bps: Optional[float], cache_dur: Optional[float]) -> None:
+        with self._lock:
+            st = self._get(url)
+            st.listen_sec += interval
+            if bitrate_bps:
+                st.bitrate_kbps = _ewma(st.bitrate_kbps, bitrate_bps / 1000.0, st.bitrate_kbps == 0)
+            if cache_dur is not None:
+                if st._last_cache_dur is not None:
+                    st.jitter = _ewma(st.jitter, abs(cache_dur - st._last_cache_dur), False)
+                st._last_cache_dur = cache_dur
+
+    # --- 저장 ---
+    def maybe_flush(self) -> None:
+        if time.time() - self._last_flush >= FLUSH_INTERVAL_SEC:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            rows = [self._rows[u] for u in self._dirty]
+            self._dirty.clear()
+            self._last_flush = time.time()
+            if not rows:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO station_stats (url, name, plays, failures, ttfa_avg, ttfa_max,"
+                    " underruns, bitrate_kbps, jitter, listen_sec, updated) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                    [
+                        (r.url, r.name, r.plays, r.failures, r.ttfa_avg, r.ttfa_max,
+                         r.underruns, r.bitrate_kbps, r.jitter, r.listen_sec, r.updated)
+                        for r in rows
+                    ],
+                )
+                self._db.commit()
+            except Exception as e:
+                print(f"⚠️  통계 저장 실패: {e}")
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+def open_stats(cfg: Dict) -> Optional[StatsStore]:
+    """config.json 의 "adaptive_buffering" (기본 true) 에 따라 통계 저장소 열기"""
+    if not cfg.get("adaptive_buffering", True):
+        return None
+    try:
+        return StatsStore(cfg.get("stats_db", STATS_DB))
+    except Exception as e:
+        print(f"⚠️  통계 DB 열기 실패: {e}")
+        return None
+
+
+def print_report(store: StatsStore) -> None:
+    rows = sorted(store.all(), key=lambda r: r.reliability(), reverse=True)
+    if not rows:
+        print("기록된 통계가 없습니다.")
+        return
+
+    print(f"{'#':>2}  {'점수':>5}  {'재생':>4}  {'실패':>4}  {'TTFA':>6}  {'끊김/h':>6}  {'kbps':>5}  {'지터':>5}  {'cache':>5}  스테이션")
+    for i, r in enumerate(rows, 1):
+        cache, _, _ = choose_buffering(r)
+        print(
+            f"{i:>2}  {r.reliability():>5.1f}  {r.plays:>4}  {r.failures:>4}  {r.ttfa_avg:>5.2f}s"
+            f"  {r.underruns_per_hour:>6.1f}  {r.bitrate_kbps:>5.0f}  {r.jitter:>5.2f}  {cache:>5.2f}  {r.name or r.url}"
+        )
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="스테이션별 스트림 안정성 리포트")
+    ap.add_argument("--db", default=STATS_DB, help="통계 DB 경로")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"통계 DB가 없습니다: {args.db}")
+        return
+    store = StatsStore(args.db)
+    print_report(store)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
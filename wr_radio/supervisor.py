@@ -0,0 +1,108 @@
+"""
+mpv 프로세스 감시.
+자식 프로세스 종료(pidfd 알림)와 IPC 응답을 확인하고, 죽으면 다시 띄운 뒤
+볼륨 / 재생 중이던 스테이션 / pause 상태를 복원한다.
+"""
+import os
+import select
+import threading
+import time
+
+from . import player
+
+
+class MpvSupervisor:
+    def __init__(
+        self,
+        state,
+        check_interval: float = 0.5,
+        ipc_failures: int = 3,
+        extra=(),
+    ):
+        self.state = state
+        self.check_interval = check_interval
+        self.ipc_failures = ipc_failures
+        self.extra = extra
+
+        self.restarts = 0
+        self.last_recovery_sec = 0.0
+        self.recovered = threading.Event()  # 복구 완료 시 set (벤치마크용)
+        self._fail_count = 0
+
+    def _wait_child_exit(self, timeout: float) -> bool:
+        """자식 프로세스가 timeout 안에 죽으면 True. pidfd 가 있으면 폴링 없이 대기."""
+        proc = self.state.player_process
+        if proc is None:
+            time.sleep(timeout)
+            return False
+        if proc.poll() is not None:
+            return True
+
+        pidfd = -1
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except OSError:
+                pidfd = -1
+        if pidfd < 0:
+            time.sleep(timeout)
+            return proc.poll() is not None
+        try:
+            r, _, _ = select.select([pidfd], [], [], timeout)
+            return bool(r) and proc.poll() is not None
+        finally:
+            os.close(pidfd)
+
+    def _ipc_alive(self) -> bool:
+        if player._can_connect(self.state.mpv_sock, timeout=0.3):
+            self._fail_count = 0
+            return True
+        self._fail_count += 1
+        return self._fail_count < self.ipc_failures
+
+    def run(self) -> None:
+        while not self.state.shutting_down:
+            died = self._wait_child_exit(self.check_interval)
+            if self.state.shutting_down:
+                break
+            if died:
+                print("💥 mpv 프로세스 종료 감지")
+                self._recover(time.time())
+            elif not self._ipc_alive():
+                print("💥 mpv IPC 응답 없음")
+                self._recover(time.time())
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run, daemon=True)
+        t.start()
+        return t
+
+    def _recover(self, detected_at: float) -> None:
+        st = self.state
+        self.recovered.clear()
+        proc = st.player_process
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.kill()
+                proc.wait(timeout=2)
+            except Exception:
+                pass
+        st.player_process = None
+        st.audio_playing = False
+
+        if not player.ensure_mpv_running(st, extra=self.extra):
+            print("❌ mpv 재시작 실패 (다음 확인 때 재시도)")
+            return
+
+        player.restore_player_state(st)
+        self._fail_count = 0
+        self.restarts += 1
+        self.last_recovery_sec = time.time() - detected_at
+        self.recovered.set()
+        print(f"♻️  mpv 재시작 완료 ({self.last_recovery_sec * 1000:.0f}ms, {self.restarts}회째)")
+
+
+def start_mpv_supervisor(state, extra=()) -> MpvSupervisor:
+    sup = MpvSupervisor(state, extra=extra)
+    sup.start()
+    return sup
@@ -0,0 +1,133 @@
+"""
+위경도 → 타임존 (오프라인).
+기준점: tzdata 의 zone.tab (pytz 에 포함, 타임존마다 대표 도시 좌표 ~420곳).
+config.json 의 "timezone_dataset" 에 GeoNames 도시 파일(cities15000.txt 등, 수만 곳)을 주면 그것을 사용.
+
+가장 가까운 기준점은 spatial.SphereTree (대원 거리 KD-tree) 로 찾는다.
+"""
+import os
+import threading
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from .spatial import SphereTree
+
+Point = Tuple[float, float, str]  # (위도, 경도, 타임존)
+
+
+class TimezoneIndex:
+    def __init__(self, points: Iterable[Point]):
+        names: List[str] = []
+        name_ids = {}
+        coords = []
+        ids = []
+        for lat, lon, tz in points:
+            if tz not in name_ids:
+                name_ids[tz] = len(names)
+                names.append(tz)
+            coords.append((lat, lon))
+            ids.append(name_ids[tz])
+        if not coords:
+            raise ValueError("타임존 기준점 없음")
+
+        self.names = names
+        self.tz = array("H" if len(names) < 65536 else "I", ids)
+        self.tree = SphereTree(coords)
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def nearest(self, lat: float, lon: float) -> Tuple[str, float]:
+        """(타임존, 기준점까지 km)"""
+        i, km = self.tree.nearest(lat, lon)
+        return self.names[self.tz[i]], km
+
+    def nearest_linear(self, lat: float, lon: float) -> Tuple[str, float]:
+        """트리 없이 전부 비교 (벤치마크 / 검증용)"""
+        i, km = self.tree.nearest_linear(lat, lon)
+        return self.names[self.tz[i]], km
+
+
+# --- 데이터셋 ---
+def _parse_iso6709(s: str) -> Tuple[float, float]:
+    """zone.tab 좌표 '+3733+12658' / '+404251-0740023' → (위도, 경도)"""
+    for i in range(1, len(s)):
+        if s[i] in "+-":
+            break
+    lat_s, lon_s = s[:i], s[i:]
+
+    def conv(v: str, deg_len: int) -> float:
+        sign = -1.0 if v[0] == "-" else 1.0
+        v = v[1:]
+        deg = int(v[:deg_len])
+        mins = int(v[deg_len:deg_len + 2])
+        secs = int(v[deg_len + 2:] or 0)
+        return sign * (deg + mins / 60.0 + secs / 3600.0)
+
+    return conv(lat_s, 2), conv(lon_s, 3)
+
+
+def zone_tab_path() -> Optional[str]:
+    candidates = []
+    try:
+        import pytz
+        candidates.append(os.path.join(os.path.dirname(pytz.__file__), "zoneinfo", "zone.tab"))
+    except ImportError:
+        pass
+    candidates.append("/usr/share/zoneinfo/zone.tab")
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_zone_tab(path: str) -> List[Point]:
+    points = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) >= 3:
+                lat, lon = _parse_iso6709(cols[1])
+                points.append((lat, lon, cols[2]))
+    return points
+
+
+def load_geonames(path: str) -> List[Point]:
+    """GeoNames cities*.txt (탭 구분, 4=위도 5=경도 17=타임존)"""
+    points = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            cols = line.split("\t")
+            if len(cols) > 17 and cols[17]:
+                points.append((float(cols[4]), float(cols[5]), cols[17]))
+    return points
+
+
+_index: Optional[TimezoneIndex] = None
+_index_source: Optional[str] = None
+_lock = threading.Lock()
+
+
+def get_index(dataset: str = "") -> Optional[TimezoneIndex]:
+    """
+    처음 호출 때 한 번 만들어 재사용. dataset(GeoNames 파일)을 못 읽으면 zone.tab,
+    그것도 없으면 None (호출 측에서 예전 표로 대체)
+    """
+    global _index, _index_source
+    with _lock:
+        if _index is not None and _index_source == dataset:
+            return _index
+        sources = [(dataset, load_geonames)] if dataset else []
+        tab = zone_tab_path()
+        if tab:
+            sources.append((tab, load_zone_tab))
+        for path, loader in sources:
+            try:
+                _index = TimezoneIndex(loader(path))
+                _index_source = dataset
+                return _index
+            except (OSError, ValueError) as e:
+                print(f"⚠️  타임존 데이터 로드 실패: {path} - {e}")
+        return None
@@ -0,0 +1,156 @@
+"""
+실제 소리 크기 기반 레벨 피드.
+mpv 오디오 체인에 lavfi astats 필터를 걸고, IPC 로 af-metadata 의 RMS 레벨을 읽는다.
+읽기 주기는 max_hz 로 제한하고, 이 스레드의 CPU 사용률이 예산을 넘으면 주기를 늘린다.
+"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from . import player
+
+FILTER_LABEL = "wrvis"
+# 채널별 통계는 끄고 전체 RMS / Peak 만 계산 (mpv 쪽 부하 최소화)
+_FILTER_SPECS = [
+    f"@{FILTER_LABEL}:lavfi=[astats=metadata=1:reset=1:measure_perchannel=none:measure_overall=RMS_level+Peak_level]",
+    f"@{FILTER_LABEL}:lavfi=[astats=metadata=1:reset=1]",  # 구버전 ffmpeg
+]
+_RMS_KEY = "lavfi.astats.Overall.RMS_level"
+FLOOR_DB = -60.0
+HISTORY_LEN = 40
+RETRY_MIN_SEC = 1.0    # 필터 설치 실패 후 다시 시도할 때까지 (실패할 때마다 2배)
+RETRY_MAX_SEC = 60.0
+
+
+def db_to_level(db: float) -> float:
+    """dBFS → 0~1 (FLOOR_DB 이하는 0)"""
+    if db != db or db <= FLOOR_DB:  # NaN / -inf
+        return 0.0
+    return min(1.0, (db - FLOOR_DB) / -FLOOR_DB)
+
+
+def _parse_rms(meta) -> Optional[float]:
+    if not isinstance(meta, dict) or _RMS_KEY not in meta:
+        return None
+    try:
+        return db_to_level(float(meta[_RMS_KEY]))
+    except ValueError:
+        return 0.0  # "-inf"
+
+
+class LevelFeed:
+    def __init__(self, state, max_hz: float = 10.0, min_hz: float = 2.0, cpu_budget: float = 0.02):
+        self.state = state
+        self.max_hz = max_hz
+        self.min_hz = min_hz
+        self.cpu_budget = cpu_budget   # 이 스레드가 쓸 수 있는 CPU 비율 (0.02 = 2%)
+
+        self.interval = 1.0 / max_hz
+        self.levels: Deque[float] = deque([0.0] * HISTORY_LEN, maxlen=HISTORY_LEN)
+        self.cpu_usage = 0.0           # 최근 CPU 비율 (EWMA)
+        self.active = False            # 필터가 걸려서 실제 값이 들어오는 중
+        self._lock = threading.Lock()
+        self._misses = 0
+        self.install_failures = 0      # 연속 설치 실패 횟수
+        self._retry_at = 0.0           # 이 시각 전에는 설치를 다시 시도하지 않음 (그동안 사인파)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.levels)
+
+    def _install_filter(self) -> bool:
+        for spec in _FILTER_SPECS:
+            # 응답을 기다린 뒤 확인 (mpv 가 적용하기 전에 af 를 읽으면 없다고 나옴)
+            if not player.mpv_request(self.state, ["af", "add", spec]):
+                continue
+            af = player.get_properties(self.state, ["af"]).get("af") or []
+            if any(f.get("label") == FILTER_LABEL for f in af if isinstance(f, dict)):
+                return True
+            player.mpv_cmd(self.state, {"command": ["af", "remove", f"@{FILTER_LABEL}"]})
+        return False
+
+    def _try_install(self, now: float) -> bool:
+        """설치 실패는 mpv 재시작 / 소켓 교체 중일 수 있음 → 스레드는 유지하고 백오프 후 다시"""
+        if now < self._retry_at:
+            return False
+        if self._install_filter():
+            self.install_failures = 0
+            self._retry_at = 0.0
+            return True
+        self.install_failures += 1
+        delay = min(RETRY_MAX_SEC, RETRY_MIN_SEC * 2 ** (self.install_failures - 1))
+        self._retry_at = now + delay
+        if self.install_failures == 1:
+            print("⚠️  astats 필터 사용 불가 → 사인파 애니메이션 (나중에 다시 시도)")
+        return False
+
+    def _adapt(self, cpu: float, wall: float) -> None:
+        usage = cpu / max(wall, 1e-6)
+        self.cpu_usage = usage if self.cpu_usage == 0.0 else self.cpu_usage * 0.8 + usage * 0.2
+        if self.cpu_usage > self.cpu_budget:
+            self.interval = min(1.0 / self.min_hz, self.interval * 1.5)
+        elif self.cpu_usage < self.cpu_budget * 0.5:
+            self.interval = max(1.0 / self.max_hz, self.interval / 1.2)
+
+    def run(self) -> None:
+        st = self.state
+        installed = False
+        sock, generation = st.mpv_sock, st.play_generation
+        while not st.shutting_down:
+            t_wall = time.perf_counter()
+            t_cpu = time.thread_time()
+
+            if sock != st.mpv_sock:
+                # make-before-break 전환으로 mpv 인스턴스가 바뀜 → 새 인스턴스에 필터 설치 (백오프 없이 바로)
+                sock = st.mpv_sock
+                installed = False
+                self._misses = 0
+                self._retry_at = 0.0
+            if generation != st.play_generation:
+                # 새 재생 / mpv 재시작 후 복원 → 설치 실패 중이었으면 바로 다시 시도
+                generation = st.play_generation
+                self._retry_at = 0.0
+
+            if st.is_playing and st.audio_playing and not installed:
+                installed = self._try_install(time.time())
+                if not installed:
+                    self.active = False
+            if st.is_playing and st.audio_playing and installed:
+                level = _parse_rms(player.get_properties(st, [f"af-metadata/{FILTER_LABEL}"]).get(f"af-metadata/{FILTER_LABEL}"))
+                if level is None:
+                    # mpv 재시작 등으로 필터가 빠졌을 수 있음 → 몇 번 실패하면 다시 설치
+                    self._misses += 1
+                    if self._misses >= 10:
+                        installed = False
+                        self._misses = 0
+                    self.active = False
+                else:
+                    self._misses = 0
+                    self.active = True
+                    with self._lock:
+                        self.levels.append(level)
+            else:
+                self.active = False
+
+            self._adapt(time.thread_time() - t_cpu, self.interval)
+            time.sleep(max(0.0, self.interval - (time.perf_counter() - t_wall)))
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run, daemon=True)
+        t.start()
+        return t
+
+
+def start_level_feed(state, cfg: Dict) -> Optional[LevelFeed]:
+    """config.json 의 "visualizer" 항목 (기본 활성)"""
+    opts = cfg.get("visualizer") or {}
+    if not opts.get("enabled", True):
+        return None
+    feed = LevelFeed(
+        state,
+        max_hz=float(opts.get("max_hz", 10.0)),
+        cpu_budget=float(opts.get("cpu_budget", 0.02)),
+    )
+    feed.start()
+    return feed
@@ -1,76 +1,592 @@
+import json
+import os
+import queue
 import threading
 import time
-from typing import Dict, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from .config import CONFIG_FILE, atomic_write_json
+from .weather_providers import (
+    CircuitBreaker,
+    OpenMeteoProvider,
+    OpenWeatherProvider,
+    WeatherProvider,
+    WeatherResult,
+    create_provider,
+)
+
+WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+FORECAST_URL = "http://api.openweathermap.org/data/2.5/forecast"  # 3시간 간격 5일
 WEATHER_CACHE_TIME = 600  # 10분
+WEATHER_TIMEOUT = (3.05, 5)  # (연결, 읽기) 초
+WEATHER_CACHE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), "weather_cache.json")
+WEATHER_STALE_MAX = 6 * 3600  # 이보다 오래된 항목은 로드 시 버림
+WEATHER_SAVE_INTERVAL = 300   # 파일 쓰기 최소 간격 (SD 카드 보호)
+WEATHER_NEGATIVE_TTL = 60     # 실패한 위치는 이 시간 동안 다시 요청하지 않음
+WEATHER_MAX_INFLIGHT = 2      # 스케줄러 없이 동시에 띄울 조회 스레드 상한 (장애 중 스레드 누적 방지)
+WEATHER_GRID_DEG = 0.05       # 캐시 격자 크기 (약 5km, 0 이면 좌표 그대로)
+WEATHER_CACHE_MAX = 256       # 캐시 항목 상한 (오래 안 본 것부터 삭제)
+
+# 여러 좌표를 한 번에 조회 (Open-Meteo, API 키 불필요). 끄면 위치별 OpenWeather 요청만 사용
+BULK_URL = "https://api.open-meteo.com/v1/forecast"
+BULK_ENABLED = False
+BULK_CHUNK = 50               # 요청 1회에 넣을 좌표 수 (URL 길이 제한)
+
+# "current": 현재 날씨를 WEATHER_CACHE_TIME 마다 조회
+# "forecast": 시간별 예보를 FORECAST_TTL 마다 받아 두고 현재 시각 값은 보간
+WEATHER_MODE = "current"
+FORECAST_TTL = 3 * 3600
 _weather_lock = threading.Lock()
 
+# 응답의 ETag / Last-Modified / Cache-Control max-age (키별)
+_validators: Dict[str, Tuple[str, str]] = {}
+_max_age: Dict[str, float] = {}
+
+# 키별 예보 [(unix 시각, 기온, 아이콘), ...] (시각 오름차순)
+_forecasts: Dict[str, List[Tuple[float, float, str]]] = {}
+
+# 진행 중인 요청 (키당 1개, 나중 호출자는 이 Event 를 기다림) / 실패 후 재요청 금지 시각
+_inflight: Dict[str, threading.Event] = {}
+_failed_until: Dict[str, float] = {}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# 위치별 요청 제공자 / 일괄 요청 제공자와 제공자별 circuit breaker (configure 에서 설정)
+_provider: Optional[WeatherProvider] = None
+_bulk_provider: Optional[WeatherProvider] = None
+_breakers: Dict[str, CircuitBreaker] = {}
+_breaker_opts: Dict[str, float] = {"failures": 3, "reset_sec": 30.0}
+
+
+def get_session() -> requests.Session:
+    """keep-alive 연결을 재사용하는 공용 세션 (DNS / TCP / TLS 핸드셰이크 1회)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # 재시도는 연결 실패 / 5xx·429 응답에 한 번만. 읽기 시간 초과는 다시 보내지 않고 (이미 WEATHER_TIMEOUT[1] 만큼 기다림)
+            # Retry-After 도 따르지 않음 (긴 값이면 작업자가 그만큼 묶임 → 실패 처리 후 negative TTL / circuit breaker 가 쉼)
+            retry = Retry(
+                total=1,
+                connect=1,
+                read=0,
+                status=1,
+                other=0,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                respect_retry_after_header=False,
+            )
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+            s = requests.Session()
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            s.headers["User-Agent"] = "wr-radio"
+            _session = s
+        return _session
+
+
+@dataclass
+class FetchStats:
+    """날씨 요청별 지연 / 전송량 (최근 200건)"""
+    count: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    bytes_total: int = 0
+    coalesced: int = 0   # 진행 중인 요청에 합쳐진 호출 수
+    cache_hits: int = 0
+    cache_misses: int = 0
+    evictions: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def record(self, latency: float, nbytes: int, status: int) -> None:
+        self.count += 1
+        self.bytes_total += nbytes
+        self.latencies.append(latency)
+        if status == 304:
+            self.not_modified += 1
+        elif status != 200:
+            self.errors += 1
+
+    def hit_rate(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+
+fetch_stats = FetchStats()
+
+
+def configure(cfg: Dict) -> None:
+    """config.json 의 "weather_grid_deg" / "weather_cache_max" 적용"""
+    global WEATHER_GRID_DEG, WEATHER_CACHE_MAX, BULK_ENABLED, BULK_CHUNK, WEATHER_MODE
+    WEATHER_GRID_DEG = max(0.0, float(cfg.get("weather_grid_deg", WEATHER_GRID_DEG)))
+    WEATHER_CACHE_MAX = max(1, int(cfg.get("weather_cache_max", WEATHER_CACHE_MAX)))
+    bulk = cfg.get("weather_bulk") or {}
+    BULK_ENABLED = bool(bulk.get("enabled", BULK_ENABLED))
+    BULK_CHUNK = max(1, int(bulk.get("chunk", BULK_CHUNK)))
+    mode = cfg.get("weather_mode", WEATHER_MODE)
+    WEATHER_MODE = mode if mode in ("current", "forecast") else "current"
+
+    breaker = cfg.get("weather_breaker") or {}
+    _breaker_opts["failures"] = int(breaker.get("failures", _breaker_opts["failures"]))
+    _breaker_opts["reset_sec"] = float(breaker.get("reset_sec", _breaker_opts["reset_sec"]))
+    _breakers.clear()
+    set_provider(
+        create_provider(str(cfg.get("weather_provider", "openweather")), cfg.get("openweather_api_key", ""),
+                        cfg.get("weather_provider_url", "")),
+        OpenMeteoProvider(BULK_URL),
+    )
+
+
+def set_provider(provider: WeatherProvider, bulk: Optional[WeatherProvider] = None) -> None:
+    """위치별 / 일괄 제공자 교체 (벤치마크에서 가짜 서버로 바꿀 때도 사용)"""
+    global _provider, _bulk_provider
+    _provider = provider
+    _bulk_provider = bulk or (provider if provider.bulk else _bulk_provider)
+
+
+def get_provider(bulk: bool = False) -> WeatherProvider:
+    global _provider, _bulk_provider
+    if bulk:
+        if _bulk_provider is None:
+            _bulk_provider = OpenMeteoProvider(BULK_URL)
+        return _bulk_provider
+    if _provider is None:
+        _provider = OpenWeatherProvider("", WEATHER_URL, FORECAST_URL)
+    return _provider
+
+
+def needs_api_key() -> bool:
+    return get_provider().name == "openweather"
+
+
+def breaker_for(provider: WeatherProvider) -> CircuitBreaker:
+    br = _breakers.get(provider.name)
+    if br is None:
+        br = _breakers[provider.name] = CircuitBreaker(
+            provider.name, int(_breaker_opts["failures"]), float(_breaker_opts["reset_sec"])
+        )
+    return br
+
+
+def provider_ready(bulk: bool = False) -> bool:
+    """circuit breaker 가 열려 있으면 False → 스레드 / 소켓을 만들지 않고 건너뜀"""
+    return breaker_for(get_provider(bulk)).ready()
+
+
+def provider_status() -> Dict[str, Dict]:
+    out = {"single": {"provider": get_provider().name, **breaker_for(get_provider()).snapshot()}}
+    if BULK_ENABLED:
+        out["bulk"] = {"provider": get_provider(True).name, **breaker_for(get_provider(True)).snapshot()}
+    return out
+
+
+class WeatherCacheFile:
+    """
+    날씨 캐시 파일 (JSON). 재시작 직후에도 마지막 날씨를 바로 표시하기 위한 용도.
+    갱신이 있어도 min_interval 초에 한 번만 쓴다 (종료 시에는 force).
+    """
+
+    def __init__(self, path: str = WEATHER_CACHE_FILE, min_interval: float = WEATHER_SAVE_INTERVAL,
+                 max_age: float = WEATHER_STALE_MAX):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_age = max_age
+        self.writes = 0
+        self._dirty = False
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, state) -> int:
+        """파일 → state.weather_cache (오래된 항목 제외). 읽은 항목 수 반환"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            print(f"⚠️  날씨 캐시 로드 실패: {e}")
+            return 0
+        if not isinstance(raw, dict):
+            return 0
+
+        now = time.time()
+        loaded = 0
+        with _weather_lock:
+            for key, entry in (raw.get("entries") or {}).items():
+                try:
+                    ts, data = float(entry["t"]), entry["data"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if now - ts > self.max_age:
+                    continue
+                # 격자 크기가 바뀌었을 수 있으므로 저장된 좌표로 키를 다시 계산
+                try:
+                    lat, lon = (float(v) for v in key.split(","))
+                except ValueError:
+                    continue
+                key = cache_key(lat, lon)
+                if key in state.weather_cache and state.weather_cache[key][0] >= ts:
+                    continue
+                _cache_put(state, key, (ts, data))
+                if entry.get("series") and WEATHER_MODE == "forecast":
+                    _forecasts[key] = [tuple(p) for p in entry["series"]]
+                if entry.get("etag"):
+                    _validators[key] = (entry["etag"], entry.get("modified", ""))
+                loaded += 1
+        return loaded
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def maybe_save(self, state, force: bool = False) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return False
+            if not force and time.time() - self._last_write < self.min_interval:
+                return False
+            with _weather_lock:
+                entries = {}
+                for key, (ts, data) in state.weather_cache.items():
+                    entry = {"t": round(ts, 1), "data": data}
+                    etag, modified = _validators.get(key, ("", ""))
+                    if etag:
+                        entry["etag"] = etag
+                    if modified:
+                        entry["modified"] = modified
+                    if key in _forecasts:
+                        entry["series"] = _forecasts[key]
+                    entries[key] = entry
+            try:
+                atomic_write_json(self.path, {"version": 1, "entries": entries}, indent=None)
+            except Exception as e:
+                print(f"⚠️  날씨 캐시 저장 실패: {e}")
+                return False
+            self._dirty = False
+            self._last_write = time.time()
+            self.writes += 1
+            return True
+
+
+def open_weather_cache(state, cfg: Dict) -> Optional[WeatherCacheFile]:
+    """config.json 의 "weather_cache_file" (빈 문자열이면 사용 안 함)"""
+    path = cfg.get("weather_cache_file", WEATHER_CACHE_FILE)
+    if not state.enable_weather or not path:
+        return None
+    store = WeatherCacheFile(path, min_interval=float(cfg.get("weather_save_interval_sec", WEATHER_SAVE_INTERVAL)))
+    n = store.load(state)
+    if n:
+        print(f"🌤️  날씨 캐시 {n}곳 로드")
+    return store
+
+
+def _parse_max_age(cache_control: str) -> float:
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return 0.0
+
+
+def cache_ttl(key: str) -> float:
+    """캐시 유효 시간: 서버가 max-age 를 더 길게 주면 그만큼 늘림. 예보가 있으면 FORECAST_TTL"""
+    base = FORECAST_TTL if key in _forecasts else WEATHER_CACHE_TIME
+    return max(base, _max_age.get(key, 0.0))
+
+
+def interpolate_forecast(series: List[Tuple[float, float, str]], t: float) -> Optional[Dict[str, int]]:
+    """t 시각의 기온은 앞뒤 예보의 선형 보간, 아이콘은 더 가까운 쪽. 예보 범위를 지났으면 None"""
+    if not series or t > series[-1][0]:
+        return None
+    if t <= series[0][0]:
+        return {"icon": series[0][2], "temp": int(round(series[0][1]))}
+    for (t0, temp0, icon0), (t1, temp1, icon1) in zip(series, series[1:]):
+        if t0 <= t <= t1:
+            f = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+            return {"icon": icon0 if f < 0.5 else icon1, "temp": int(round(temp0 + (temp1 - temp0) * f))}
+    return None
+
+
+def cache_key(lat: float, lon: float) -> str:
+    """가까운 스테이션이 같은 항목을 쓰도록 WEATHER_GRID_DEG 격자 중심 좌표로 묶음"""
+    g = WEATHER_GRID_DEG
+    if g <= 0:
+        return f"{lat},{lon}"
+    return f"{round(lat / g) * g:.4f},{round(lon / g) * g:.4f}"
 
-def _cache_key(lat: float, lon: float) -> str:
-    return f"{lat},{lon}"
+
+def _cache_put(state, key: str, entry: Tuple[float, Dict[str, int]]) -> None:
+    """_weather_lock 안에서 호출. 최근 사용 순서 유지 + 상한 초과 시 가장 오래 안 본 항목 삭제"""
+    cache = state.weather_cache
+    cache.pop(key, None)
+    cache[key] = entry
+    while len(cache) > WEATHER_CACHE_MAX:
+        old = next(iter(cache))
+        del cache[old]
+        _validators.pop(old, None)
+        _max_age.pop(old, None)
+        _forecasts.pop(old, None)
+        fetch_stats.evictions += 1
+
+
+def invalidate(state, keys) -> int:
+    """캐시 항목 삭제 (스테이션 목록에서 빠진 위치). 삭제한 수 반환"""
+    n = 0
+    with _weather_lock:
+        for key in keys:
+            if state.weather_cache.pop(key, None) is not None:
+                n += 1
+            _validators.pop(key, None)
+            _max_age.pop(key, None)
+            _forecasts.pop(key, None)
+            _failed_until.pop(key, None)
+    if n and state.weather_store is not None:
+        state.weather_store.mark_dirty()
+    return n
 
 
 def should_update_weather(state, lat: float, lon: float) -> bool:
     if not state.enable_weather:
         return False
-    key = _cache_key(lat, lon)
+    key = cache_key(lat, lon)
+    if not provider_ready():
+        return False
     with _weather_lock:
+        if key in _inflight or time.time() < _failed_until.get(key, 0.0):
+            return False
         if key not in state.weather_cache:
             return True
         cached_time, _ = state.weather_cache[key]
-        return (time.time() - cached_time) >= WEATHER_CACHE_TIME
+        if key in _forecasts and time.time() > _forecasts[key][-1][0]:
+            return True  # 예보 범위를 지남
+        return (time.time() - cached_time) >= cache_ttl(key)
 
 
 def get_cached_weather(state, lat: float, lon: float) -> Optional[Dict[str, int]]:
     if not state.enable_weather:
         return None
-    key = _cache_key(lat, lon)
+    key = cache_key(lat, lon)
     with _weather_lock:
-        if key in state.weather_cache:
-            _, data = state.weather_cache[key]
-            return data
+        entry = state.weather_cache.pop(key, None)
+        if entry is not None:
+            state.weather_cache[key] = entry  # 최근 사용으로 이동
+            fetch_stats.cache_hits += 1
+            if key in _forecasts:
+                # 예보 모드: 지금 시각 값으로 보간 (범위를 지났으면 마지막 값)
+                return interpolate_forecast(_forecasts[key], time.time()) or entry[1]
+            return entry[1]
+        fetch_stats.cache_misses += 1
     return None
 
 
-def _fetch_weather_background(state, lat: float, lon: float, location_name: str) -> None:
-    if not state.enable_weather:
-        return
-    key = _cache_key(lat, lon)
+def request_weather(key: str, params: Dict, url: Optional[str] = None) -> requests.Response:
+    """공용 세션으로 조회. 이전 응답의 ETag / Last-Modified 가 있으면 조건부 요청 (304 = 변경 없음)"""
+    headers = {}
+    etag, modified = _validators.get(key, ("", ""))
+    if key and etag:
+        headers["If-None-Match"] = etag
+    if key and modified:
+        headers["If-Modified-Since"] = modified
 
+    t0 = time.perf_counter()
     try:
-        url = "http://api.openweathermap.org/data/2.5/weather"
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "appid": state.openweather_api_key,
-            "units": "metric",
-            "lang": "kr",
-        }
-        response = requests.get(url, params=params, timeout=5)
-
-        if response.status_code == 200:
-            data = response.json()
-            temp = int(data["main"]["temp"])
-            icon_code = data["weather"][0]["icon"][:2]
-            weather_data = {"icon": icon_code, "temp": temp}
+        response = get_session().get(url or WEATHER_URL, params=params, headers=headers, timeout=WEATHER_TIMEOUT)
+    except Exception:
+        fetch_stats.record(time.perf_counter() - t0, 0, 0)
+        raise
+    nbytes = len(response.content) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+    fetch_stats.record(time.perf_counter() - t0, nbytes, response.status_code)
+
+    if key and response.status_code in (200, 304):
+        if response.headers.get("ETag") or response.headers.get("Last-Modified"):
+            _validators[key] = (response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""))
+        max_age = _parse_max_age(response.headers.get("Cache-Control", ""))
+        if max_age:
+            _max_age[key] = max_age
+    return response
+
+
+def _get(key: str, url: str, params: Dict) -> requests.Response:
+    return request_weather(key, params, url)
+
+
+def fetch_max_sec() -> float:
+    """요청 1건이 (재시도 1회 포함) 걸릴 수 있는 최대 시간"""
+    return 2 * sum(WEATHER_TIMEOUT) + 0.5
+
+
+def publish_weather_event(state, key: str) -> None:
+    """조회 완료 알림 (메인 루프가 현재 스테이션이면 날씨 줄만 다시 그림). 큐가 차면 버림"""
+    try:
+        state.weather_events.put_nowait(key)
+    except queue.Full:
+        pass
+
+
+def take_strip_update(state) -> Optional[Dict[str, int]]:
+    """
+    publish_weather_event 로 쌓인 키를 모두 비우고, 지금 보고 있는 스테이션의 날씨가 새로 들어왔으면 그 값
+    (메인 루프가 날씨 줄만 다시 그림). 그 사이 채널을 넘겼거나 다른 모드 화면이거나 표시 중인 값과 같으면 None
+    (다음 카드 표시 때 캐시에서 읽음)
+    """
+    keys = set()
+    while True:
+        try:
+            keys.add(state.weather_events.get_nowait())
+        except queue.Empty:
+            break
+    if not keys or state.current_mode != "normal" or state.is_changed("current_index"):
+        return None
+    st = state.radio_stations[state.current_index]
+    if cache_key(st["lat"], st["lon"]) not in keys:
+        return None
+    wd = get_cached_weather(state, st["lat"], st["lon"])
+    return wd if wd is not None and wd != state.last_displayed_weather else None
 
-            with _weather_lock:
-                state.weather_cache[key] = (time.time(), weather_data)
-            print(f"🌤️  날씨 업데이트: {location_name} - {temp}°C")
-        else:
-            print(f"⚠️  날씨 HTTP {response.status_code}: {location_name}")
 
+def _store_result(state, key: str, result: WeatherResult) -> Dict[str, int]:
+    """_weather_lock 안에서 호출. 예보면 현재 시각 값으로 보간해 저장"""
+    data = result.data
+    if result.series:
+        _forecasts[key] = result.series
+        data = interpolate_forecast(result.series, time.time()) or data
+    _cache_put(state, key, (time.time(), data))
+    publish_weather_event(state, key)
+    return data
+
+
+def _fetch_weather(state, key: str, lat: float, lon: float, location_name: str) -> Optional[bool]:
+    """반환: True 성공 / False 요청 실패 / None circuit breaker 가 막아 보내지 않음 (이 위치의 실패가 아님)"""
+    provider = get_provider()
+    breaker = breaker_for(provider)
+    if not breaker.allow():
+        return None
+    forecast = WEATHER_MODE == "forecast"
+    try:
+        result = provider.fetch(_get, key, lat, lon, forecast)
     except Exception as e:
+        breaker.record_failure()
         print(f"⚠️  날씨 실패: {location_name} - {str(e)[:50]}")
+        return False
+    breaker.record_success()
+
+    with _weather_lock:
+        if result is not None:
+            data = _store_result(state, key, result)
+        elif key in state.weather_cache:
+            # 304 변경 없음 → 기존 값의 시각만 갱신
+            _cache_put(state, key, (time.time(), state.weather_cache[key][1]))
+    if result is not None:
+        print(f"🌤️  날씨 {'예보 ' if forecast else ''}업데이트: {location_name} - {data['temp']}°C")
+    if state.weather_store is not None:
+        state.weather_store.mark_dirty()
+        state.weather_store.maybe_save(state)
+    return True
+
+
+def _fetch_weather_background(state, lat: float, lon: float, location_name: str, wait: bool = False) -> None:
+    """
+    같은 좌표에 대해 동시에 한 번만 요청 (single-flight).
+    이미 진행 중이면 새 요청을 만들지 않고, wait=True 면 그 결과를 기다린다.
+    실패하면 WEATHER_NEGATIVE_TTL 동안 should_update_weather 가 False
+    (circuit breaker 가 막은 경우는 제외 - breaker 가 닫히면 바로 다시 요청).
+    """
+    if not state.enable_weather:
+        return
+    key = cache_key(lat, lon)
+    with _weather_lock:
+        ev = _inflight.get(key)
+        leader = ev is None
+        if leader:
+            ev = _inflight[key] = threading.Event()
+        else:
+            fetch_stats.coalesced += 1
+    if not leader:
+        if wait:
+            ev.wait(timeout=fetch_max_sec())
+        return
+
+    ok: Optional[bool] = False
+    try:
+        ok = _fetch_weather(state, key, lat, lon, location_name)
+    finally:
+        with _weather_lock:
+            del _inflight[key]
+            if ok:
+                _failed_until.pop(key, None)
+            elif ok is False:
+                _failed_until[key] = time.time() + WEATHER_NEGATIVE_TTL
+        ev.set()
+
+
+def fetch_weather_bulk(state, points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    여러 좌표를 BULK_CHUNK 개씩 묶어 조회하고 격자 키별로 캐시에 나눠 넣는다.
+    이미 진행 중인 키는 건너뜀. 실패한 좌표 목록 반환 (위치별 요청으로 재시도용).
+    """
+    provider = get_provider(bulk=True)
+    breaker = breaker_for(provider)
+    todo: Dict[str, Tuple[float, float]] = {}
+    with _weather_lock:
+        for lat, lon in points:
+            key = cache_key(lat, lon)
+            if key not in _inflight and key not in todo:
+                _inflight[key] = threading.Event()
+                todo[key] = (lat, lon)
+
+    items = list(todo.items())
+    failed: List[Tuple[float, float]] = []
+    forecast = WEATHER_MODE == "forecast"
+    for i in range(0, len(items), BULK_CHUNK):
+        chunk = items[i:i + BULK_CHUNK]
+        results: Dict[str, WeatherResult] = {}
+        if breaker.allow():
+            try:
+                results = provider.fetch_many(_get, [(key, lat, lon) for key, (lat, lon) in chunk], forecast)
+                breaker.record_success()
+                print(f"🌤️  날씨 일괄 업데이트: {len(results)}/{len(chunk)}곳")
+            except Exception as e:
+                breaker.record_failure()
+                print(f"⚠️  날씨 일괄 실패: {str(e)[:50]}")
+
+        with _weather_lock:
+            for key, point in chunk:
+                if key in results:
+                    _store_result(state, key, results[key])
+                    _failed_until.pop(key, None)
+                else:
+                    failed.append(point)
+                ev = _inflight.pop(key, None)
+                if ev is not None:
+                    ev.set()
+
+    if len(failed) < len(items) and state.weather_store is not None:
+        state.weather_store.mark_dirty()
+        state.weather_store.maybe_save(state)
+    return failed
 
 
 def start_weather_update(state, station_index: int) -> None:
     if not state.enable_weather:
         return
+    if state.weather_scheduler is not None:
+        # 백그라운드 스케줄러가 있으면 우선순위만 다시 계산
+        state.weather_scheduler.bump(station_index)
+        return
     st = state.radio_stations[station_index]
     lat, lon = st["lat"], st["lon"]
+    with _weather_lock:
+        if len(_inflight) >= WEATHER_MAX_INFLIGHT:
+            return
     if should_update_weather(state, lat, lon):
         th = threading.Thread(
             target=_fetch_weather_background,
@@ -0,0 +1,237 @@
+"""
+날씨 제공자(provider) 와 circuit breaker.
+제공자는 HTTP 응답을 표시용 데이터 {"icon": "01", "temp": 15} (+ 예보 시계열) 로 바꾸는 일만 한다.
+연결 재사용 / 조건부 요청 / 통계는 weather.request_weather 가 get 인자로 넘어와 처리.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+Series = List[Tuple[float, float, str]]  # [(unix 시각, 기온, 아이콘), ...]
+# get(key, url, params) -> Response  (key 가 빈 문자열이면 조건부 요청 안 함)
+Getter = Callable[[str, str, Dict], requests.Response]
+
+
+class ProviderError(Exception):
+    pass
+
+
+@dataclass
+class WeatherResult:
+    data: Dict[str, int]
+    series: Optional[Series] = None
+
+
+class WeatherProvider(ABC):
+    name = ""
+    bulk = False  # True 면 fetch_many 로 여러 좌표를 한 요청에
+
+    @abstractmethod
+    def fetch(self, get: Getter, key: str, lat: float, lon: float, forecast: bool) -> Optional[WeatherResult]:
+        """None = 304 (변경 없음). 실패는 ProviderError / requests 예외"""
+
+    def fetch_many(self, get: Getter, points: List[Tuple[str, float, float]], forecast: bool) -> Dict[str, WeatherResult]:
+        out = {}
+        for key, lat, lon in points:
+            r = self.fetch(get, key, lat, lon, forecast)
+            if r is not None:
+                out[key] = r
+        return out
+
+
+class OpenWeatherProvider(WeatherProvider):
+    name = "openweather"
+
+    def __init__(self, api_key: str,
+                 url: str = "http://api.openweathermap.org/data/2.5/weather",
+                 forecast_url: str = "http://api.openweathermap.org/data/2.5/forecast"):
+        self.api_key = api_key
+        self.url = url
+        self.forecast_url = forecast_url
+
+    def fetch(self, get, key, lat, lon, forecast):
+        params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric", "lang": "kr"}
+        response = get(key, self.forecast_url if forecast else self.url, params)
+        if response.status_code == 304:
+            return None
+        if response.status_code != 200:
+            raise ProviderError(f"HTTP {response.status_code}")
+        data = response.json()
+        if forecast:
+            series = sorted(
+                (float(item["dt"]), float(item["main"]["temp"]), item["weather"][0]["icon"][:2])
+                for item in data["list"]
+            )
+            if not series:
+                raise ProviderError("빈 예보")
+            return WeatherResult({"icon": series[0][2], "temp": int(series[0][1])}, series)
+        return WeatherResult({"icon": data["weather"][0]["icon"][:2], "temp": int(data["main"]["temp"])})
+
+
+# WMO weather code → OpenWeather 아이콘 번호 (display.draw_weather_icon 용)
+_WMO_ICONS = [
+    ((0,), "01"), ((1,), "02"), ((2,), "03"), ((3,), "04"), ((45, 48), "50"),
+    (range(51, 58), "09"), (range(61, 68), "10"), (range(71, 78), "13"),
+    (range(80, 83), "09"), ((85, 86), "13"), (range(95, 100), "11"),
+]
+
+
+def wmo_icon(code: int) -> str:
+    for codes, icon in _WMO_ICONS:
+        if code in codes:
+            return icon
+    return "03"
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """여러 좌표를 한 요청으로 (API 키 불필요)"""
+    name = "open-meteo"
+    bulk = True
+
+    def __init__(self, url: str = "https://api.open-meteo.com/v1/forecast"):
+        self.url = url
+
+    def fetch(self, get, key, lat, lon, forecast):
+        return self.fetch_many(get, [(key, lat, lon)], forecast).get(key)
+
+    def fetch_many(self, get, points, forecast):
+        params = {
+            "latitude": ",".join(f"{lat:.4f}" for _, lat, _lon in points),
+            "longitude": ",".join(f"{lon:.4f}" for _, _lat, lon in points),
+            "current": "temperature_2m,weather_code",
+        }
+        if forecast:
+            params.update({"hourly": "temperature_2m,weather_code", "forecast_days": 2, "timeformat": "unixtime"})
+        response = get("", self.url, params)
+        if response.status_code != 200:
+            raise ProviderError(f"HTTP {response.status_code}")
+        rows = response.json()
+        if isinstance(rows, dict):
+            rows = [rows]  # 좌표 1개면 객체 하나로 옴
+
+        out = {}
+        # 응답 좌표는 모델 격자에 맞춰 바뀌므로 순서로 대응
+        for (key, _, _), row in zip(points, rows):
+            cur = row.get("current") or {}
+            if "temperature_2m" not in cur:
+                continue
+            data = {"icon": wmo_icon(int(cur.get("weather_code", 3))), "temp": int(cur["temperature_2m"])}
+            series = None
+            hourly = row.get("hourly") or {}
+            if forecast and hourly.get("time"):
+                series = [
+                    (float(t), float(temp), wmo_icon(int(code)))
+                    for t, temp, code in zip(hourly["time"], hourly["temperature_2m"], hourly["weather_code"])
+                    if temp is not None
+                ]
+            out[key] = WeatherResult(data, series)
+        return out
+
+
+def create_provider(name: str, api_key: str = "", url: str = "") -> WeatherProvider:
+    """
+    "openweather" / "open-meteo" / "standin" (python3 -m wr_radio.standin --weather 주소, 기본 127.0.0.1:8766)
+    url 을 주면 기본 주소 대신 사용
+    """
+    if name == "open-meteo":
+        return OpenMeteoProvider(url) if url else OpenMeteoProvider()
+    if name == "standin":
+        base = (url or "http://127.0.0.1:8766").rstrip("/")
+        p = OpenWeatherProvider(api_key or "standin", f"{base}/data/2.5/weather", f"{base}/data/2.5/forecast")
+        p.name = "standin"
+        return p
+    if url:
+        base = url.rstrip("/")
+        return OpenWeatherProvider(api_key, f"{base}/data/2.5/weather", f"{base}/data/2.5/forecast")
+    return OpenWeatherProvider(api_key)
+
+
+class CircuitBreaker:
+    """
+    연속 failure_threshold 번 실패하면 open → reset_timeout 동안 요청을 보내지 않음.
+    그 뒤 half_open 에서 요청 1개만 시험 삼아 보내고, 성공하면 closed / 실패하면 다시 open.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str = "", failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 max_reset_timeout: float = 600.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout  # 반쯤 열림 시험이 실패할 때마다 2배 (max 까지)
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def ready(self) -> bool:
+        """요청을 보내도 되는 상태인지 (상태는 바꾸지 않고, 건너뛴 횟수만 셈)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                ok = time.monotonic() - self.opened_at >= self.reset_timeout
+            else:
+                ok = not self._probing
+            if not ok:
+                self.rejected += 1
+            return ok
+
+    def allow(self) -> bool:
+        """요청 직전 호출. False 면 보내지 말 것 (half_open 에서는 시험 요청 1개만 허용)"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"✅ 날씨 {self.name} 복구 (circuit closed)")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.reset_timeout = self.base_reset_timeout
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            elif self.state != self.CLOSED or self.failures < self.failure_threshold:
+                return
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.trips += 1
+            self._probing = False
+            print(f"⛔ 날씨 {self.name} 연속 실패 {self.failures}회 → {self.reset_timeout:.0f}초간 요청 중단")
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in_sec": round(retry_in, 1),
+            }
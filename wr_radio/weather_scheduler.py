@@ -0,0 +1,239 @@
+"""
+날씨 백그라운드 갱신 스케줄러.
+모든 스테이션의 날씨를 미리 받아 두어, 채널을 넘길 때 캐시에서 바로 표시한다.
+- 우선순위: 현재 스테이션 → 양 옆 → 더 먼 스테이션 (원형 거리).
+  스테이션 → 캐시 키 표는 목록이 바뀔 때만 만들고, 깨어날 때마다 현재 스테이션 주변만 걸어감 (정렬 없음)
+- 만료 refresh_ahead_sec 전부터 갱신 대상
+- 토큰 버킷으로 OpenWeather 무료 요금제 호출 한도(분당 60회) 아래로 제한
+- 요청마다 스레드를 만드는 대신 크기가 고정된 작업자 풀 사용
+- weather_bulk 가 켜져 있으면 갱신할 위치를 모아 몇 번의 일괄 요청으로 처리 (실패 시 위치별 요청)
+"""
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from . import weather
+
+
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, capacity: float):
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self.tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_take(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+    def available(self) -> int:
+        """지금 바로 쓸 수 있는 토큰 수"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return int(self.tokens)
+
+    def wait_time(self) -> float:
+        """토큰 1개가 찰 때까지 남은 시간 (초)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+
+class WeatherScheduler:
+    def __init__(
+        self,
+        state,
+        workers: int = 2,
+        calls_per_minute: float = 50.0,
+        burst: int = 5,
+        refresh_ahead_sec: float = 60.0,
+    ):
+        self.state = state
+        self.refresh_ahead_sec = refresh_ahead_sec
+        self.bucket = TokenBucket(calls_per_minute / 60.0, burst)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather")
+
+        self.fetched = 0
+        self.throttled = 0
+        self.view_hits = 0     # 스테이션을 볼 때 이미 캐시에 있었던 횟수
+        self.view_misses = 0
+        self._inflight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._bulk_retry_at = 0.0  # 일괄 요청 실패 후 위치별 요청만 쓰는 기간
+        # 스테이션 → 캐시 키 번호 (_key_table)
+        self._table_for: Any = None
+        self._table_sig: Tuple = ()
+        self._keys: List[str] = []
+        self._key_of = array("I")
+
+    # --- 우선순위 ---
+    def _due(self, lat: float, lon: float) -> bool:
+        key = weather.cache_key(lat, lon)
+        with weather._weather_lock:
+            if time.time() < weather._failed_until.get(key, 0.0):
+                return False  # 최근 실패 → 잠시 쉼
+            entry = self.state.weather_cache.get(key)
+        if entry is None:
+            return True
+        age = time.time() - entry[0]
+        return age >= weather.cache_ttl(key) - self.refresh_ahead_sec
+
+    def _key_table(self) -> Tuple[List[str], array]:
+        """스테이션 index → 캐시 키 번호. 목록 객체 / 길이 / 격자 크기가 바뀔 때만 다시 만듦"""
+        stations = self.state.radio_stations
+        sig = (len(stations), weather.WEATHER_GRID_DEG)
+        if stations is not self._table_for or sig != self._table_sig:
+            if hasattr(stations, "lats"):
+                coords = zip(stations.lats, stations.lons)
+            else:
+                coords = ((s["lat"], s["lon"]) for s in stations)
+            ids: Dict[str, int] = {}
+            key_of = array("I")
+            for lat, lon in coords:
+                key_of.append(ids.setdefault(weather.cache_key(lat, lon), len(ids)))
+            self._keys, self._key_of = list(ids), key_of
+            self._table_for, self._table_sig = stations, sig
+        return self._keys, self._key_of
+
+    def _queue(self) -> Iterator[Tuple[int, str, int]]:
+        """
+        (원형 거리, 캐시 키, 스테이션 index) - 현재 스테이션에서 가까운 순, 같은 키는 한 번만.
+        현재 스테이션에서 양쪽으로 걸어가며 만들므로 정렬이 필요 없고, 호출 측이 필요한 만큼만 읽음.
+        키는 WEATHER_CACHE_MAX 개까지만: 그보다 많이 미리 받으면 LRU 가 방금 받은 항목을 서로 밀어내며
+        끝없이 다시 받게 됨 (먼 스테이션은 현재 스테이션이 가까워지면 받음)
+        """
+        keys, key_of = self._key_table()
+        n = len(key_of)
+        if not n:
+            return
+        cur = self.state.current_index % n
+        limit = min(weather.WEATHER_CACHE_MAX, len(keys))
+        seen: Set[int] = set()
+        for d in range(n // 2 + 1):
+            for i in ((cur + d) % n, (cur - d) % n) if d else (cur,):
+                k = key_of[i]
+                if k in seen:
+                    continue
+                seen.add(k)
+                yield d, keys[k], i
+                if len(seen) >= limit:
+                    return
+
+    def bump(self, station_index: int) -> None:
+        """채널 이동 시 호출: 캐시 적중 기록 후 우선순위 재계산"""
+        station = self.state.radio_stations[station_index]
+        if weather.get_cached_weather(self.state, station["lat"], station["lon"]) is not None:
+            self.view_hits += 1
+        else:
+            self.view_misses += 1
+        self._wake.set()
+
+    # --- 실행 ---
+    def _fetch(self, key: str, station: Tuple[float, float, str]) -> None:
+        try:
+            weather._fetch_weather_background(self.state, *station)
+            self.fetched += 1
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+            self._wake.set()
+
+    def _fetch_bulk(self, items: List[Tuple[str, Tuple[float, float, str]]]) -> None:
+        try:
+            failed = weather.fetch_weather_bulk(self.state, [(lat, lon) for _, (lat, lon, _loc) in items])
+            self.fetched += len(items) - len(failed)
+            if failed:
+                self._bulk_retry_at = time.time() + weather.WEATHER_NEGATIVE_TTL
+        finally:
+            with self._lock:
+                for key, _ in items:
+                    self._inflight.discard(key)
+            self._wake.set()
+
+    def _due_items(self, limit: int) -> List[Tuple[str, Tuple[float, float, str]]]:
+        """갱신할 (캐시 키, (위도, 경도, 위치)) 최대 limit 개 - 목록이 바뀌어도 되도록 값으로"""
+        stations = self.state.radio_stations
+        items: List[Tuple[str, Tuple[float, float, str]]] = []
+        for _, key, i in self._queue():
+            if len(items) >= limit:
+                break
+            with self._lock:
+                if key in self._inflight:
+                    continue
+            station = stations[i]
+            if self._due(station["lat"], station["lon"]):
+                items.append((key, (station["lat"], station["lon"], station["location"])))
+        return items
+
+    def run(self) -> None:
+        st = self.state
+        while not st.shutting_down:
+            self._wake.clear()
+            sleep = 5.0
+            bulk = weather.BULK_ENABLED and time.time() >= self._bulk_retry_at and weather.provider_ready(bulk=True)
+            if not bulk and not weather.provider_ready():
+                # circuit breaker 열림 → 시험 요청이 가능해질 때까지 아무것도 보내지 않음
+                self._wake.wait(timeout=1.0)
+                continue
+            step = weather.BULK_CHUNK if bulk else 1
+            # 이번에 보낼 수 있는 만큼만 찾음 (토큰이 없으면 한 개 찾아 throttled 처리)
+            items = self._due_items(max(1, self.bucket.available()) * step)
+            for i in range(0, len(items), step):
+                batch = items[i:i + step]
+                if not self.bucket.try_take():
+                    self.throttled += 1
+                    sleep = self.bucket.wait_time()
+                    break
+                with self._lock:
+                    self._inflight.update(key for key, _ in batch)
+                try:
+                    if bulk:
+                        self.pool.submit(self._fetch_bulk, batch)
+                    else:
+                        self.pool.submit(self._fetch, *batch[0])
+                except RuntimeError:  # 인터프리터 종료 중
+                    return
+            self._wake.wait(timeout=max(0.05, sleep))
+        self.pool.shutdown(wait=False)
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.run, daemon=True)
+        t.start()
+        return t
+
+    def stats(self) -> Dict[str, float]:
+        views = self.view_hits + self.view_misses
+        return {
+            "fetched": self.fetched,
+            "throttled": self.throttled,
+            "view_hit_rate": self.view_hits / views if views else 0.0,
+            "providers": weather.provider_status(),
+        }
+
+
+def start_weather_scheduler(state, cfg: Dict) -> Optional[WeatherScheduler]:
+    """config.json 의 "weather_scheduler" 항목 (날씨 기능이 켜져 있으면 기본 활성)"""
+    opts = cfg.get("weather_scheduler") or {}
+    if not state.enable_weather or not opts.get("enabled", True):
+        return None
+    sched = WeatherScheduler(
+        state,
+        workers=int(opts.get("workers", 2)),
+        calls_per_minute=float(opts.get("calls_per_minute", 50)),
+        burst=int(opts.get("burst", 5)),
+        refresh_ahead_sec=float(opts.get("refresh_ahead_sec", 60)),
+    )
+    sched.start()
+    return sched